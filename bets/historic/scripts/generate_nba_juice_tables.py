@@ -1,9 +1,17 @@
 #!/usr/bin/env python3
 
+import sys
 import pandas as pd
 import numpy as np
 from pathlib import Path
 
+# --- DYNAMIC PATH SETUP ---
+COMMON_DIR = str(Path(__file__).resolve().parents[3] / "scripts")
+if COMMON_DIR not in sys.path:
+    sys.path.append(COMMON_DIR)
+
+from common.profit_engine import bet_profits
+
 CLEAN_DIR = Path("bets/historic/clean")
 
 ML_FILE = CLEAN_DIR / "nba_moneyline_bets.csv"
@@ -25,6 +33,7 @@ def create_moneyline_bands(df):
     ]
 
     df["band"] = pd.cut(df["odds"], bins=bins)
+    df["profit"] = bet_profits(df, odds_col="odds", result_col="result")
 
     grouped = (
         df.groupby(["band","fav_ud","venue"])
@@ -1,9 +1,17 @@
 #!/usr/bin/env python3
 
+import sys
 import pandas as pd
 import numpy as np
 from pathlib import Path
 
+# --- DYNAMIC PATH SETUP ---
+COMMON_DIR = str(Path(__file__).resolve().parents[3] / "scripts")
+if COMMON_DIR not in sys.path:
+    sys.path.append(COMMON_DIR)
+
+from common.profit_engine import bet_profits
+
 INPUT = Path("bets/historic/clean/nba_moneyline_bets.csv")
 OUTPUT = Path("config/basketball/nba/nba_ml_juice.csv")
 
@@ -30,6 +38,8 @@ def create_bands(df):
 
 def calculate_roi(df):
 
+    df["profit"] = bet_profits(df, odds_col="odds", result_col="result")
+
     g = (
         df.groupby(["band","fav_ud","venue"])
         .agg(
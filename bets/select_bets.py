@@ -1,9 +1,29 @@
 #!/usr/bin/env python3
 # docs/win/basketball/scripts/04_select/select_bets.py
 
+import numpy as np
 import pandas as pd
 from pathlib import Path
 from datetime import datetime
+import sys
+
+# --- DYNAMIC PATH SETUP ---
+COMMON_DIR = str(Path(__file__).resolve().parents[1] / "scripts")
+if COMMON_DIR not in sys.path:
+    sys.path.append(COMMON_DIR)
+
+from common.rule_engine import (
+    chosen,
+    column,
+    explain_bits,
+    failure_bits,
+    frame_fields,
+    load_rules,
+    require_mask,
+    select,
+    side_masks,
+    trace_labels,
+)
 
 INPUT_DIR = Path("docs/win/basketball/03_edges")
 OUTPUT_DIR = Path("docs/win/basketball/04_select")
@@ -13,37 +33,43 @@ OUTPUT_DIR.mkdir(parents=True, exist_ok=True)
 ERROR_DIR.mkdir(parents=True, exist_ok=True)
 
 REPORT_FILE = ERROR_DIR / "select_report.txt"
+TRACE_FILE = ERROR_DIR / "select_trace.csv"
+
+# one trace row per candidate: which step ran, whether it passed, the side
+# kept and a failed-condition bitmask per rule key (see rule_engine.trace_labels)
+TRACE_BITS = ["require_bits", "home_bits", "away_bits", "over_bits", "under_bits"]
+
+# step rule sets live in config/selection_rules.json ("basketball_steps")
+STEPS = load_rules("basketball_steps")
+LABELS = {name: trace_labels(rules) for name, rules in STEPS.items() if name != "params"}
+
+STEP_FOR = {
+    ("NBA", "moneyline"): "nba_moneyline",
+    ("NBA", "spread"): "nba_spread",
+    ("NBA", "total"): "nba_total",
+    ("NCAAB", "moneyline"): "ncaab_moneyline",
+    ("NCAAB", "spread"): "ncaab_spread",
+    ("NCAAB", "total"): "ncaab_total",
+}
 
 
 ###############################################################
 ######################## HELPERS ##############################
 ###############################################################
 
-def f(x):
-    try:
-        if pd.isna(x):
-            return 0.0
-        return float(x)
-    except Exception:
-        return 0.0
-
-
 def s(x):
     if pd.isna(x):
         return ""
     return str(x).strip()
 
 
-def reset_report():
+def write_report(lines):
+    ts = datetime.now().strftime("%Y-%m-%d %H:%M:%S")
     with open(REPORT_FILE, "w", encoding="utf-8") as fh:
         fh.write("BASKETBALL 04_SELECT REPORT\n")
         fh.write("=" * 100 + "\n")
-
-
-def report_line(text):
-    ts = datetime.now().strftime("%Y-%m-%d %H:%M:%S")
-    with open(REPORT_FILE, "a", encoding="utf-8") as fh:
-        fh.write(f"[{ts}] {text}\n")
+        for text in lines:
+            fh.write(f"[{ts}] {text}\n")
 
 
 def game_label(row):
@@ -65,288 +91,158 @@ def detect_market_from_filename(file_name):
     return ""
 
 
-def blocked_ncaab_spread_line(line):
-    if 1 <= line <= 3:
-        return True
-    if -10 <= line <= -5:
-        return True
-    if 1 <= abs(line) <= 7 and line > 0:
-        return True
-    return False
+def add_derived(df):
+    """Game-level fields the step rules read that are not CSV columns"""
+    work = df.copy()
 
+    line = column(df, "total")
+    work["proj_diff"] = np.abs(column(df, "total_projected_points") - line)
+    work["max_spread"] = np.maximum(np.abs(column(df, "home_spread")), np.abs(column(df, "away_spread")))
 
-###############################################################
-##################### STEP 1 NBA MONEYLINE ####################
-###############################################################
+    return work
 
-def step1_nba_moneyline(row):
-    home_edge = f(row.get("home_ml_edge_decimal"))
-    away_edge = f(row.get("away_ml_edge_decimal"))
 
-    home_ml = f(row.get("home_dk_moneyline_american"))
-    away_ml = f(row.get("away_dk_moneyline_american"))
+###############################################################
+######################## STEP EVALUATION ######################
+###############################################################
 
-    home_cond1 = home_edge > 0.07
-    home_cond2 = -180 <= home_ml <= 180
+def evaluate_step(df, name):
+    """
+    Run one step's compiled rules over a whole file.
+    Returns (allowed, bet_side, masks, fields, shared).
+    """
+    rules = STEPS[name]
+    n = len(df)
 
-    away_cond1 = away_edge > 0.07
-    away_cond2 = -180 <= away_ml <= 180
+    fields, shared = frame_fields(add_derived(df), rules)
+    masks = side_masks(rules, fields, shared, n=n)
+    names = list(masks)
 
-    if home_cond1 and home_cond2:
-        return True, (
-            f"PASS STEP 1 NBA MONEYLINE | HOME passed both conditions | "
-            f"home_ml_edge_decimal={home_edge:.6f} > 0.07 and "
-            f"home_dk_moneyline_american={home_ml:.2f} in [-180, 180]"
-        )
+    if not names:
+        return require_mask(rules, shared, n), np.full(n, ""), masks, fields, shared
 
-    if away_cond1 and away_cond2:
-        return True, (
-            f"PASS STEP 1 NBA MONEYLINE | AWAY passed both conditions | "
-            f"away_ml_edge_decimal={away_edge:.6f} > 0.07 and "
-            f"away_dk_moneyline_american={away_ml:.2f} in [-180, 180]"
-        )
+    if rules["pick"] != "each":
+        allowed, side = select(rules, fields, shared)
+        return allowed, side, masks, fields, shared
 
-    reasons = []
-    reasons.append(
-        f"HOME cond1 edge>0.07={home_cond1} (home_ml_edge_decimal={home_edge:.6f})"
-    )
-    reasons.append(
-        f"HOME cond2 odds_in_range={home_cond2} (home_dk_moneyline_american={home_ml:.2f})"
-    )
-    reasons.append(
-        f"AWAY cond1 edge>0.07={away_cond1} (away_ml_edge_decimal={away_edge:.6f})"
-    )
-    reasons.append(
-        f"AWAY cond2 odds_in_range={away_cond2} (away_dk_moneyline_american={away_ml:.2f})"
-    )
+    passed = np.sum([masks[s] for s in names], axis=0)
 
-    return False, "FAIL STEP 1 NBA MONEYLINE | " + " | ".join(reasons)
+    side = np.full(n, "", dtype=object)
+    for s in reversed(names):
+        side = np.where(masks[s], s, side)
 
+    if len(names) > 1:
+        side = np.where(passed == len(names), "both", side)
 
-###############################################################
-##################### STEP 2 NBA SPREAD #######################
-###############################################################
+    return passed > 0, side.astype(str), masks, fields, shared
 
-def step2_nba_spread(row):
-    home_line = f(row.get("home_spread"))
-    away_line = f(row.get("away_spread"))
-    home_edge = f(row.get("home_spread_edge_decimal"))
-    away_edge = f(row.get("away_spread_edge_decimal"))
 
-    home_cond1 = home_edge >= 0.07
-    away_cond1 = away_edge >= 0.07
+def trace_frame(file_name, league, market_type, name, allowed, side, fields, shared):
+    """Columnar trace for one file: codes only, no text"""
+    rules = STEPS[name]
+    n = len(allowed)
 
-    home_cond2 = -14.6 <= home_line <= 14.6 and not (-2 <= home_line <= 2)
-    away_cond2 = -14.6 <= away_line <= 14.6 and not (-2 <= away_line <= 2)
+    bits = failure_bits(rules, fields, shared, n=n)
 
-    if home_cond1 and home_cond2:
-        return True, (
-            f"PASS STEP 2 NBA SPREAD | HOME passed | "
-            f"home_spread_edge_decimal={home_edge:.6f} >= 0.07 and "
-            f"home_spread={home_line:.2f} allowed"
-        )
+    trace = pd.DataFrame({
+        "file": file_name,
+        "league": league,
+        "market_type": market_type,
+        "row": np.arange(n, dtype=np.int32),
+        "step": np.int8(rules["spec"]["step"]),
+        "passed": allowed.astype(np.int8),
+        "side": side,
+    })
 
-    if away_cond1 and away_cond2:
-        return True, (
-            f"PASS STEP 2 NBA SPREAD | AWAY passed | "
-            f"away_spread_edge_decimal={away_edge:.6f} >= 0.07 and "
-            f"away_spread={away_line:.2f} allowed"
-        )
+    for col in TRACE_BITS:
+        key = col[:-len("_bits")]
+        trace[col] = bits.get(key, np.zeros(n, dtype=np.uint32))
 
-    reasons = []
-    reasons.append(
-        f"HOME edge_ok={home_cond1} (home_spread_edge_decimal={home_edge:.6f})"
-    )
-    reasons.append(
-        f"HOME line_ok={home_cond2} (home_spread={home_line:.2f})"
-    )
-    reasons.append(
-        f"AWAY edge_ok={away_cond1} (away_spread_edge_decimal={away_edge:.6f})"
-    )
-    reasons.append(
-        f"AWAY line_ok={away_cond2} (away_spread={away_line:.2f})"
-    )
-
-    return False, "FAIL STEP 2 NBA SPREAD | " + " | ".join(reasons)
+    return trace
 
 
 ###############################################################
-##################### STEP 3 NBA TOTAL ########################
+######################## TRACE RENDERING ######################
 ###############################################################
 
-def step3_nba_total(row):
-    line = f(row.get("total"))
-    proj = f(row.get("total_projected_points"))
-    home_spread = abs(f(row.get("home_spread")))
-    away_spread = abs(f(row.get("away_spread")))
-    max_spread = max(home_spread, away_spread)
-
-    over_edge = f(row.get("over_edge_decimal"))
-    under_edge = f(row.get("under_edge_decimal"))
-    proj_diff = abs(proj - line)
-
-    if line > 245:
-        return False, (
-            f"FAIL STEP 3 NBA TOTAL | total limit failed | "
-            f"total={line:.2f} > 245"
-        ), ""
-
-    if proj_diff < 3:
-        return False, (
-            f"FAIL STEP 3 NBA TOTAL | projection diff failed | "
-            f"abs(total_projected_points - total)={proj_diff:.2f} < 3 | "
-            f"total_projected_points={proj:.2f}, total={line:.2f}"
-        ), ""
-
-    if max_spread >= 13 and line >= 240:
-        return False, (
-            f"FAIL STEP 3 NBA TOTAL | blowout filter failed | "
-            f"max(abs(home_spread), abs(away_spread))={max_spread:.2f} >= 13 "
-            f"and total={line:.2f} >= 240"
-        ), ""
-
-    under_pass = False
-    over_pass = False
-
-    if line > 205 and 0.06 <= under_edge <= 0.40:
-        under_pass = True
-
-    if line <= 205:
-        if 0.04 <= over_edge <= 0.35:
-            over_pass = True
-    else:
-        if 0.06 <= over_edge <= 0.35:
-            over_pass = True
-
-    if over_pass and under_pass:
-        return True, (
-            f"PASS STEP 3 NBA TOTAL | BOTH passed | "
-            f"total={line:.2f}, total_projected_points={proj:.2f}, "
-            f"proj_diff={proj_diff:.2f}, max_spread={max_spread:.2f}, "
-            f"over_edge_decimal={over_edge:.6f}, under_edge_decimal={under_edge:.6f}"
-        ), "both"
-
-    if over_pass:
-        return True, (
-            f"PASS STEP 3 NBA TOTAL | OVER passed | "
-            f"total={line:.2f}, total_projected_points={proj:.2f}, "
-            f"proj_diff={proj_diff:.2f}, max_spread={max_spread:.2f}, "
-            f"over_edge_decimal={over_edge:.6f}, under_edge_decimal={under_edge:.6f}"
-        ), "over"
-
-    if under_pass:
-        return True, (
-            f"PASS STEP 3 NBA TOTAL | UNDER passed | "
-            f"total={line:.2f}, total_projected_points={proj:.2f}, "
-            f"proj_diff={proj_diff:.2f}, max_spread={max_spread:.2f}, "
-            f"under_edge_decimal={under_edge:.6f}, over_edge_decimal={over_edge:.6f}"
-        ), "under"
-
-    return False, (
-        f"FAIL STEP 3 NBA TOTAL | neither side passed | "
-        f"total={line:.2f}, total_projected_points={proj:.2f}, "
-        f"proj_diff={proj_diff:.2f}, max_spread={max_spread:.2f}, "
-        f"over_edge_decimal={over_edge:.6f}, under_edge_decimal={under_edge:.6f}"
-    ), ""
-
-
-##############################################################################################################################
-################### STEP 4 NCAAB MONEYLINE ####################
-###############################################################
+def values_text(rules, fields, shared, sides, i):
+    parts = []
 
-def step4_ncaab_moneyline(row):
-    home_ml = f(row.get("home_dk_moneyline_american"))
-    away_ml = f(row.get("away_dk_moneyline_american"))
+    for side in sides:
+        for field, col in rules["columns"].get(side, {}).items():
+            parts.append(f"{col}={fields[side][field][i]:.6f}")
 
-    home_edge = f(row.get("home_ml_edge_decimal"))
-    away_edge = f(row.get("away_ml_edge_decimal"))
+    for field, values in shared.items():
+        parts.append(f"{rules['shared'][field]}={values[i]:.6f}")
 
-    away_cond = away_ml > -150 and away_edge >= 0.08
-    home_cond = home_ml > -200 and home_edge >= 0.05
+    return ", ".join(dict.fromkeys(parts))
 
-    if away_cond:
-        row["_bet_side"] = "away"
-        row["_line"] = away_ml
-        return True, f"PASS STEP 4 NCAAB MONEYLINE | away condition + edge passed"
 
-    if home_cond:
-        row["_bet_side"] = "home"
-        row["_line"] = home_ml
-        return True, f"PASS STEP 4 NCAAB MONEYLINE | home condition + edge passed"
+def render_file(trace, df):
+    """Human-readable PASS/FAIL lines for one file's trace rows"""
+    name = STEP_FOR[(trace["league"].iloc[0], trace["market_type"].iloc[0])]
+    rules = STEPS[name]
+    labels = LABELS[name]
+    title = f"STEP {rules['spec']['step']} {name.replace('_', ' ').upper()}"
+    sides = list(rules["sides"])
 
-    return False, f"FAIL STEP 4 NCAAB MONEYLINE"
+    fields, shared = frame_fields(add_derived(df), rules)
+    records = df.to_dict("records")
 
+    lines = []
 
-###########################################################################################################
-#################### STEP 5 NCAAB SPREAD ######################
-###############################################################
+    for t in trace.itertuples(index=False):
+        i = t.row
+        head = f"{'PASS' if t.passed else 'FAIL'} | {t.league} | {t.market_type} | {game_label(records[i])}"
 
-def step5_ncaab_spread(row):
-    home_line = f(row.get("home_spread"))
-    away_line = f(row.get("away_spread"))
+        if t.passed:
+            side = "" if pd.isna(t.side) else t.side
+            picked = sides if side == "both" else [side] if side else []
+            who = side.upper() if side else "GAME"
+            lines.append(f"{head} | PASS {title} | {who} passed | {values_text(rules, fields, shared, picked, i)}")
+            continue
 
-    home_blocked = blocked_ncaab_spread_line(home_line)
-    away_blocked = blocked_ncaab_spread_line(away_line)
+        parts = [f"{label} failed" for label in explain_bits(t.require_bits, labels["require"])]
 
-    if home_blocked or away_blocked:
-        return False, (
-            f"FAIL STEP 5 NCAAB SPREAD | blocked range hit | "
-            f"home_spread={home_line:.2f}, away_spread={away_line:.2f}"
-        )
+        for side in sides:
+            failed = explain_bits(getattr(t, f"{side}_bits"), labels[side])
+            if failed:
+                parts.append(f"{side.upper()} failed: {'; '.join(failed)} ({values_text(rules, fields, {}, [side], i)})")
 
-    return True, (
-        f"PASS STEP 5 NCAAB SPREAD | line allowed | "
-        f"home_spread={home_line:.2f}, away_spread={away_line:.2f}"
-    )
+        if not sides:
+            parts.append(values_text(rules, fields, shared, [], i))
 
+        lines.append(f"{head} | FAIL {title} | " + " | ".join(parts))
 
-###############################################################
-#################### STEP 6 NCAAB TOTAL #######################
-###############################################################
+    return lines
 
-def step6_ncaab_total(row):
-    line = f(row.get("total"))
-    over_edge = f(row.get("over_edge_decimal"))
-    under_edge = f(row.get("under_edge_decimal"))
 
-    over_pass = 145 <= line <= 155 and 0.12 <= over_edge <= 0.18
-    under_pass = 141 <= line <= 150 and 0.10 <= under_edge <= 0.22
+def render_trace(trace_path=TRACE_FILE):
+    """Per-row report text from a saved trace, re-reading the input values"""
+    trace = pd.read_csv(trace_path, dtype={"side": str})
 
-    if over_pass and under_pass:
-        return True, (
-            f"PASS STEP 6 NCAAB TOTAL | BOTH passed | "
-            f"total={line:.2f}, over_edge_decimal={over_edge:.6f}, "
-            f"under_edge_decimal={under_edge:.6f}"
-        ), "both"
+    lines = []
 
-    if over_pass:
-        return True, (
-            f"PASS STEP 6 NCAAB TOTAL | OVER passed | "
-            f"total={line:.2f}, over_edge_decimal={over_edge:.6f}"
-        ), "over"
+    for file_name, part in trace.groupby("file", sort=False):
+        fpath = INPUT_DIR / file_name
+        if not fpath.exists():
+            lines.append(f"FILE {file_name} | INFO | input no longer available")
+            continue
 
-    if under_pass:
-        return True, (
-            f"PASS STEP 6 NCAAB TOTAL | UNDER passed | "
-            f"total={line:.2f}, under_edge_decimal={under_edge:.6f}"
-        ), "under"
+        lines.extend(render_file(part, pd.read_csv(fpath)))
 
-    return False, (
-        f"FAIL STEP 6 NCAAB TOTAL | neither side passed | "
-        f"total={line:.2f}, over_edge_decimal={over_edge:.6f}, "
-        f"under_edge_decimal={under_edge:.6f}"
-    ), ""
+    return lines
 
 
 ###############################################################
 #################### EDGE SELECTION ENGINE ####################
 ###############################################################
 
-def process_file(csv_file):
+def process_file(csv_file, report, traces):
     df = pd.read_csv(csv_file)
 
     if df.empty:
-        report_line(f"FILE {csv_file.name} | INFO | empty input file")
+        report.append(f"FILE {csv_file.name} | INFO | empty input file")
         return
 
     fname = csv_file.name.lower()
@@ -354,66 +250,37 @@ def process_file(csv_file):
     market_type = detect_market_from_filename(csv_file.name)
 
     if not market_type:
-        report_line(f"FILE {csv_file.name} | ERROR | could not detect market type from filename")
+        report.append(f"FILE {csv_file.name} | ERROR | could not detect market type from filename")
         return
 
-    report_line(f"FILE {csv_file.name} | START | league={league} | market_type={market_type} | rows={len(df)}")
-
-    selected_rows = []
-    pass_count = 0
-    fail_count = 0
-
-    for _, row in df.iterrows():
-        label = game_label(row)
-        bet_side = ""
-
-        if league == "NBA":
-            if market_type == "moneyline":
-                allowed, reason = step1_nba_moneyline(row)
-            elif market_type == "spread":
-                allowed, reason = step2_nba_spread(row)
-            elif market_type == "total":
-                allowed, reason, bet_side = step3_nba_total(row)
-            else:
-                allowed, reason = False, f"FAIL | unknown NBA market_type={market_type}"
-        else:
-            if market_type == "moneyline":
-                allowed, reason = step4_ncaab_moneyline(row)
-            elif market_type == "spread":
-                allowed, reason = step5_ncaab_spread(row)
-            elif market_type == "total":
-                allowed, reason, bet_side = step6_ncaab_total(row)
-            else:
-                allowed, reason = False, f"FAIL | unknown NCAAB market_type={market_type}"
-
-        if allowed:
-            row_dict = row.to_dict()
-            row_dict["market_type"] = market_type
-
-            if market_type == "total":
-                row_dict["bet_side"] = bet_side
-
-            if market_type == "moneyline":
-                row_dict["bet_side"] = row.get("_bet_side", "")
-                row_dict["line"] = row.get("_line", "")
-
-            selected_rows.append(row_dict)
-            pass_count += 1
-            report_line(f"PASS | {league} | {market_type} | {label} | {reason}")
-        else:
-            fail_count += 1
-            report_line(f"FAIL | {league} | {market_type} | {label} | {reason}")
-
-    if selected_rows:
-        out_df = pd.DataFrame(selected_rows)
+    report.append(f"FILE {csv_file.name} | START | league={league} | market_type={market_type} | rows={len(df)}")
+
+    name = STEP_FOR[(league, market_type)]
+
+    allowed, side, masks, fields, shared = evaluate_step(df, name)
+    traces.append(trace_frame(csv_file.name, league, market_type, name, allowed, side, fields, shared))
+
+    pass_count = int(allowed.sum())
+    fail_count = len(df) - pass_count
+
+    if pass_count:
+        out_df = df.loc[allowed].copy()
+        out_df["market_type"] = market_type
+
+        if masks:
+            out_df["bet_side"] = side[allowed]
+
+        if market_type == "moneyline":
+            out_df["line"] = chosen(side, fields, "odds")[allowed]
+
         out_path = OUTPUT_DIR / csv_file.name
         out_df.to_csv(out_path, index=False)
-        report_line(
+        report.append(
             f"FILE {csv_file.name} | DONE | selected_rows={len(out_df)} | passed={pass_count} | failed={fail_count} | output={out_path}"
         )
         print(f"Selected {len(out_df)} rows -> {out_path.name}")
     else:
-        report_line(
+        report.append(
             f"FILE {csv_file.name} | DONE | selected_rows=0 | passed={pass_count} | failed={fail_count} | no output file written"
         )
         print(f"Selected 0 rows -> {csv_file.name}")
@@ -424,21 +291,35 @@ def process_file(csv_file):
 ###############################################################
 
 def main():
-    reset_report()
+    # --report also renders the per-row PASS/FAIL text from the trace
+    render = "--report" in sys.argv[1:]
+
+    report = []
+    traces = []
 
     files = sorted(INPUT_DIR.glob("*.csv"))
 
     if not files:
-        report_line("MAIN | INFO | No input files found")
+        report.append("MAIN | INFO | No input files found")
+        write_report(report)
         return
 
     for fpath in files:
         try:
-            process_file(fpath)
+            process_file(fpath, report, traces)
         except Exception as e:
-            report_line(f"FILE {fpath.name} | ERROR | {type(e).__name__}: {e}")
+            report.append(f"FILE {fpath.name} | ERROR | {type(e).__name__}: {e}")
+
+    if traces:
+        pd.concat(traces, ignore_index=True).to_csv(TRACE_FILE, index=False)
+        report.append(f"MAIN | TRACE | {TRACE_FILE}")
+
+        if render:
+            report.extend(render_trace(TRACE_FILE))
+
+    report.append("MAIN | SUCCESS | Selection run complete")
 
-    report_line("MAIN | SUCCESS | Selection run complete")
+    write_report(report)
 
 
 if __name__ == "__main__":
@@ -1,5 +0,0 @@
-RUN_DATE="2026_03_04"
-NBA_TOTAL_STD=16
-NBA_SPREAD_STD=15
-NCAAB_TOTAL_STD=10
-NCAAB_SPREAD_STD=13
@@ -2,10 +2,18 @@
 # docs/win/basketball/scripts/00_parsing/name_normalization.py
 
 import csv
+import sys
 import pandas as pd
 from pathlib import Path
 from datetime import datetime
 
+# --- DYNAMIC PATH SETUP ---
+COMMON_DIR = str(Path(__file__).resolve().parents[5] / "scripts")
+if COMMON_DIR not in sys.path:
+    sys.path.append(COMMON_DIR)
+
+from common.alias_index import load_alias_index
+
 # =========================
 # LOGGER UTILITY
 # =========================
@@ -50,9 +58,6 @@ def audit(log_path, stage, status, msg="", df=None):
 
 INTAKE_DIR = Path("docs/win/basketball/00_intake")
 
-NBA_MAP_FILE = Path("mappings/basketball/team_map_nba.csv")
-NCAAB_MAP_FILE = Path("mappings/basketball/team_map_ncaab.csv")
-
 NO_MAP_DIR = Path("mappings/basketball/no_map")
 NO_MAP_DIR.mkdir(parents=True, exist_ok=True)
 NO_MAP_FILE = NO_MAP_DIR / "no_map_basketball.csv"
@@ -73,26 +78,12 @@ def log(msg: str) -> None:
 # LOAD TEAM MAPS (CASE INSENSITIVE)
 # =========================
 
-team_map = {}
-
-def load_map(map_file: Path):
-    if not map_file.exists():
-        log(f"WARNING: {map_file.name} not found")
-        return
-
-    with open(map_file, newline="", encoding="utf-8") as f:
-        reader = csv.DictReader(f)
-        for row in reader:
-            market = row.get("league", "").strip().lower()
-            alias = row.get("alias", "").strip().lower()
-            canonical = row.get("canonical_team", "").strip()
-
-            if market and alias and canonical:
-                team_map[(market, alias)] = canonical
-
-# Load both NBA and NCAAB maps
-load_map(NBA_MAP_FILE)
-load_map(NCAAB_MAP_FILE)
+# (market, alias) -> canonical, from the shared alias index
+team_map = {
+    (market, alias): canonical
+    for market, aliases in load_alias_index().items()
+    for alias, canonical in aliases.items()
+}
 
 # =========================
 # PROCESS FILES
@@ -1,6 +1,7 @@
 # docs/win/basketball/scripts/03_edges/compute_edges.py
 
 #!/usr/bin/env python3
+import numpy as np
 import pandas as pd
 from pathlib import Path
 import traceback
@@ -116,83 +117,75 @@ def ensure_decimal_columns(df):
 
 
 # =========================
-# EDGE COMPUTATION
+# MARKET SIDES
 # =========================
 
-def compute_moneyline_edges(df, league, date):
-    df = ensure_decimal_columns(df)
+# prefix -> (model juice decimal, sportsbook decimal). Output columns are
+# {prefix}_edge_decimal, {prefix}_edge_pct, {prefix}_ev and {prefix}_kelly.
+MARKET_SIDES = {
+    "moneyline": [
+        ("home_ml", "home_juice_decimal_moneyline", "home_dk_decimal_moneyline"),
+        ("away_ml", "away_juice_decimal_moneyline", "away_dk_decimal_moneyline"),
+    ],
+    "spread": [
+        ("home_spread", "home_spread_juice_decimal", "home_dk_spread_decimal"),
+        ("away_spread", "away_spread_juice_decimal", "away_dk_spread_decimal"),
+    ],
+    "total": [
+        ("over", "total_over_juice_decimal", "dk_total_over_decimal"),
+        ("under", "total_under_juice_decimal", "dk_total_under_decimal"),
+    ],
+}
 
-    required = [
-        "home_dk_decimal_moneyline",
-        "away_dk_decimal_moneyline",
-        "home_juice_decimal_moneyline",
-        "away_juice_decimal_moneyline",
-    ]
-    validate_columns(df, required)
 
-    df["home_ml_edge_decimal"] = calculate_edge(
-        df["home_juice_decimal_moneyline"],
-        df["home_dk_decimal_moneyline"]
-    )
+# =========================
+# EV / KELLY
+# =========================
 
-    df["away_ml_edge_decimal"] = calculate_edge(
-        df["away_juice_decimal_moneyline"],
-        df["away_dk_decimal_moneyline"]
-    )
+def compute_ev(model_decimal, book_decimal):
+    p = 1 / model_decimal
+    b = book_decimal - 1
 
-    return df
+    return (p * b) - (1 - p)
 
 
-def compute_spread_edges(df, league, date):
-    df = ensure_decimal_columns(df)
+def compute_kelly(model_decimal, book_decimal):
+    p = 1 / model_decimal
+    b = book_decimal - 1
+    q = 1 - p
 
-    required = [
-        "home_dk_spread_decimal",
-        "away_dk_spread_decimal",
-        "home_spread_juice_decimal",
-        "away_spread_juice_decimal",
-    ]
-    validate_columns(df, required)
-
-    # force numeric conversion before edge calculation
-    df["home_spread_juice_decimal"] = pd.to_numeric(df["home_spread_juice_decimal"], errors="coerce")
-    df["away_spread_juice_decimal"] = pd.to_numeric(df["away_spread_juice_decimal"], errors="coerce")
-    df["home_dk_spread_decimal"] = pd.to_numeric(df["home_dk_spread_decimal"], errors="coerce")
-    df["away_dk_spread_decimal"] = pd.to_numeric(df["away_dk_spread_decimal"], errors="coerce")
-
-    df["home_spread_edge_decimal"] = calculate_edge(
-        df["home_spread_juice_decimal"],
-        df["home_dk_spread_decimal"]
-    )
-
-    df["away_spread_edge_decimal"] = calculate_edge(
-        df["away_spread_juice_decimal"],
-        df["away_dk_spread_decimal"]
-    )
+    return np.maximum(((b * p) - q) / b, 0)
 
-    return df
 
+# =========================
+# EDGE + EV + KELLY
+# =========================
 
-def compute_total_edges(df, league):
+def compute_market(df, market):
+    """Edge, edge %, EV and Kelly for every side of one market in one pass"""
     df = ensure_decimal_columns(df)
 
-    required = [
-        "dk_total_over_decimal",
-        "dk_total_under_decimal",
-        "total_over_juice_decimal",
-        "total_under_juice_decimal",
-    ]
-    validate_columns(df, required)
+    sides = MARKET_SIDES[market]
+
+    validate_columns(df, [c for _, model, book in sides for c in (model, book)])
+
+    for _, model, book in sides:
+        df[model] = pd.to_numeric(df[model], errors="coerce")
+        df[book] = pd.to_numeric(df[book], errors="coerce")
+
+    edges = {prefix: calculate_edge(df[model], df[book]) for prefix, model, book in sides}
+
+    for prefix in edges:
+        df[f"{prefix}_edge_decimal"] = edges[prefix]
+
+    for prefix in edges:
+        df[f"{prefix}_edge_pct"] = edges[prefix] * 100
 
-    df["over_edge_decimal"] = calculate_edge(
-        df["total_over_juice_decimal"],
-        df["dk_total_over_decimal"]
-    )
+    for prefix, model, book in sides:
+        df[f"{prefix}_ev"] = compute_ev(df[model], df[book])
 
-    df["under_edge_decimal"] = calculate_edge(
-        df["total_under_juice_decimal"],
-        df["dk_total_under_decimal"]
-    )
+    for prefix, model, book in sides:
+        df[f"{prefix}_kelly"] = compute_kelly(df[model], df[book])
 
     return df
 
@@ -207,7 +200,7 @@ def atomic_write_csv(df, output_path):
     tmp.replace(output_path)
 
 
-def process_market_files(files, compute_fn, league, market):
+def process_market_files(files, league, market):
     if not files:
         audit(ERROR_LOG, f"{league}_{market.upper()}", "SKIPPED", "No files found.")
         return
@@ -215,13 +208,9 @@ def process_market_files(files, compute_fn, league, market):
     for f in files:
         try:
             df = pd.read_csv(f)
-            df = ensure_decimal_columns(df)
             date = extract_date_from_filename(f.name)
 
-            if market in ("moneyline", "spread"):
-                df = compute_fn(df, league, date)
-            else:
-                df = compute_fn(df, league)
+            df = compute_market(df, market)
 
             df = df.drop(columns=["home_play", "away_play"], errors="ignore")
 
@@ -250,26 +239,12 @@ def process_market_files(files, compute_fn, league, market):
 # =========================
 
 def process_league(league):
-    process_market_files(
-        sorted(INPUT_DIR.glob(f"*_{league}_moneyline.csv")),
-        compute_moneyline_edges,
-        league,
-        "moneyline"
-    )
-
-    process_market_files(
-        sorted(INPUT_DIR.glob(f"*_{league}_spread.csv")),
-        compute_spread_edges,
-        league,
-        "spread"
-    )
-
-    process_market_files(
-        sorted(INPUT_DIR.glob(f"*_{league}_total.csv")),
-        compute_total_edges,
-        league,
-        "total"
-    )
+    for market in MARKET_SIDES:
+        process_market_files(
+            sorted(INPUT_DIR.glob(f"*_{league}_{market}.csv")),
+            league,
+            market
+        )
 
 
 # =========================
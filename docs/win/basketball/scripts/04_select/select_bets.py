@@ -1,15 +1,26 @@
 #!/usr/bin/env python3
 # docs/win/basketball/scripts/04_select/select_bets.py
 
+import numpy as np
 import pandas as pd
 from pathlib import Path
 import re
+import sys
+
+# --- DYNAMIC PATH SETUP ---
+COMMON_DIR = str(Path(__file__).resolve().parents[5] / "scripts")
+if COMMON_DIR not in sys.path:
+    sys.path.append(COMMON_DIR)
+
+from common.correlated_selection import load_settings, select_correlated
+from common.kelly_portfolio import size_slate
+from common.rule_engine import chosen, frame_fields, load_rules, select
 
 ###############################################################
 ######################## PATH CONFIG ##########################
 ###############################################################
 
-INPUT_DIR = Path("docs/win/basketball/03_edges/ev_kelly")
+INPUT_DIR = Path("docs/win/basketball/03_edges")
 SELECT_DIR = Path("docs/win/basketball/04_select")
 DAILY_DIR = SELECT_DIR / "daily_slate"
 
@@ -17,112 +28,17 @@ SELECT_DIR.mkdir(parents=True, exist_ok=True)
 DAILY_DIR.mkdir(parents=True, exist_ok=True)
 
 ###############################################################
-######################## BAND HELPER ##########################
-###############################################################
-
-def in_bands(value, bands):
-    for low, high in bands:
-        if low <= value <= high:
-            return True
-    return False
-
+######################## RULE SETS ############################
 ###############################################################
-######################## NBA PARAMETERS #######################
-###############################################################
-
-# ---------- NBA MONEYLINE ----------
-
-NBA_ML_HOME_ODDS_BANDS = [(-200, 200)]
-NBA_ML_HOME_EDGE_BANDS = [(0.0001, 0.0199)]
-NBA_ALLOW_HOME_ML = True
-
-NBA_ML_AWAY_ODDS_BANDS = [(-200, 150.9)]
-NBA_ML_AWAY_EDGE_BANDS = [(0.0001, 1)]
-NBA_ALLOW_AWAY_ML = True
-
-# ---------- NBA SPREAD ----------
-
-NBA_SPREAD_HOME_BANDS = [
-    (-99, -5.1),
-    (7.6, 99),
-]
-
-NBA_SPREAD_HOME_EDGE_BANDS = [
-    (-1, 0.0199),
-    (0.10, 999),
-]
-
-NBA_ALLOW_HOME_SPREAD = True
-
-NBA_SPREAD_AWAY_BANDS = [
-    (-99, 1.9),
-    (5.1, 999),
-]
-
-NBA_SPREAD_AWAY_EDGE_BANDS = [
-    (-1, 0.03),
-    (0.10, 999),
-]
-
-NBA_ALLOW_AWAY_SPREAD = True
-
-# ---------- NBA TOTAL ----------
-
-NBA_TOTAL_OVER_BANDS = [(220, 400)]
-NBA_TOTAL_OVER_EDGE_BANDS = [(-1, 1)]
-NBA_ALLOW_OVER = True
 
-NBA_TOTAL_UNDER_BANDS = [(0, 400)]
-NBA_TOTAL_UNDER_EDGE_BANDS = [(-1, 1)]
-NBA_ALLOW_UNDER = True
-
-###############################################################
-######################## NCAAB PARAMETERS #####################
-###############################################################
-
-# ---------- NCAAB MONEYLINE ----------
-
-NCAAB_ML_HOME_ODDS_BANDS = [(-110, 120)]
-NCAAB_ML_HOME_EDGE_BANDS = [(-1, 1)]
-NCAAB_ALLOW_HOME_ML = True
-
-NCAAB_ML_AWAY_ODDS_BANDS = [(-110, 120)]
-NCAAB_ML_AWAY_EDGE_BANDS = [(-1, 1)]
-NCAAB_ALLOW_AWAY_ML = True
-
-# ---------- NCAAB SPREAD ----------
-
-NCAAB_SPREAD_HOME_BANDS = [(-40, 40)]
-NCAAB_SPREAD_HOME_EDGE_BANDS = [(-1, 1)]
-NCAAB_ALLOW_HOME_SPREAD = True
-
-NCAAB_SPREAD_AWAY_BANDS = [(-40, 40)]
-NCAAB_SPREAD_AWAY_EDGE_BANDS = [(-1, 1)]
-NCAAB_ALLOW_AWAY_SPREAD = True
-
-# ---------- NCAAB TOTAL ----------
-
-NCAAB_TOTAL_OVER_BANDS = [(0, 400)]
-NCAAB_TOTAL_OVER_EDGE_BANDS = [(-1, 1)]
-NCAAB_ALLOW_OVER = True
-
-NCAAB_TOTAL_UNDER_BANDS = [(0, 400)]
-NCAAB_TOTAL_UNDER_EDGE_BANDS = [(-1, 1)]
-NCAAB_ALLOW_UNDER = True
+# band rules per league / market live in config/selection_rules.json
+# ("basketball" section) and are compiled once here
+RULES = load_rules("basketball")
 
 ###############################################################
 ######################## HELPERS ##############################
 ###############################################################
 
-def f(x):
-    try:
-        if pd.isna(x):
-            return 0
-        return float(x)
-    except Exception:
-        return 0
-
-
 def detect_market(filename):
     name = filename.lower()
 
@@ -152,214 +68,134 @@ def clear_daily_outputs():
         fpath.unlink(missing_ok=True)
 
 ###############################################################
-######################## MONEYLINE ############################
+######################## SELECT ###############################
 ###############################################################
 
-def moneyline(row, league):
-    home_ml = f(row.get("home_dk_moneyline_american"))
-    away_ml = f(row.get("away_dk_moneyline_american"))
-
-    home_edge = f(row.get("home_ml_edge_decimal"))
-    away_edge = f(row.get("away_ml_edge_decimal"))
-
-    if league == "NBA":
-
-        if (
-            NBA_ALLOW_HOME_ML
-            and in_bands(home_ml, NBA_ML_HOME_ODDS_BANDS)
-            and in_bands(home_edge, NBA_ML_HOME_EDGE_BANDS)
-            and home_edge >= away_edge
-        ):
-            return True, "home", home_ml, home_edge
-
-        if (
-            NBA_ALLOW_AWAY_ML
-            and in_bands(away_ml, NBA_ML_AWAY_ODDS_BANDS)
-            and in_bands(away_edge, NBA_ML_AWAY_EDGE_BANDS)
-            and away_edge > home_edge
-        ):
-            return True, "away", away_ml, away_edge
-
-    else:
-
-        if (
-            NCAAB_ALLOW_HOME_ML
-            and in_bands(home_ml, NCAAB_ML_HOME_ODDS_BANDS)
-            and in_bands(home_edge, NCAAB_ML_HOME_EDGE_BANDS)
-            and home_edge >= away_edge
-        ):
-            return True, "home", home_ml, home_edge
-
-        if (
-            NCAAB_ALLOW_AWAY_ML
-            and in_bands(away_ml, NCAAB_ML_AWAY_ODDS_BANDS)
-            and in_bands(away_edge, NCAAB_ML_AWAY_EDGE_BANDS)
-            and away_edge > home_edge
-        ):
-            return True, "away", away_ml, away_edge
-
-    return False, "", "", 0
+def select_market(df, league, market):
+    """Keep mask, chosen side and its line for every row of one market file"""
+    rules = RULES[league][market]
+
+    fields, shared = frame_fields(df, rules)
+
+    ok, side = select(rules, fields, shared)
+
+    return ok, side, chosen(side, fields, "line")
 
 ###############################################################
-######################## SPREAD ###############################
+######################## PROCESS FILE #########################
 ###############################################################
 
-def spread(row, league):
-
-    home_line = f(row.get("home_spread"))
-    away_line = f(row.get("away_spread"))
+def process_file(file):
+    df = pd.read_csv(file)
 
-    home_edge = f(row.get("home_spread_edge_decimal"))
-    away_edge = f(row.get("away_spread_edge_decimal"))
+    if df.empty:
+        return None
 
-    if league == "NBA":
+    league = "NBA" if "nba" in file.name.lower() else "NCAAB"
+    market = detect_market(file.name)
+    game_date = extract_date(file.name)
 
-        home_valid = (
-            NBA_ALLOW_HOME_SPREAD
-            and in_bands(home_line, NBA_SPREAD_HOME_BANDS)
-            and in_bands(home_edge, NBA_SPREAD_HOME_EDGE_BANDS)
-        )
+    if game_date is None or market == "":
+        return None
 
-        # require edge > 0.10 if away spread >= +10
-        if away_line >= 10:
-            away_edge_ok = away_edge > 0.10
-        else:
-            away_edge_ok = in_bands(away_edge, NBA_SPREAD_AWAY_EDGE_BANDS)
+    ok, side, line = select_market(df, league, market)
 
-        away_valid = (
-            NBA_ALLOW_AWAY_SPREAD
-            and in_bands(away_line, NBA_SPREAD_AWAY_BANDS)
-            and away_edge_ok
-        )
+    if not ok.any():
+        return None
 
-    else:
+    out = df.loc[ok].reset_index(drop=True)
+    out["bet_side"] = side[ok]
+    out["line"] = line[ok]
+    out["market_type"] = market
+    out["market"] = league
+    out["game_date"] = game_date
+    out["source_date"] = game_date
+    out["source_league"] = league
 
-        home_valid = (
-            NCAAB_ALLOW_HOME_SPREAD
-            and in_bands(home_line, NCAAB_SPREAD_HOME_BANDS)
-            and in_bands(home_edge, NCAAB_SPREAD_HOME_EDGE_BANDS)
-        )
+    return out
 
-        away_valid = (
-            NCAAB_ALLOW_AWAY_SPREAD
-            and in_bands(away_line, NCAAB_SPREAD_AWAY_BANDS)
-            and in_bands(away_edge, NCAAB_SPREAD_AWAY_EDGE_BANDS)
-        )
+###############################################################
+######################## PORTFOLIO SIZING #####################
+###############################################################
 
-    if home_valid and away_valid:
-        if home_edge >= away_edge:
-            return True, "home", home_line, home_edge
-        return True, "away", away_line, away_edge
+# (market_type, bet_side) -> (model juice decimal, sportsbook decimal)
+SIDE_PRICES = {
+    ("moneyline", "home"): ("home_juice_decimal_moneyline", "home_dk_decimal_moneyline"),
+    ("moneyline", "away"): ("away_juice_decimal_moneyline", "away_dk_decimal_moneyline"),
+    ("spread", "home"): ("home_spread_juice_decimal", "home_dk_spread_decimal"),
+    ("spread", "away"): ("away_spread_juice_decimal", "away_dk_spread_decimal"),
+    ("total", "over"): ("total_over_juice_decimal", "dk_total_over_decimal"),
+    ("total", "under"): ("total_under_juice_decimal", "dk_total_under_decimal"),
+}
 
-    if home_valid:
-        return True, "home", home_line, home_edge
 
-    if away_valid:
-        return True, "away", away_line, away_edge
+def side_prices(df):
+    """(model juice decimal, sportsbook decimal) of each row's chosen side"""
+    model = pd.Series(np.nan, index=df.index)
+    book = pd.Series(np.nan, index=df.index)
 
-    return False, "", "", 0
+    for (market, side), (model_col, book_col) in SIDE_PRICES.items():
+        mask = (df["market_type"] == market) & (df["bet_side"] == side)
+        if mask.any() and model_col in df.columns and book_col in df.columns:
+            model[mask] = pd.to_numeric(df.loc[mask, model_col], errors="coerce")
+            book[mask] = pd.to_numeric(df.loc[mask, book_col], errors="coerce")
 
-###############################################################
-######################## TOTAL ################################
-###############################################################
+    return model, book
 
-def total(row, league):
-    line = f(row.get("total"))
-
-    over_edge = f(row.get("over_edge_decimal"))
-    under_edge = f(row.get("under_edge_decimal"))
-
-    if over_edge >= under_edge:
-        side = "over"
-        edge = over_edge
-    else:
-        side = "under"
-        edge = under_edge
-
-    if league == "NBA":
-
-        if (
-            side == "over"
-            and NBA_ALLOW_OVER
-            and in_bands(line, NBA_TOTAL_OVER_BANDS)
-            and in_bands(edge, NBA_TOTAL_OVER_EDGE_BANDS)
-        ):
-            return True, "over", line, edge
-
-        if (
-            side == "under"
-            and NBA_ALLOW_UNDER
-            and in_bands(line, NBA_TOTAL_UNDER_BANDS)
-            and in_bands(edge, NBA_TOTAL_UNDER_EDGE_BANDS)
-        ):
-            return True, "under", line, edge
-
-    else:
-
-        if (
-            side == "over"
-            and NCAAB_ALLOW_OVER
-            and in_bands(line, NCAAB_TOTAL_OVER_BANDS)
-            and in_bands(edge, NCAAB_TOTAL_OVER_EDGE_BANDS)
-        ):
-            return True, "over", line, edge
-
-        if (
-            side == "under"
-            and NCAAB_ALLOW_UNDER
-            and in_bands(line, NCAAB_TOTAL_UNDER_BANDS)
-            and in_bands(edge, NCAAB_TOTAL_UNDER_EDGE_BANDS)
-        ):
-            return True, "under", line, edge
-
-    return False, "", "", 0
 
-###############################################################
-######################## PROCESS FILE #########################
-###############################################################
+def add_portfolio_stakes(df):
+    """Simultaneous fractional Kelly across the whole slate (percent of bankroll)"""
+    model, book = side_prices(df)
 
-def process_file(file):
-    df = pd.read_csv(file)
+    stakes = size_slate(
+        1 / model,
+        book,
+        df["game_id"].astype(str),
+        df["market_type"],
+        df["bet_side"],
+    )
 
-    if df.empty:
-        return None
+    df["portfolio_kelly_pct"] = np.round(stakes * 100, 2)
 
-    league = "NBA" if "nba" in file.name.lower() else "NCAAB"
-    market = detect_market(file.name)
-    game_date = extract_date(file.name)
+    return df
 
-    if game_date is None or market == "":
-        return None
+###############################################################
+######################## CORRELATED SETS ######################
+###############################################################
 
-    rows = []
+def drop_correlated(df, league):
+    """
+    Keep the best joint set of bets per game (simulated margin / total from
+    the projected points); every bet is kept when the mode is off.
+    """
+    settings = load_settings(league)
 
-    for _, row in df.iterrows():
+    if settings is None or df.empty:
+        return df
 
-        if market == "moneyline":
-            ok, side, line, edge = moneyline(row, league)
+    _, book = side_prices(df)
 
-        elif market == "spread":
-            ok, side, line, edge = spread(row, league)
+    bets = pd.DataFrame({
+        "game_id": df["game_id"].astype(str),
+        "home_mean": df.get("home_projected_points"),
+        "away_mean": df.get("away_projected_points"),
+        "total_mean": df.get("total_projected_points"),
+        "market": df["market_type"],
+        "side": df["bet_side"],
+        # moneyline "line" holds the odds; the bet itself has no line
+        "line": np.where(df["market_type"] == "moneyline", 0.0, df["line"]),
+        "decimal": book,
+    })
 
-        else:
-            ok, side, line, edge = total(row, league)
-
-        if ok:
-            r = row.to_dict()
-            r["bet_side"] = side
-            r["line"] = line
-            r["market_type"] = market
-            r["market"] = league
-            r["game_date"] = game_date
-            rows.append(r)
-
-    if rows:
-        out = pd.DataFrame(rows)
-        out["source_date"] = game_date
-        out["source_league"] = league
-        return out
+    keep = select_correlated(
+        bets,
+        settings["model"],
+        n_sims=settings["n_sims"],
+        seed=settings["seed"],
+        risk_aversion=settings["risk_aversion"],
+    )
 
-    return None
+    return df.loc[keep]
 
 ###############################################################
 ######################## MAIN #################################
@@ -385,8 +221,12 @@ def main():
         print("No valid dated selections")
         return
 
+    counts = {"NBA": 0, "NCAAB": 0}
+
     for (date_value, league_value), sub in df.groupby(["source_date", "source_league"], dropna=False):
         out_df = sub.drop(columns=["source_date", "source_league"], errors="ignore")
+        out_df = drop_correlated(out_df, league_value)
+        out_df = add_portfolio_stakes(out_df.copy())
 
         if league_value == "NBA":
             out_file = DAILY_DIR / f"{date_value}_nba.csv"
@@ -395,11 +235,10 @@ def main():
 
         out_df.to_csv(out_file, index=False)
 
-    nba_count = len(df[df["source_league"] == "NBA"])
-    ncaab_count = len(df[df["source_league"] == "NCAAB"])
+        counts[league_value] = counts.get(league_value, 0) + len(out_df)
 
-    print("NBA bets:", nba_count)
-    print("NCAAB bets:", ncaab_count)
+    print("NBA bets:", counts["NBA"])
+    print("NCAAB bets:", counts["NCAAB"])
 
 
 if __name__ == "__main__":
@@ -1,31 +1,21 @@
 #!/usr/bin/env python3
 # docs/win/basketball/scripts/model_testing/analyze_betting_edges.py
 
+import sys
+from pathlib import Path
+
 import pandas as pd
 import numpy as np
 
-FILE = "docs/win/basketball/model_testing/graded/NBA_final.csv"
-FILE2 = "docs/win/basketball/model_testing/graded/NCAAB_final.csv"
-
+# --- DYNAMIC PATH SETUP ---
+COMMON_DIR = str(Path(__file__).resolve().parents[5] / "scripts")
+if COMMON_DIR not in sys.path:
+    sys.path.append(COMMON_DIR)
 
-def roi(df):
-    if df.empty:
-        return 0
+from common.profit_engine import bankroll_curve, bet_profits, max_drawdown, roi
 
-    profit = 0
-
-    for _, r in df.iterrows():
-        odds = float(r["take_odds"])
-
-        if r["bet_result"] == "Win":
-            if odds > 0:
-                profit += odds / 100
-            else:
-                profit += 100 / abs(odds)
-        else:
-            profit -= 1
-
-    return profit / len(df)
+FILE = "docs/win/basketball/model_testing/graded/NBA_final.csv"
+FILE2 = "docs/win/basketball/model_testing/graded/NCAAB_final.csv"
 
 
 def odds_band(x):
@@ -39,6 +29,19 @@ def odds_band(x):
     return "other"
 
 
+def analyze_bankroll(df,league):
+
+    print(f"\n===== {league} BANKROLL (1u flat) =====")
+
+    df = df.sort_values("game_date", kind="mergesort")
+    profits = bet_profits(df)
+
+    curve = bankroll_curve(profits)
+
+    print("bets:",len(df),"units:",round(float(np.nansum(profits)),2),"ROI:",round(roi(df),4))
+    print("max drawdown:",round(max_drawdown(curve,0.0),2),"units")
+
+
 def analyze_moneyline(df,league):
 
     print(f"\n===== {league} MONEYLINE =====")
@@ -140,6 +143,9 @@ def main():
     nba = pd.read_csv(FILE)
     ncaab = pd.read_csv(FILE2)
 
+    analyze_bankroll(nba,"NBA")
+    analyze_bankroll(ncaab,"NCAAB")
+
     analyze_moneyline(nba,"NBA")
     analyze_moneyline(ncaab,"NCAAB")
 
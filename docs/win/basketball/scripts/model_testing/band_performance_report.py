@@ -1,10 +1,18 @@
 #!/usr/bin/env python3
 # docs/win/basketball/scripts/model_testing/band_performance_report.py
 
+import sys
 from pathlib import Path
 
 import pandas as pd
 
+# --- DYNAMIC PATH SETUP ---
+COMMON_DIR = str(Path(__file__).resolve().parents[5] / "scripts")
+if COMMON_DIR not in sys.path:
+    sys.path.append(COMMON_DIR)
+
+from common.profit_engine import bet_profits
+
 NBA_FILE = Path("docs/win/basketball/model_testing/graded/nba/NBA_final.csv")
 NCAAB_FILE = Path("docs/win/basketball/model_testing/graded/ncaab/NCAAB_final.csv")
 OUTPUT = Path("docs/win/basketball/model_testing/band_performance_report.csv")
@@ -18,26 +26,6 @@ def bucket(series, bins):
     return pd.cut(series, bins=bins, include_lowest=True)
 
 
-def profit_from_row(row):
-    result = row.get("bet_result", "")
-    odds = row.get("take_odds", -110)
-
-    if pd.isna(odds) or odds == "":
-        odds = -110
-
-    odds = float(odds)
-
-    if result == "Win":
-        if odds > 0:
-            return odds / 100.0
-        return 100.0 / abs(odds)
-
-    if result == "Loss":
-        return -1.0
-
-    return 0.0
-
-
 def build_table(df, league):
     rows = []
 
@@ -61,7 +49,7 @@ def build_table(df, league):
                 continue
 
             sub["band"] = bucket(sub["line"], bins)
-            sub["profit"] = sub.apply(profit_from_row, axis=1)
+            sub["profit"] = bet_profits(sub, default_odds=-110).fillna(0.0)
 
             grouped = sub.groupby("band", dropna=False)
 
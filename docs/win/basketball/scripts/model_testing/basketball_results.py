@@ -1,12 +1,21 @@
 #!/usr/bin/env python3
 # docs/win/basketball/scripts/model_testing/basketball_results.py
 
+import sys
 import traceback
 from datetime import datetime
 from pathlib import Path
 
 import pandas as pd
 
+# --- DYNAMIC PATH SETUP ---
+COMMON_DIR = str(Path(__file__).resolve().parents[5] / "scripts")
+if COMMON_DIR not in sys.path:
+    sys.path.append(COMMON_DIR)
+
+from common.game_index import join_scores, update_queue
+from common.grading import grade_frame
+
 ERROR_DIR = Path("docs/win/final_scores/errors")
 ERROR_DIR.mkdir(parents=True, exist_ok=True)
 ERROR_LOG = ERROR_DIR / "basketball_results_errors.txt"
@@ -40,41 +49,6 @@ def safe_read_csv(path):
         return pd.DataFrame()
 
 
-def determine_outcome(row):
-    market = row["market_type"]
-    side = row["bet_side"]
-    line = float(row["line"])
-    away = float(row["away_score"])
-    home = float(row["home_score"])
-
-    if market == "moneyline":
-        if side == "home":
-            return "Win" if home > away else "Loss"
-        return "Win" if away > home else "Loss"
-
-    if market == "spread":
-        if side == "home":
-            val = (home + line) - away
-        else:
-            val = (away + line) - home
-
-        if val > 0:
-            return "Win"
-        if val < 0:
-            return "Loss"
-        return "Push"
-
-    if market == "total":
-        total = home + away
-        if total == line:
-            return "Push"
-        if side == "over":
-            return "Win" if total > line else "Loss"
-        return "Win" if total < line else "Loss"
-
-    return "Unknown"
-
-
 def write_master(league, graded_dir):
     files = sorted(graded_dir.glob("*_results_*.csv"))
     if not files:
@@ -99,6 +73,9 @@ def grade_league(bets_file, scores_dir, graded_dir, league):
 
     bets_df["game_date"] = bets_df["game_date"].astype(str)
 
+    graded_dates = []
+    unmatched = []
+
     for date in sorted(bets_df.game_date.unique()):
         score_file = Path(scores_dir) / f"{date}_final_scores_{league}.csv"
         if not score_file.exists():
@@ -110,18 +87,16 @@ def grade_league(bets_file, scores_dir, graded_dir, league):
             continue
 
         daily = bets_df[bets_df.game_date == date].copy()
-        merged = pd.merge(
-            daily,
-            scores_df,
-            on=["away_team", "home_team", "game_date"],
-            how="inner",
-        )
+        merged, missed = join_scores(daily, scores_df)
+
+        graded_dates.append(date)
+        unmatched.append(missed)
 
         if merged.empty:
             audit("GRADE", "SKIP", f"No merge rows for {league} {date}")
             continue
 
-        merged["bet_result"] = merged.apply(determine_outcome, axis=1)
+        merged["bet_result"] = grade_frame(merged)
 
         keep_cols = [
             "game_date",
@@ -142,6 +117,11 @@ def grade_league(bets_file, scores_dir, graded_dir, league):
         out = merged[[col for col in keep_cols if col in merged.columns]].copy()
         out.to_csv(graded_dir / f"{date}_results_{league}.csv", index=False)
 
+    if graded_dates:
+        queue_path = graded_dir / f"{league}_unmatched.csv"
+        open_rows = update_queue(queue_path, pd.concat(unmatched, ignore_index=True), graded_dates)
+        audit("RECONCILE", "QUEUE", f"{league} unmatched bets open: {open_rows} -> {queue_path}")
+
 
 def process_results():
     with open(ERROR_LOG, "w", encoding="utf-8") as f:
@@ -2,21 +2,20 @@
 # docs/win/basketball/scripts/model_testing/build_juice_files.py
 
 import glob
+import json
 from pathlib import Path
 
 import pandas as pd
 from scipy.stats import norm, poisson
 
-CONFIG = Path("docs/win/basketball/model_testing/rule_config.py")
+CONFIG = Path("docs/win/basketball/model_testing/rule_config.json")
 INPUT_DIR = Path("docs/win/basketball/01_merge")
 
 
 def load_config():
     if not CONFIG.exists():
         return {}
-    scope = {}
-    exec(CONFIG.read_text(), {}, scope)
-    return scope
+    return json.loads(CONFIG.read_text())
 
 
 CFG = load_config()
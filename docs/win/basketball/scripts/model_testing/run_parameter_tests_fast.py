@@ -5,12 +5,20 @@ import itertools
 import math
 import os
 import random
+import sys
 import time
 from concurrent.futures import ProcessPoolExecutor, as_completed
 from pathlib import Path
 
 import pandas as pd
 
+# --- DYNAMIC PATH SETUP ---
+COMMON_DIR = str(Path(__file__).resolve().parents[5] / "scripts")
+if COMMON_DIR not in sys.path:
+    sys.path.append(COMMON_DIR)
+
+from common.profit_engine import roi as unit_roi
+
 
 RUN_DATES = [
     "2026_02_24",
@@ -107,23 +115,8 @@ def build_grid():
 
 def roi(df):
 
-    if df.empty:
-        return 0
-
-    odds = pd.to_numeric(df["take_odds"], errors="coerce").fillna(-110)
-    results = df["bet_result"].astype(str)
-
-    wins = results == "Win"
-    losses = results == "Loss"
-
-    profit = pd.Series(0.0, index=df.index)
-
-    profit.loc[wins & (odds > 0)] = odds[wins & (odds > 0)] / 100
-    profit.loc[wins & (odds < 0)] = 100 / odds[wins & (odds < 0)].abs()
-
-    profit.loc[losses] = -1
-
-    return profit.sum() / len(df)
+    # unpriced bets are assumed to be at -110
+    return unit_roi(df, default_odds=-110)
 
 
 def win_pct(df):
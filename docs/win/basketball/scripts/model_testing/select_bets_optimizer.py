@@ -1,6 +1,7 @@
 #!/usr/bin/env python3
 # docs/win/basketball/scripts/model_testing/select_bets_optimizer.py
 
+import json
 from pathlib import Path
 
 import pandas as pd
@@ -8,7 +9,7 @@ import pandas as pd
 INPUT_DIR = Path("docs/win/basketball/03_edges")
 OUTPUT_FILE = Path("docs/win/basketball/04_select/selected_bets.csv")
 STATS_FILE = Path("docs/win/basketball/model_testing/optimizer_stats.csv")
-CONFIG_PATH = Path("docs/win/basketball/model_testing/rule_config.py")
+CONFIG_PATH = Path("docs/win/basketball/model_testing/rule_config.json")
 
 
 def load_config():
@@ -25,8 +26,7 @@ def load_config():
     }
 
     if CONFIG_PATH.exists():
-        scope = {}
-        exec(CONFIG_PATH.read_text(), {}, scope)
+        scope = json.loads(CONFIG_PATH.read_text())
         for key in cfg:
             if key in scope:
                 cfg[key] = scope[key]
@@ -8,6 +8,13 @@ from datetime import datetime
 import traceback
 import pandas as pd
 
+# --- DYNAMIC PATH SETUP ---
+COMMON_DIR = str(Path(__file__).resolve().parents[5] / "scripts")
+if COMMON_DIR not in sys.path:
+    sys.path.append(COMMON_DIR)
+
+from common.alias_index import canonical_team, load_alias_index, market_aliases
+
 # =========================
 # LOGGER UTILITY
 # =========================
@@ -69,6 +76,7 @@ HEADERS = [
     "market",
     "away_team",
     "home_team",
+    "game_id",
     "away_score",
     "home_score",
     "total",
@@ -110,6 +118,9 @@ def first_field(line: str) -> str:
 
 
 def parse_games(lines, market):
+    # team names are written canonical, so the game_id matches the bets
+    aliases = market_aliases(load_alias_index(), market)
+
     rows = []
     i = 0
 
@@ -129,12 +140,12 @@ def parse_games(lines, market):
             i += 1
             continue
 
-        away_team = away_parts[1].strip()
+        away_team = canonical_team(aliases, away_parts[1].strip())
         i += 1
         if i >= len(lines):
             break
 
-        home_team = first_field(lines[i])
+        home_team = canonical_team(aliases, first_field(lines[i]))
         i += 1
 
         while i < len(lines) and not first_field(lines[i]).isdigit():
@@ -172,6 +183,7 @@ def parse_games(lines, market):
                 "market": market,
                 "away_team": away_team,
                 "home_team": home_team,
+                "game_id": f"{game_date}_{away_team}_{home_team}",
                 "away_score": str(away_score),
                 "home_score": str(home_score),
                 "total": str(total),
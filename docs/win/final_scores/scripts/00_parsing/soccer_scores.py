@@ -9,6 +9,13 @@ from datetime import datetime
 import traceback
 import pandas as pd
 
+# --- DYNAMIC PATH SETUP ---
+COMMON_DIR = str(Path(__file__).resolve().parents[5] / "scripts")
+if COMMON_DIR not in sys.path:
+    sys.path.append(COMMON_DIR)
+
+from common.alias_index import canonical_team, load_alias_index, market_aliases
+
 # =========================
 # LOGGER UTILITY
 # =========================
@@ -62,6 +69,8 @@ def convert_to_pipeline_date(s: str) -> str:
 
 def parse_soccer(lines, market):
 
+    aliases = market_aliases(load_alias_index(), market)
+
     games = []
     i = 0
 
@@ -83,13 +92,13 @@ def parse_soccer(lines, market):
         row_data = lines[i].split("\t")
 
         match_time = row_data[0].strip()
-        away_team = row_data[1].strip() if len(row_data) > 1 else ""
+        away_team = canonical_team(aliases, row_data[1].strip()) if len(row_data) > 1 else ""
 
         i += 1
         if i >= len(lines):
             break
 
-        home_team = lines[i].split("\t")[0].strip()
+        home_team = canonical_team(aliases, lines[i].split("\t")[0].strip())
 
         score_count = 0
         away_score = ""
@@ -3,11 +3,21 @@
 
 import glob
 import re
+import sys
 from datetime import datetime
 from pathlib import Path
 
 import pandas as pd
 
+# --- DYNAMIC PATH SETUP ---
+COMMON_DIR = str(Path(__file__).resolve().parents[6] / "scripts")
+if COMMON_DIR not in sys.path:
+    sys.path.append(COMMON_DIR)
+
+from common.game_index import join_scores, update_queue
+from common.graded_ledger import load_state, pending_dates, save_state, upsert
+from common.grading import grade_frame
+
 ###############################################################
 ######################## PATH CONFIG ##########################
 ###############################################################
@@ -21,6 +31,13 @@ NCAAB_SCORE_DIR = Path("docs/win/final_scores/results/ncaab/final_scores")
 NBA_OUTPUT = Path("docs/win/final_scores/results/nba/graded")
 NCAAB_OUTPUT = Path("docs/win/final_scores/results/ncaab/graded")
 
+NBA_STATE = NBA_OUTPUT / "NBA_graded_state.json"
+NCAAB_STATE = NCAAB_OUTPUT / "NCAAB_graded_state.json"
+
+RECONCILE_DIR = Path("docs/win/final_scores/reconciliation")
+NBA_QUEUE = RECONCILE_DIR / "NBA_unmatched.csv"
+NCAAB_QUEUE = RECONCILE_DIR / "NCAAB_unmatched.csv"
+
 DEEP_SUMMARY_BASE = Path("docs/win/final_scores/deeper_summaries")
 NBA_DEEP_DIR = DEEP_SUMMARY_BASE / "nba"
 NCAAB_DEEP_DIR = DEEP_SUMMARY_BASE / "ncaab"
@@ -81,115 +98,53 @@ def safe_read(path):
         return pd.DataFrame()
 
 
-def clear_old_outputs():
-    try:
-        for outdir in [NBA_OUTPUT, NCAAB_OUTPUT]:
-            outdir.mkdir(parents=True, exist_ok=True)
-
-            for f in outdir.glob("*_results_*.csv"):
-                f.unlink(missing_ok=True)
-
-            for f in outdir.glob("*_final.csv"):
-                f.unlink(missing_ok=True)
-
-        log_summary("CLEARED OLD GRADED OUTPUTS")
-    except Exception as e:
-        log_error(f"CLEAR OUTPUTS ERROR | {e}")
-
-
-###############################################################
-######################## OUTCOME LOGIC ########################
-###############################################################
-
-def determine_outcome(row):
-    try:
-        market = str(row.get("market_type", "")).strip().lower()
-        side = str(row.get("bet_side", "")).strip().lower()
-
-        away = float(row["away_score"])
-        home = float(row["home_score"])
-
-        if market == "moneyline":
-            if away == home:
-                return "Push"
-            if side == "home":
-                return "Win" if home > away else "Loss"
-            if side == "away":
-                return "Win" if away > home else "Loss"
-
-        if market == "spread":
-            line = float(row.get("line", 0))
-
-            if side == "home":
-                diff = (home + line) - away
-            elif side == "away":
-                diff = (away + line) - home
-            else:
-                return "Unknown"
-
-            if abs(diff) < 1e-9:
-                return "Push"
-            return "Win" if diff > 0 else "Loss"
-
-        if market == "total":
-            line = float(row.get("line", 0))
-            total = away + home
-
-            if abs(total - line) < 1e-9:
-                return "Push"
-
-            if side == "over":
-                return "Win" if total > line else "Loss"
-            if side == "under":
-                return "Win" if total < line else "Loss"
-
-    except Exception as e:
-        log_error(f"DETERMINE OUTCOME ERROR | {e}")
-
-    return "Unknown"
-
-
 ###############################################################
 ######################## GRADING ##############################
 ###############################################################
 
-def grade_league(league):
+def grade_league(league, state):
+    """Grade only dates with new or changed inputs; the dates written"""
     if league == "NBA":
         score_dir = NBA_SCORE_DIR
         output_dir = NBA_OUTPUT
+        queue_path = NBA_QUEUE
         pattern = "*_nba.csv"
         suffix = "NBA"
     else:
         score_dir = NCAAB_SCORE_DIR
         output_dir = NCAAB_OUTPUT
+        queue_path = NCAAB_QUEUE
         pattern = "*_ncaab.csv"
         suffix = "NCAAB"
 
     output_dir.mkdir(parents=True, exist_ok=True)
 
     bet_files = glob.glob(str(SELECT_DIR / pattern))
-    dates = set()
+    inputs = {}
 
-    for f in bet_files:
+    for f in sorted(bet_files):
         m = re.search(r"(\d{4}_\d{2}_\d{2})", f)
-        if m:
-            dates.add(m.group(1))
+        if not m:
+            continue
 
-    if not dates:
-        log_error(f"{league} NO DATES FOUND IN SELECT DIR | {SELECT_DIR}")
+        date = m.group(1)
+        score_file = score_dir / f"{date}_final_scores_{suffix}.csv"
 
-    for date in sorted(dates):
-        try:
-            score_file = score_dir / f"{date}_final_scores_{suffix}.csv"
+        if not score_file.exists():
+            log_error(f"{league} SCORE FILE MISSING | {score_file}")
+            continue
 
-            if not score_file.exists():
-                log_error(f"{league} SCORE FILE MISSING | {score_file}")
-                continue
+        inputs.setdefault(date, []).extend([f, str(score_file)])
+
+    if not bet_files:
+        log_error(f"{league} NO DATES FOUND IN SELECT DIR | {SELECT_DIR}")
 
-            if league == "NBA":
-                bet_paths = glob.glob(str(SELECT_DIR / f"{date}_nba.csv"))
-            else:
-                bet_paths = glob.glob(str(SELECT_DIR / f"{date}_ncaab.csv"))
+    graded = []
+    unmatched = []
+
+    for date, digest in pending_dates(inputs, state).items():
+        try:
+            bet_paths, score_file = inputs[date][:-1], inputs[date][-1]
 
             dfs = [safe_read(x) for x in bet_paths]
             dfs = [d for d in dfs if not d.empty]
@@ -206,21 +161,23 @@ def grade_league(league):
                 continue
 
             try:
-                df = pd.merge(
-                    bets,
-                    scores,
-                    on=["away_team", "home_team", "game_date"],
-                    validate="many_to_one",
-                )
+                df, missed = join_scores(bets, scores)
             except Exception as e:
-                log_error(f"{league} MERGE ERROR | {date} | {e}")
+                log_error(f"{league} JOIN ERROR | {date} | {e}")
                 continue
 
-            df["bet_result"] = df.apply(determine_outcome, axis=1)
+            if not missed.empty:
+                log_error(f"{league} UNMATCHED BETS | {date} | ROWS={len(missed)} | QUEUE={queue_path}")
+
+            df["bet_result"] = grade_frame(df)
 
             outfile = output_dir / f"{date}_results_{suffix}.csv"
             df.to_csv(outfile, index=False)
 
+            state["dates"][date] = digest
+            graded.append(date)
+            unmatched.append(missed)
+
             result_counts = df["bet_result"].astype(str).value_counts(dropna=False).to_dict()
             log_summary(
                 f"{league} GRADED | DATE={date} | ROWS={len(df)} | RESULTS={result_counts} | OUT={outfile}"
@@ -229,8 +186,15 @@ def grade_league(league):
         except Exception as e:
             log_error(f"{league} GRADE LOOP ERROR | {date} | {e}")
 
+    if graded:
+        open_rows = update_queue(queue_path, pd.concat(unmatched, ignore_index=True), graded)
+        log_summary(f"{league} RECONCILIATION QUEUE | OPEN={open_rows} | OUT={queue_path}")
+
+    return graded
 
-def build_master(league):
+
+def update_master(league, dates):
+    """Upsert the newly graded dates into the master ledger"""
     if league == "NBA":
         outdir = NBA_OUTPUT
         suffix = "NBA"
@@ -239,33 +203,27 @@ def build_master(league):
         suffix = "NCAAB"
 
     try:
-        files = sorted(glob.glob(str(outdir / f"*_results_{suffix}.csv")))
-        dfs = [safe_read(f) for f in files]
+        master_path = outdir / f"{suffix}_final.csv"
+        master = safe_read(master_path) if master_path.exists() else pd.DataFrame()
+
+        dfs = [safe_read(outdir / f"{date}_results_{suffix}.csv") for date in dates]
         dfs = [d for d in dfs if not d.empty]
 
         if not dfs:
             log_error(f"{league} NO GRADED FILES FOR MASTER")
             return
 
-        df = pd.concat(dfs, ignore_index=True)
-
-        sort_cols = [
-            c for c in ["game_date", "away_team", "home_team", "market_type", "bet_side"]
-            if c in df.columns
-        ]
-        if sort_cols:
-            df = df.sort_values(sort_cols, kind="mergesort")
-
-        master = outdir / f"{suffix}_final.csv"
-        df.to_csv(master, index=False)
+        df, replaced = upsert(master, pd.concat(dfs, ignore_index=True), dates)
+        df.to_csv(master_path, index=False)
 
         result_counts = df["bet_result"].astype(str).value_counts(dropna=False).to_dict() if "bet_result" in df.columns else {}
         log_summary(
-            f"{league} MASTER BUILT | ROWS={len(df)} | RESULTS={result_counts} | OUT={master}"
+            f"{league} MASTER UPSERTED | ROWS={len(df)} | DATES={len(dates)} | REPLACED={len(replaced)} "
+            f"| RESULTS={result_counts} | OUT={master_path}"
         )
 
     except Exception as e:
-        log_error(f"{league} BUILD MASTER ERROR | {e}")
+        log_error(f"{league} UPDATE MASTER ERROR | {e}")
 
 
 ###############################################################
@@ -275,11 +233,24 @@ def build_master(league):
 def main():
     reset_logs()
     log_summary("START basketball_results_grade.py")
-    clear_old_outputs()
 
     for league in ["NBA", "NCAAB"]:
-        grade_league(league)
-        build_master(league)
+        if league == "NBA":
+            master_path = NBA_OUTPUT / "NBA_final.csv"
+            state_path = NBA_STATE
+        else:
+            master_path = NCAAB_OUTPUT / "NCAAB_final.csv"
+            state_path = NCAAB_STATE
+
+        state = load_state(state_path) if master_path.exists() else {"dates": {}}
+
+        dates = grade_league(league, state)
+        if not dates:
+            log_summary(f"{league} NO NEW SCORE DATES")
+            continue
+
+        update_master(league, dates)
+        save_state(state, state_path)
 
     log_summary("END basketball_results_grade.py")
     print("Basketball grading complete.")
@@ -1,11 +1,19 @@
 #!/usr/bin/env python3
 # docs/win/final_scores/scripts/05_results/basketball_results_reports.py
 
+import sys
 from datetime import datetime
 from pathlib import Path
 
 import pandas as pd
 
+# --- DYNAMIC PATH SETUP ---
+COMMON_DIR = str(Path(__file__).resolve().parents[6] / "scripts")
+if COMMON_DIR not in sys.path:
+    sys.path.append(COMMON_DIR)
+
+from common.results_summary import summarize_groups, summarize_levels
+
 ###############################################################
 ######################## PATH CONFIG ##########################
 ###############################################################
@@ -84,44 +92,8 @@ def write_csv(df, path):
 ######################## SUMMARY CORE #########################
 ###############################################################
 
-def summarize(df):
-    if df is None or df.empty or "bet_result" not in df.columns:
-        return 0, 0, 0, 0, 0.0
-
-    wins = int((df["bet_result"] == "Win").sum())
-    losses = int((df["bet_result"] == "Loss").sum())
-    pushes = int((df["bet_result"] == "Push").sum())
-    total = wins + losses + pushes
-    win_pct = (wins / (wins + losses)) if (wins + losses) > 0 else 0.0
-
-    return wins, losses, pushes, total, round(win_pct, 4)
-
-
 def aggregate_results(df, group_cols):
-    if df is None or df.empty:
-        return pd.DataFrame()
-
-    rows = []
-
-    grouped = df.groupby(group_cols, dropna=False)
-    for keys, sub in grouped:
-        wins, losses, pushes, total, win_pct = summarize(sub)
-
-        if not isinstance(keys, tuple):
-            keys = (keys,)
-
-        row = {}
-        for i, col in enumerate(group_cols):
-            row[col] = keys[i]
-
-        row["Win"] = wins
-        row["Loss"] = losses
-        row["Push"] = pushes
-        row["Total"] = total
-        row["Win_Pct"] = win_pct
-        rows.append(row)
-
-    return pd.DataFrame(rows)
+    return summarize_groups(df, group_cols)
 
 
 ###############################################################
@@ -271,23 +243,8 @@ def build_total_outputs(work, league, outdir):
 
 def build_market_tally(df, league):
     try:
-        out_rows = []
-
-        for market_type in ["moneyline", "spread", "total"]:
-            sub = df[df["market_type"] == market_type]
-            w, l, p, t, pct = summarize(sub)
-
-            out_rows.append({
-                "market": league,
-                "market_type": market_type,
-                "Win": w,
-                "Loss": l,
-                "Push": p,
-                "Total": t,
-                "Win_Pct": pct,
-            })
-
-        out = pd.DataFrame(out_rows)
+        out = summarize_levels(df, "market_type", ["moneyline", "spread", "total"])
+        out.insert(0, "market", league)
 
         if league == "NBA":
             write_csv(out, NBA_MARKET_TALLY)
@@ -2,12 +2,24 @@
 # docs/win/final_scores/scripts/05_results/basketball_results.py
 
 import glob
+import io
 import re
+import sys
 from datetime import datetime
 from pathlib import Path
 
 import pandas as pd
 
+# --- DYNAMIC PATH SETUP ---
+COMMON_DIR = str(Path(__file__).resolve().parents[5] / "scripts")
+if COMMON_DIR not in sys.path:
+    sys.path.append(COMMON_DIR)
+
+from common.game_index import join_scores, queue_rows, read_queue
+from common.graded_ledger import load_state, pending_dates, save_state, upsert
+from common.grading import grade_frame
+from common.results_summary import summarize_groups
+
 ###############################################################
 ######################## PATH CONFIG ##########################
 ###############################################################
@@ -21,6 +33,13 @@ NCAAB_SCORE_DIR = Path("docs/win/final_scores/results/ncaab/final_scores")
 NBA_OUTPUT = Path("docs/win/final_scores/results/nba/graded")
 NCAAB_OUTPUT = Path("docs/win/final_scores/results/ncaab/graded")
 
+NBA_STATE = NBA_OUTPUT / "NBA_graded_state.json"
+NCAAB_STATE = NCAAB_OUTPUT / "NCAAB_graded_state.json"
+
+RECONCILE_DIR = Path("docs/win/final_scores/reconciliation")
+NBA_QUEUE = RECONCILE_DIR / "NBA_unmatched.csv"
+NCAAB_QUEUE = RECONCILE_DIR / "NCAAB_unmatched.csv"
+
 DEEP_SUMMARY_BASE = Path("docs/win/final_scores/deeper_summaries")
 NBA_DEEP_DIR = DEEP_SUMMARY_BASE / "nba"
 NCAAB_DEEP_DIR = DEEP_SUMMARY_BASE / "ncaab"
@@ -28,6 +47,27 @@ NCAAB_DEEP_DIR = DEEP_SUMMARY_BASE / "ncaab"
 NBA_MARKET_TALLY = Path("docs/win/final_scores/nba_market_tally.csv")
 NCAAB_MARKET_TALLY = Path("docs/win/final_scores/ncaab_market_tally.csv")
 
+TALLY_MARKETS = ["moneyline", "spread", "total"]
+
+LEAGUE_PATHS = {
+    "NBA": {
+        "output": NBA_OUTPUT,
+        "master": NBA_OUTPUT / "NBA_final.csv",
+        "state": NBA_STATE,
+        "queue": NBA_QUEUE,
+        "deep_dir": NBA_DEEP_DIR,
+        "tally": NBA_MARKET_TALLY,
+    },
+    "NCAAB": {
+        "output": NCAAB_OUTPUT,
+        "master": NCAAB_OUTPUT / "NCAAB_final.csv",
+        "state": NCAAB_STATE,
+        "queue": NCAAB_QUEUE,
+        "deep_dir": NCAAB_DEEP_DIR,
+        "tally": NCAAB_MARKET_TALLY,
+    },
+}
+
 ERROR_DIR = Path("docs/win/final_scores/errors")
 ERROR_DIR.mkdir(parents=True, exist_ok=True)
 
@@ -63,212 +103,158 @@ def safe_read(path):
         return pd.DataFrame()
 
 
-def clear_old_outputs():
-    for outdir in [NBA_OUTPUT, NCAAB_OUTPUT]:
-        outdir.mkdir(parents=True, exist_ok=True)
-        for f in outdir.glob("*_results_*.csv"):
-            f.unlink(missing_ok=True)
-        for f in outdir.glob("*_final.csv"):
-            f.unlink(missing_ok=True)
+def reread(df):
+    """df as it reads back after being written (dtypes and all)"""
+    return pd.read_csv(io.StringIO(df.to_csv(index=False)))
 
-    for deep_dir in [NBA_DEEP_DIR, NCAAB_DEEP_DIR]:
-        deep_dir.mkdir(parents=True, exist_ok=True)
-        for f in deep_dir.glob("*.csv"):
-            f.unlink(missing_ok=True)
 
-    NBA_MARKET_TALLY.unlink(missing_ok=True)
-    NCAAB_MARKET_TALLY.unlink(missing_ok=True)
-    EDGE_REPORT.unlink(missing_ok=True)
+def write_outputs(outputs):
+    """Write {path: frame, state dict or None (delete)}"""
+    for path, value in outputs.items():
+        path = Path(path)
 
-###############################################################
-######################## OUTCOME LOGIC ########################
-###############################################################
+        if value is None:
+            path.unlink(missing_ok=True)
+            continue
 
-def determine_outcome(row):
-    try:
-        market = str(row.get("market_type", "")).strip().lower()
-        side = str(row.get("bet_side", "")).strip().lower()
-
-        away = float(row["away_score"])
-        home = float(row["home_score"])
-
-        if market == "moneyline":
-            if away == home:
-                return "Push"
-            if side == "home":
-                return "Win" if home > away else "Loss"
-            if side == "away":
-                return "Win" if away > home else "Loss"
-
-        if market == "spread":
-            line = float(row.get("line", 0))
-            if side == "home":
-                diff = (home + line) - away
-            elif side == "away":
-                diff = (away + line) - home
-            else:
-                return "Unknown"
-
-            if abs(diff) < 1e-9:
-                return "Push"
-            return "Win" if diff > 0 else "Loss"
-
-        if market == "total":
-            line = float(row.get("line", 0))
-            total = away + home
-
-            if abs(total - line) < 1e-9:
-                return "Push"
-
-            if side == "over":
-                return "Win" if total > line else "Loss"
-            if side == "under":
-                return "Win" if total < line else "Loss"
-
-    except Exception:
-        pass
-
-    return "Unknown"
+        path.parent.mkdir(parents=True, exist_ok=True)
+
+        if isinstance(value, dict):
+            save_state(value, path)
+        else:
+            value.to_csv(path, index=False)
 
 ###############################################################
 ######################## GRADING ##############################
 ###############################################################
 
-def grade_league(league):
+def date_inputs(league):
+    """{date: [selection file, score file]} for every date with final scores"""
     if league == "NBA":
         score_dir = NBA_SCORE_DIR
-        output_dir = NBA_OUTPUT
         pattern = "*_nba.csv"
         suffix = "NBA"
     else:
         score_dir = NCAAB_SCORE_DIR
-        output_dir = NCAAB_OUTPUT
         pattern = "*_ncaab.csv"
         suffix = "NCAAB"
 
-    output_dir.mkdir(parents=True, exist_ok=True)
-
-    bet_files = glob.glob(str(SELECT_DIR / pattern))
-    dates = set()
+    inputs = {}
 
-    for f in bet_files:
+    for f in sorted(glob.glob(str(SELECT_DIR / pattern))):
         m = re.search(r"(\d{4}_\d{2}_\d{2})", f)
-        if m:
-            dates.add(m.group(1))
+        if not m:
+            continue
 
-    for date in sorted(dates):
+        date = m.group(1)
         score_file = score_dir / f"{date}_final_scores_{suffix}.csv"
         if not score_file.exists():
             log(f"{league} SCORE FILE MISSING {score_file}")
             continue
 
-        if league == "NBA":
-            bet_paths = glob.glob(str(SELECT_DIR / f"{date}_nba.csv"))
-        else:
-            bet_paths = glob.glob(str(SELECT_DIR / f"{date}_ncaab.csv"))
+        inputs.setdefault(date, []).extend([f, str(score_file)])
 
-        dfs = [safe_read(x) for x in bet_paths]
-        dfs = [d for d in dfs if not d.empty]
+    return inputs
 
-        if not dfs:
-            log(f"{league} NO BET FILES {date}")
-            continue
 
-        bets = pd.concat(dfs, ignore_index=True)
-        scores = safe_read(score_file)
+def grade_frames(league, date, bet_frames, scores):
+    """(graded, unmatched bets) of one date (None if it cannot be graded yet)"""
+    dfs = [d for d in bet_frames if not d.empty]
 
-        if scores.empty:
-            log(f"{league} SCORE FILE EMPTY {date}")
-            continue
+    if not dfs:
+        log(f"{league} NO BET FILES {date}")
+        return None
 
-        try:
-            df = pd.merge(
-                bets,
-                scores,
-                on=["away_team", "home_team", "game_date"],
-                validate="many_to_one"
-            )
-        except Exception as e:
-            log(f"{league} MERGE ERROR {date} | {e}")
-            continue
+    bets = pd.concat(dfs, ignore_index=True)
 
-        df["bet_result"] = df.apply(determine_outcome, axis=1)
+    if scores.empty:
+        log(f"{league} SCORE FILE EMPTY {date}")
+        return None
 
-        outfile = output_dir / f"{date}_results_{suffix}.csv"
-        df.to_csv(outfile, index=False)
+    try:
+        df, unmatched = join_scores(bets, scores)
+    except Exception as e:
+        log(f"{league} JOIN ERROR {date} | {e}")
+        return None
 
-        log(f"{league} GRADED {date} ROWS={len(df)}")
+    if not unmatched.empty:
+        log(f"{league} UNMATCHED {date} ROWS={len(unmatched)} -> reconciliation queue")
 
+    df["bet_result"] = grade_frame(df)
+    return df, unmatched
 
-def build_master(league):
-    if league == "NBA":
-        outdir = NBA_OUTPUT
-        suffix = "NBA"
-    else:
-        outdir = NCAAB_OUTPUT
-        suffix = "NCAAB"
 
-    files = sorted(glob.glob(str(outdir / f"*_results_{suffix}.csv")))
-    dfs = [safe_read(f) for f in files]
-    dfs = [d for d in dfs if not d.empty]
+def grade_outputs(league, read=safe_read):
+    """
+    Grade the dates with new or changed inputs and upsert them into the
+    master; (outputs, graded). outputs maps every file to write to its frame
+    or state dict ({} when no date was graded), graded holds the daily
+    results and the master as they read back. read loads an input file.
+    """
+    paths = LEAGUE_PATHS[league]
+    output_dir = paths["output"]
+    master_path = paths["master"]
 
-    if not dfs:
-        log(f"{league} NO GRADED FILES FOR MASTER")
-        return
+    state = load_state(paths["state"]) if master_path.exists() else {"dates": {}}
 
-    df = pd.concat(dfs, ignore_index=True)
+    inputs = date_inputs(league)
+    outputs = {}
+    graded = {}
+    dates = []
+    unmatched = []
 
-    sort_cols = [c for c in ["game_date", "away_team", "home_team", "market_type", "bet_side"] if c in df.columns]
-    if sort_cols:
-        df = df.sort_values(sort_cols, kind="mergesort")
+    for date, digest in pending_dates(inputs, state).items():
+        bet_paths, score_file = inputs[date][:-1], inputs[date][-1]
 
-    master = outdir / f"{suffix}_final.csv"
-    df.to_csv(master, index=False)
+        out = grade_frames(league, date, [read(p) for p in bet_paths], read(score_file))
+        if out is None:
+            continue
 
-    log(f"{league} MASTER BUILT ROWS={len(df)}")
+        df, missed = out
+        unmatched.append(missed)
 
-###############################################################
-######################## SUMMARY CORE #########################
-###############################################################
+        outfile = output_dir / f"{date}_results_{league}.csv"
+        outputs[outfile] = df
+        graded[outfile] = reread(df)
 
-def summarize(df):
-    if df is None or df.empty or "bet_result" not in df.columns:
-        return 0, 0, 0, 0, 0.0
+        state["dates"][date] = digest
+        dates.append(date)
 
-    wins = int((df["bet_result"] == "Win").sum())
-    losses = int((df["bet_result"] == "Loss").sum())
-    pushes = int((df["bet_result"] == "Push").sum())
-    total = wins + losses + pushes
-    win_pct = (wins / (wins + losses)) if (wins + losses) > 0 else 0.0
+        log(f"{league} GRADED {date} ROWS={len(df)}")
 
-    return wins, losses, pushes, total, round(win_pct, 4)
+    if not dates:
+        log(f"{league} NO NEW SCORE DATES")
+        return {}, {}
 
+    queue = queue_rows(read_queue(paths["queue"]), pd.concat(unmatched, ignore_index=True), dates)
+    outputs[paths["queue"]] = queue
+    log(f"{league} RECONCILIATION QUEUE OPEN={len(queue)} -> {paths['queue']}")
 
-def aggregate_results(df, group_cols):
-    if df is None or df.empty:
-        return pd.DataFrame()
+    master = safe_read(master_path) if master_path.exists() else pd.DataFrame()
 
-    rows = []
+    dfs = [graded[output_dir / f"{date}_results_{league}.csv"] for date in dates]
+    dfs = [d for d in dfs if not d.empty]
 
-    grouped = df.groupby(group_cols, dropna=False)
-    for keys, sub in grouped:
-        wins, losses, pushes, total, win_pct = summarize(sub)
+    if dfs:
+        master, replaced = upsert(master, pd.concat(dfs, ignore_index=True), dates)
 
-        if not isinstance(keys, tuple):
-            keys = (keys,)
+        outputs[master_path] = master
+        graded[master_path] = reread(master)
 
-        row = {}
-        for i, col in enumerate(group_cols):
-            row[col] = keys[i]
+        log(f"{league} MASTER UPSERTED ROWS={len(master)} DATES={len(dates)} REPLACED={len(replaced)}")
+    else:
+        log(f"{league} NO GRADED FILES FOR MASTER")
 
-        row["Win"] = wins
-        row["Loss"] = losses
-        row["Push"] = pushes
-        row["Total"] = total
-        row["Win_Pct"] = win_pct
-        rows.append(row)
+    outputs[paths["state"]] = state
 
-    return pd.DataFrame(rows)
+    return outputs, graded
+
+###############################################################
+######################## SUMMARY CORE #########################
+###############################################################
+
+def aggregate_results(df, group_cols):
+    return summarize_groups(df, group_cols)
 
 ###############################################################
 ######################## DERIVED FIELDS #######################
@@ -475,142 +461,187 @@ def prepare_work_df(df, league):
 ######################## WRITE DIAGNOSTICS ####################
 ###############################################################
 
-def write_csv(df, path):
-    path.parent.mkdir(parents=True, exist_ok=True)
-    df.to_csv(path, index=False)
-    log(f"WROTE {path}")
-
+def build_moneyline_outputs(work):
+    outputs = {}
 
-def build_moneyline_outputs(work, league, outdir):
     ml = work[work["market_type"] == "moneyline"].copy()
     if ml.empty:
-        return
+        return outputs
 
     df1 = aggregate_results(
         ml[(ml["side_group"].isin(["HOME", "AWAY"])) & (ml["edge_bucket"] != "")],
         ["market", "side_group", "edge_bucket"]
     )
-    write_csv(df1, outdir / "moneyline_edge_bucket_home_away_summary.csv")
+    outputs["moneyline_edge_bucket_home_away_summary.csv"] = df1
 
     df2 = aggregate_results(
         ml[ml["edge_bucket"] != ""],
         ["market", "edge_bucket"]
     )
-    write_csv(df2, outdir / "moneyline_edge_bucket_summary.csv")
+    outputs["moneyline_edge_bucket_summary.csv"] = df2
 
     df3 = aggregate_results(
         ml[(ml["side_group"].isin(["HOME", "AWAY"])) & (ml["odds_bucket"] != "")],
         ["market", "side_group", "odds_bucket"]
     )
-    write_csv(df3, outdir / "moneyline_odds_bucket_home_away_summary.csv")
+    outputs["moneyline_odds_bucket_home_away_summary.csv"] = df3
 
     df4 = aggregate_results(
         ml[ml["odds_bucket"] != ""],
         ["market", "odds_bucket"]
     )
-    write_csv(df4, outdir / "moneyline_odds_bucket_summary.csv")
+    outputs["moneyline_odds_bucket_summary.csv"] = df4
 
     df5 = aggregate_results(
         ml[(ml["side_group"].isin(["HOME", "AWAY"])) & (ml["odds_bucket"] != "") & (ml["edge_bucket"] != "")],
         ["market", "market_type", "side_group", "odds_bucket", "edge_bucket"]
     )
-    write_csv(df5, outdir / "moneyline_summary.csv")
+    outputs["moneyline_summary.csv"] = df5
 
+    return outputs
+
+
+def build_spread_outputs(work):
+    outputs = {}
 
-def build_spread_outputs(work, league, outdir):
     sp = work[work["market_type"] == "spread"].copy()
     if sp.empty:
-        return
+        return outputs
 
     df1 = aggregate_results(
         sp[(sp["side_group"].isin(["HOME", "AWAY"])) & (sp["edge_bucket"] != "")],
         ["market", "side_group", "edge_bucket"]
     )
-    write_csv(df1, outdir / "spread_edge_bucket_home_away_summary.csv")
+    outputs["spread_edge_bucket_home_away_summary.csv"] = df1
 
     df2 = aggregate_results(
         sp[sp["edge_bucket"] != ""],
         ["market", "edge_bucket"]
     )
-    write_csv(df2, outdir / "spread_edge_bucket_summary.csv")
+    outputs["spread_edge_bucket_summary.csv"] = df2
 
     df3 = aggregate_results(
         sp[(sp["side_group"].isin(["HOME", "AWAY"])) & (sp["spread_bucket"] != "")],
         ["market", "side_group", "spread_bucket"]
     )
-    write_csv(df3, outdir / "spread_bands_bucket_home_away_summary.csv")
+    outputs["spread_bands_bucket_home_away_summary.csv"] = df3
 
     df4 = aggregate_results(
         sp[sp["spread_bucket"] != ""],
         ["market", "spread_bucket"]
     )
-    write_csv(df4, outdir / "spread_bands_bucket_summary.csv")
+    outputs["spread_bands_bucket_summary.csv"] = df4
 
     df5 = aggregate_results(
         sp[(sp["side_group"].isin(["HOME", "AWAY"])) & (sp["spread_bucket"] != "") & (sp["edge_bucket"] != "")],
         ["market", "market_type", "side_group", "spread_bucket", "edge_bucket"]
     )
-    write_csv(df5, outdir / "spread_summary.csv")
+    outputs["spread_summary.csv"] = df5
+
+    return outputs
 
 
-def build_total_outputs(work, league, outdir):
+def build_total_outputs(work):
+    outputs = {}
+
     tot = work[work["market_type"] == "total"].copy()
     if tot.empty:
-        return
+        return outputs
 
     df1 = aggregate_results(
         tot[(tot["side_group"].isin(["OVER", "UNDER"])) & (tot["edge_bucket"] != "")],
         ["market", "side_group", "edge_bucket"]
     )
-    write_csv(df1, outdir / "total_edge_bucket_home_away_summary.csv")
+    outputs["total_edge_bucket_home_away_summary.csv"] = df1
 
     df2 = aggregate_results(
         tot[tot["edge_bucket"] != ""],
         ["market", "edge_bucket"]
     )
-    write_csv(df2, outdir / "total_edge_bucket_summary.csv")
+    outputs["total_edge_bucket_summary.csv"] = df2
 
     df3 = aggregate_results(
         tot[(tot["side_group"].isin(["OVER", "UNDER"])) & (tot["total_bucket"] != "")],
         ["market", "side_group", "total_bucket"]
     )
-    write_csv(df3, outdir / "total_bands_bucket_home_away_summary.csv")
+    outputs["total_bands_bucket_home_away_summary.csv"] = df3
 
     df4 = aggregate_results(
         tot[tot["total_bucket"] != ""],
         ["market", "total_bucket"]
     )
-    write_csv(df4, outdir / "total_bands_bucket_summary.csv")
+    outputs["total_bands_bucket_summary.csv"] = df4
 
     df5 = aggregate_results(
         tot[(tot["side_group"].isin(["OVER", "UNDER"])) & (tot["total_bucket"] != "") & (tot["edge_bucket"] != "")],
         ["market", "market_type", "side_group", "total_bucket", "edge_bucket"]
     )
-    write_csv(df5, outdir / "total_summary.csv")
+    outputs["total_summary.csv"] = df5
 
+    return outputs
 
-def build_market_tally(df, league):
-    out_rows = []
 
-    for market_type in ["moneyline", "spread", "total"]:
-        sub = df[df["market_type"] == market_type]
-        w, l, p, t, pct = summarize(sub)
-        out_rows.append({
-            "market": league,
-            "market_type": market_type,
-            "Win": w,
-            "Loss": l,
-            "Push": p,
-            "Total": t,
-            "Win_Pct": pct
-        })
+def deep_outputs(work):
+    """{file name: summary} of the per-market diagnostics"""
+    return {**build_moneyline_outputs(work), **build_spread_outputs(work), **build_total_outputs(work)}
 
-    out = pd.DataFrame(out_rows)
 
-    if league == "NBA":
-        write_csv(out, NBA_MARKET_TALLY)
-    else:
-        write_csv(out, NCAAB_MARKET_TALLY)
+def tally_outputs(league, master):
+    """
+    Market tally and deeper summaries of one league's master, as outputs
+    (stale summary files map to None); {} when there is nothing to count.
+    """
+    paths = LEAGUE_PATHS[league]
+
+    if master is None or master.empty:
+        log(f"{league} MASTER EMPTY AFTER BUILD")
+        return {}
+
+    work = prepare_work_df(master, league)
+    if work.empty:
+        log(f"{league} WORK DF EMPTY")
+        return {}
+
+    outputs = {paths["tally"]: market_tally(league, work)}
+
+    deep = {paths["deep_dir"] / name: out_df for name, out_df in deep_outputs(work).items()}
+    for stale in paths["deep_dir"].glob("*.csv"):
+        deep.setdefault(stale, None)
+    outputs.update(deep)
+
+    return outputs
+
+
+def tally_counts(df):
+    """Win / Loss / Push counts per tally market"""
+    counts = pd.DataFrame(0, index=TALLY_MARKETS, columns=["Win", "Loss", "Push"])
+
+    if df is None or df.empty or "bet_result" not in df.columns:
+        return counts
+
+    market_type = df["market_type"].astype(str).str.strip().str.lower()
+    result = df["bet_result"].astype(str).str.strip().str.title()
+
+    found = pd.crosstab(market_type, result).reindex(index=TALLY_MARKETS, columns=counts.columns, fill_value=0)
+
+    return counts + found
+
+
+def market_tally(league, work):
+    """
+    Win / Loss / Push per market over the whole master, so rows edited in
+    place (regrade_results.py) are counted as they are now.
+    """
+    counts = tally_counts(work)
+
+    out = counts.rename_axis("market_type").reset_index()
+    out.insert(0, "market", league)
+
+    decided = out["Win"] + out["Loss"]
+    out["Total"] = decided + out["Push"]
+    out["Win_Pct"] = (out["Win"] / decided.where(decided > 0)).fillna(0.0).round(4)
+
+    return out
 
 ###############################################################
 ######################## EDGE REPORT ##########################
@@ -623,26 +654,38 @@ def build_edge_report():
         ("NBA", NBA_OUTPUT / "NBA_final.csv"),
         ("NCAAB", NCAAB_OUTPUT / "NCAAB_final.csv"),
     ]:
-        df = safe_read(path)
-        if df.empty:
-            continue
+        rows.extend(edge_report_rows(league, safe_read(path)))
 
-        work = prepare_work_df(df, league)
-        if work.empty:
-            continue
+    write_edge_report(rows)
 
-        win_edges = work.loc[work["bet_result"] == "Win", "selected_edge"].dropna().tolist()
-        loss_edges = work.loc[work["bet_result"] == "Loss", "selected_edge"].dropna().tolist()
 
-        win_avg = sum(win_edges) / len(win_edges) if win_edges else 0
-        loss_avg = sum(loss_edges) / len(loss_edges) if loss_edges else 0
+def edge_report_rows(league, df):
+    """Report lines of one league's master"""
+    rows = []
 
-        rows.append("")
-        rows.append(league)
-        rows.append(f"Win edge avg: {win_avg:.4f}")
-        rows.append(f"Loss edge avg: {loss_avg:.4f}")
-        rows.append(f"Signal: {'CORRECT' if win_avg > loss_avg else 'INVERTED'}")
+    if df.empty:
+        return rows
 
+    work = prepare_work_df(df, league)
+    if work.empty:
+        return rows
+
+    win_edges = work.loc[work["bet_result"] == "Win", "selected_edge"].dropna().tolist()
+    loss_edges = work.loc[work["bet_result"] == "Loss", "selected_edge"].dropna().tolist()
+
+    win_avg = sum(win_edges) / len(win_edges) if win_edges else 0
+    loss_avg = sum(loss_edges) / len(loss_edges) if loss_edges else 0
+
+    rows.append("")
+    rows.append(league)
+    rows.append(f"Win edge avg: {win_avg:.4f}")
+    rows.append(f"Loss edge avg: {loss_avg:.4f}")
+    rows.append(f"Signal: {'CORRECT' if win_avg > loss_avg else 'INVERTED'}")
+
+    return rows
+
+
+def write_edge_report(rows):
     with open(EDGE_REPORT, "w", encoding="utf-8") as f:
         for r in rows:
             f.write(r + "\n")
@@ -655,35 +698,23 @@ def build_edge_report():
 
 def main():
     open(LOG_FILE, "w", encoding="utf-8").close()
-    clear_old_outputs()
-
-    for league in ["NBA", "NCAAB"]:
-        grade_league(league)
-        build_master(league)
 
-        if league == "NBA":
-            path = NBA_OUTPUT / "NBA_final.csv"
-            outdir = NBA_DEEP_DIR
-        else:
-            path = NCAAB_OUTPUT / "NCAAB_final.csv"
-            outdir = NCAAB_DEEP_DIR
+    changed = False
 
-        df = safe_read(path)
-        if df.empty:
-            log(f"{league} MASTER EMPTY AFTER BUILD")
+    for league in LEAGUE_PATHS:
+        outputs, graded = grade_outputs(league)
+        if not outputs:
             continue
 
-        work = prepare_work_df(df, league)
-        if work.empty:
-            log(f"{league} WORK DF EMPTY")
-            continue
+        outputs.update(tally_outputs(league, graded.get(LEAGUE_PATHS[league]["master"])))
+
+        write_outputs(outputs)
+        log(f"{league} WROTE {len(outputs)} files")
+        changed = True
 
-        build_market_tally(work, league)
-        build_moneyline_outputs(work, league, outdir)
-        build_spread_outputs(work, league, outdir)
-        build_total_outputs(work, league, outdir)
+    if changed:
+        build_edge_report()
 
-    build_edge_report()
     print("Basketball results pipeline complete.")
 
 
@@ -0,0 +1,156 @@
+#!/usr/bin/env python3
+# docs/win/final_scores/scripts/05_results/calibration_report.py
+#
+# Calibration of the model probabilities behind the graded bets: hit rate,
+# Brier score and log loss per league and market, and reliability curves by
+# predicted probability and by edge bucket (see common/calibration.py).
+#
+# The per-date sums are kept in calibration_grain.csv with a hash of every
+# date's graded rows next to them, so each run only re-bins the dates that are
+# new or were re-graded. Deleting the grain file, or changing how a league's
+# probability is recovered (EDGE_KIND), rebuilds everything.
+
+import json
+import sys
+from datetime import datetime
+from pathlib import Path
+
+import pandas as pd
+
+# --- DYNAMIC PATH SETUP ---
+COMMON_DIR = str(Path(__file__).resolve().parents[5] / "scripts")
+if COMMON_DIR not in sys.path:
+    sys.path.append(COMMON_DIR)
+
+from common.calibration import EDGE_KIND, GRAIN_KEYS, SUM_COLUMNS, calibration_grain, calibration_summary, date_hashes, reliability_curves
+from common.results_enrichment import enrich_picks
+
+
+# =========================
+# PATHS
+# =========================
+
+INPUTS = {
+    "NBA": Path("docs/win/final_scores/results/nba/graded/NBA_final.csv"),
+    "NCAAB": Path("docs/win/final_scores/results/ncaab/graded/NCAAB_final.csv"),
+    "NHL": Path("docs/win/final_scores/results/nhl/graded/NHL_final.csv"),
+    "SOCCER": Path("docs/win/final_scores/results/soccer/graded/SOCCER_final.csv"),
+}
+
+CALIBRATION_DIR = Path("docs/win/final_scores/results/calibration")
+
+GRAIN_FILE = CALIBRATION_DIR / "calibration_grain.csv"
+STATE_FILE = CALIBRATION_DIR / "calibration_state.json"
+SUMMARY_FILE = CALIBRATION_DIR / "calibration_summary.csv"
+CURVES_FILE = CALIBRATION_DIR / "reliability_curves.csv"
+
+ERROR_LOG = Path("docs/win/final_scores/errors/calibration_report_log.txt")
+
+
+# =========================
+# LOGGING
+# =========================
+
+def log(msg: str) -> None:
+    ERROR_LOG.parent.mkdir(parents=True, exist_ok=True)
+    ts = datetime.now().strftime("%Y-%m-%d %H:%M:%S")
+    with open(ERROR_LOG, "a", encoding="utf-8") as f:
+        f.write(f"[{ts}] {msg}\n")
+
+
+# =========================
+# FILE IO
+# =========================
+
+def safe_read(path: Path) -> pd.DataFrame:
+    try:
+        if not path.exists():
+            log(f"Missing input file: {path}")
+            return pd.DataFrame()
+
+        return pd.read_csv(path)
+
+    except Exception as e:
+        log(f"ERROR reading {path}: {e}")
+        return pd.DataFrame()
+
+
+def load_grain() -> tuple[pd.DataFrame, dict]:
+    """(grain, state); both empty when either file is missing or was binned with another EDGE_KIND"""
+    empty = pd.DataFrame(columns=GRAIN_KEYS + SUM_COLUMNS), {"edge_kind": EDGE_KIND}
+
+    if not GRAIN_FILE.exists() or not STATE_FILE.exists():
+        return empty
+
+    with open(STATE_FILE, "r", encoding="utf-8") as f:
+        state = json.load(f)
+
+    if state.get("edge_kind") != EDGE_KIND:
+        log("EDGE_KIND changed, rebuilding every date")
+        return empty
+
+    grain = pd.read_csv(GRAIN_FILE, dtype={"game_date": str, "bin": str}, keep_default_na=False)
+
+    return grain, state
+
+
+# =========================
+# UPDATE
+# =========================
+
+def update_league(grain: pd.DataFrame, state: dict, league: str, df: pd.DataFrame) -> pd.DataFrame:
+    """grain with the new / re-graded / dropped dates of one league redone"""
+    hashes = date_hashes(df)
+    seen = state.get(league, {})
+
+    stale = {d for d in set(seen) | set(hashes) if seen.get(d) != hashes.get(d)}
+
+    if not stale:
+        log(f"{league}: no new graded dates")
+        return grain
+
+    keep = ~((grain["league"] == league) & grain["game_date"].isin(stale))
+    grain = grain.loc[keep]
+
+    redo = df.loc[df["game_date"].astype(str).isin(stale)] if hashes else pd.DataFrame()
+
+    if not redo.empty and {"market_type", "bet_result"}.issubset(redo.columns):
+        work = enrich_picks(redo, league)
+        grain = pd.concat([grain, calibration_grain(work, league)], ignore_index=True)
+
+    state[league] = hashes
+    log(f"{league}: re-binned {len(stale)} dates")
+
+    return grain
+
+
+def main() -> None:
+    ERROR_LOG.parent.mkdir(parents=True, exist_ok=True)
+
+    with open(ERROR_LOG, "w", encoding="utf-8") as f:
+        f.write("=== calibration_report.py log ===\n")
+
+    grain, state = load_grain()
+
+    for league, in_path in INPUTS.items():
+        grain = update_league(grain, state, league, safe_read(in_path))
+
+    grain = grain.sort_values(GRAIN_KEYS, kind="mergesort").reset_index(drop=True)
+
+    CALIBRATION_DIR.mkdir(parents=True, exist_ok=True)
+
+    grain.to_csv(GRAIN_FILE, index=False)
+
+    with open(STATE_FILE, "w", encoding="utf-8") as f:
+        json.dump(state, f, indent=2, sort_keys=True)
+
+    calibration_summary(grain).to_csv(SUMMARY_FILE, index=False)
+    reliability_curves(grain).to_csv(CURVES_FILE, index=False)
+
+    log(f"wrote {SUMMARY_FILE} and {CURVES_FILE}")
+
+    print("calibration_report.py complete.")
+
+
+if __name__ == "__main__":
+    main()
@@ -61,11 +61,33 @@ SPORTS = [
 ]
 
 
+# =========================
+# INPUTS
+# =========================
+
+def sport_frames(sport_name, suffix):
+    """(file, frame) of every graded daily file of a sport (the error if unreadable)"""
+    results_dir = f"docs/win/final_scores/results/{sport_name}/graded"
+
+    frames = []
+
+    for file in glob.glob(os.path.join(results_dir, f"*_results_{suffix}.csv")):
+        try:
+            frames.append((file, pd.read_csv(file)))
+        except Exception as e:
+            frames.append((file, e))
+
+    return frames
+
+
 # =========================
 # MAIN REPORT
 # =========================
 
-def generate_reports():
+def generate_reports(frames=None):
+    """Write the edge report; frames {sport name: sport_frames} replaces reading those sports"""
+
+    frames = frames or {}
 
     skipped_rows = []
 
@@ -86,9 +108,9 @@ def generate_reports():
         sport_name = sport["name"]
         suffix = sport["suffix"]
 
-        results_dir = f"docs/win/final_scores/results/{sport_name}/graded"
-
-        files = glob.glob(os.path.join(results_dir, f"*_results_{suffix}.csv"))
+        files = frames.get(sport_name)
+        if files is None:
+            files = sport_frames(sport_name, suffix)
 
         if not files:
             continue
@@ -99,14 +121,12 @@ def generate_reports():
         win_edges = []
         loss_edges = []
 
-        for file in files:
+        for file, df in files:
 
-            try:
-                df = pd.read_csv(file)
-            except Exception as e:
+            if isinstance(df, Exception):
 
                 skipped_rows.append(
-                    (file, "FILE_READ_ERROR", str(e))
+                    (file, "FILE_READ_ERROR", str(df))
                 )
                 continue
 
@@ -1,11 +1,24 @@
 #!/usr/bin/env python3
 # docs/win/final_scores/scripts/05_results/name_normalization.py
+#
+# Team names are normalized at intake (00_parsing/name_normalization.py and
+# the score parsers use the shared alias index), so this pass only checks the
+# selection and score files: aliases that slipped through and names missing
+# from the maps are reported, nothing is rewritten.
 
+import sys
 import pandas as pd
 import glob
 from pathlib import Path
 from datetime import datetime
 
+# --- DYNAMIC PATH SETUP ---
+COMMON_DIR = str(Path(__file__).resolve().parents[5] / "scripts")
+if COMMON_DIR not in sys.path:
+    sys.path.append(COMMON_DIR)
+
+from common.alias_index import load_alias_index, market_aliases, name_status
+
 ERROR_DIR = Path("docs/win/final_scores/errors")
 ERROR_DIR.mkdir(parents=True, exist_ok=True)
 
@@ -21,37 +34,10 @@ TARGET_DIRS = [
     "docs/win/final_scores/results/soccer/final_scores",
 ]
 
-MAP_FILES = {
-    "NBA": "mappings/basketball/team_map_nba.csv",
-    "NCAAB": "mappings/basketball/team_map_ncaab.csv",
-    "NHL": "mappings/hockey/team_map_hockey.csv",
-    "SOCCER": "mappings/soccer/team_map_soccer.csv",
-}
-
 NO_MAP_FILE = Path("mappings/05_no_map/no_team_map.csv")
 NO_MAP_FILE.parent.mkdir(parents=True, exist_ok=True)
 
 
-def load_maps():
-    maps = {}
-
-    for market, path in MAP_FILES.items():
-
-        p = Path(path)
-
-        if not p.exists():
-            continue
-
-        df = pd.read_csv(path)
-
-        df["alias"] = df["alias"].astype(str).str.strip().str.lower()
-        df["canonical_team"] = df["canonical_team"].astype(str).str.strip()
-
-        maps[market] = dict(zip(df["alias"], df["canonical_team"]))
-
-    return maps
-
-
 def detect_market(file_path):
 
     name = Path(file_path).name.lower()
@@ -68,55 +54,56 @@ def detect_market(file_path):
     return None
 
 
-def normalize_file(file_path, market, team_map, missing, counters):
+def check_frame(df, market, aliases, missing, mismatched):
+    """
+    Record team names that are not canonical: known aliases go to
+    mismatched (market, name, canonical), unknown names to missing.
+    """
 
-    try:
+    if "away_team" not in df.columns or "home_team" not in df.columns:
+        return
 
-        df = pd.read_csv(file_path)
+    for col in ["away_team", "home_team"]:
 
-        if "away_team" not in df.columns or "home_team" not in df.columns:
-            return
+        names = df[col]
+        status = name_status(names, aliases)
 
-        updated = False
+        for team in names[status == "alias"].unique():
+            mismatched.add((market, str(team).strip(), aliases[str(team).strip().lower()]))
 
-        for col in ["away_team", "home_team"]:
+        for team in names[status == "unmapped"].unique():
+            missing.add((market, str(team).strip().lower()))
 
-            normalized = []
 
-            for team in df[col]:
+def check_file(file_path, market, aliases, missing, mismatched):
 
-                if pd.isna(team):
-                    normalized.append(team)
-                    continue
+    try:
 
-                alias = str(team).strip().lower()
+        check_frame(pd.read_csv(file_path), market, aliases, missing, mismatched)
 
-                if team_map and alias in team_map:
+    except Exception as e:
 
-                    canonical = team_map[alias]
+        missing.add((market, f"FILE_ERROR::{file_path}::{str(e)}"))
 
-                    if canonical != team:
-                        counters["normalized"] += 1
-                        updated = True
 
-                    normalized.append(canonical)
+def target_files():
+    """(file, market) for every file the pass covers"""
 
-                else:
+    out = []
 
-                    normalized.append(team)
-                    missing.add((market, alias))
+    for directory in TARGET_DIRS:
 
-            df[col] = normalized
+        for file_path in glob.glob(f"{directory}/*.csv"):
 
-        if updated:
-            df.to_csv(file_path, index=False)
+            market = detect_market(file_path)
 
-    except Exception as e:
+            if market:
+                out.append((file_path, market))
 
-        missing.add((market, f"FILE_ERROR::{file_path}::{str(e)}"))
+    return out
 
 
-def write_summary(files_scanned, normalized_count, missing):
+def write_summary(files_scanned, mismatched, missing):
 
     ts = datetime.now().strftime("%Y-%m-%d %H:%M:%S")
 
@@ -126,7 +113,16 @@ def write_summary(files_scanned, normalized_count, missing):
         f.write(f"Timestamp: {ts}\n\n")
 
         f.write(f"Files scanned: {files_scanned}\n")
-        f.write(f"Names normalized: {normalized_count}\n\n")
+        f.write(f"Names not canonical: {len(mismatched)}\n\n")
+
+        if mismatched:
+
+            f.write("Aliases not normalized at intake:\n")
+
+            for market, team, canonical in sorted(mismatched):
+                f.write(f"  {market} | '{team}' -> '{canonical}'\n")
+
+            f.write("\n")
 
         if missing:
 
@@ -153,49 +149,42 @@ def write_summary(files_scanned, normalized_count, missing):
             f.write("No unmapped team names detected.\n")
 
 
-def main():
+def write_missing(missing):
 
-    team_maps = load_maps()
+    if not missing:
+        return
 
-    missing = set()
-
-    counters = {"normalized": 0}
-
-    files_scanned = 0
-
-    for directory in TARGET_DIRS:
+    df_missing = pd.DataFrame(
+        sorted(list(missing)),
+        columns=["market", "alias"]
+    )
 
-        files = glob.glob(f"{directory}/*.csv")
+    if NO_MAP_FILE.exists():
 
-        for file_path in files:
+        existing = pd.read_csv(NO_MAP_FILE)
 
-            market = detect_market(file_path)
+        df_missing = pd.concat([existing, df_missing]).drop_duplicates()
 
-            if not market:
-                continue
+    df_missing.to_csv(NO_MAP_FILE, index=False)
 
-            files_scanned += 1
 
-            team_map = team_maps.get(market)
+def main():
 
-            normalize_file(file_path, market, team_map, missing, counters)
+    index = load_alias_index()
 
-    if missing:
+    missing = set()
 
-        df_missing = pd.DataFrame(
-            sorted(list(missing)),
-            columns=["market", "alias"]
-        )
+    mismatched = set()
 
-        if NO_MAP_FILE.exists():
+    files = target_files()
 
-            existing = pd.read_csv(NO_MAP_FILE)
+    for file_path, market in files:
 
-            df_missing = pd.concat([existing, df_missing]).drop_duplicates()
+        check_file(file_path, market, market_aliases(index, market), missing, mismatched)
 
-        df_missing.to_csv(NO_MAP_FILE, index=False)
+    write_missing(missing)
 
-    write_summary(files_scanned, counters["normalized"], missing)
+    write_summary(len(files), mismatched, missing)
 
 
 if __name__ == "__main__":
@@ -0,0 +1,130 @@
+#!/usr/bin/env python3
+# docs/win/final_scores/scripts/05_results/regrade_results.py
+#
+# Re-grades the whole graded history of every league in place with the shared
+# grading kernel, so daily files and the *_final.csv masters all carry the
+# same bet_result rules (NHL and soccer files come from outside the basketball
+# grader and used to leave soccer totals Unknown).
+
+import sys
+from datetime import datetime
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+
+# --- DYNAMIC PATH SETUP ---
+COMMON_DIR = str(Path(__file__).resolve().parents[5] / "scripts")
+if COMMON_DIR not in sys.path:
+    sys.path.append(COMMON_DIR)
+
+from common.grading import grade_frame
+
+
+# =========================
+# PATHS
+# =========================
+
+GRADED_DIRS = {
+    "NBA": Path("docs/win/final_scores/results/nba/graded"),
+    "NCAAB": Path("docs/win/final_scores/results/ncaab/graded"),
+    "NHL": Path("docs/win/final_scores/results/nhl/graded"),
+    "SOCCER": Path("docs/win/final_scores/results/soccer/graded"),
+}
+
+ERROR_LOG = Path("docs/win/final_scores/errors/regrade_results_log.txt")
+
+
+# =========================
+# LOGGING
+# =========================
+
+def log(msg: str) -> None:
+    ERROR_LOG.parent.mkdir(parents=True, exist_ok=True)
+    ts = datetime.now().strftime("%Y-%m-%d %H:%M:%S")
+    with open(ERROR_LOG, "a", encoding="utf-8") as f:
+        f.write(f"[{ts}] {msg}\n")
+
+
+# =========================
+# REGRADE
+# =========================
+
+def graded_files(league: str) -> list[Path]:
+    """Daily results files plus the league master"""
+    graded_dir = GRADED_DIRS[league]
+    return sorted(graded_dir.glob(f"*_results_{league}.csv")) + sorted(graded_dir.glob(f"{league}_final.csv"))
+
+
+def row_keys(df: pd.DataFrame) -> np.ndarray:
+    """game_id per row, or date away@home where a file has no game_id"""
+    if "game_id" in df.columns:
+        return df["game_id"].astype(str).to_numpy()
+
+    if not {"game_date", "away_team", "home_team"}.issubset(df.columns):
+        return df.index.astype(str).to_numpy()
+
+    return (df["game_date"].astype(str) + " " + df["away_team"].astype(str) + "@" + df["home_team"].astype(str)).to_numpy()
+
+
+def regrade_frame(df: pd.DataFrame, path: Path) -> int:
+    """Set bet_result of one graded frame in place; number of changed rows"""
+    if df.empty or not {"market_type", "home_score", "away_score"}.issubset(df.columns):
+        log(f"SKIP {path}: nothing to grade")
+        return 0
+
+    new = grade_frame(df)
+    old = df["bet_result"].astype(str).to_numpy() if "bet_result" in df.columns else np.full(len(df), "")
+
+    diff = new != old
+    changed = int(diff.sum())
+
+    if changed:
+        side_col = next((c for c in ("take_bet", "bet_side") if c in df.columns), None)
+
+        games = row_keys(df)[diff]
+        markets = df["market_type"].astype(str).to_numpy()[diff]
+        sides = df[side_col].astype(str).to_numpy()[diff] if side_col else np.full(changed, "")
+
+        for game, market, side, before, after in zip(games, markets, sides, old[diff], new[diff]):
+            log(f"REGRADED {path} {game} {market} {side}: {before} -> {after}")
+
+        df["bet_result"] = new
+
+    return changed
+
+
+def regrade_file(path: Path) -> int:
+    """Rewrite bet_result of one graded file; number of changed rows"""
+    df = pd.read_csv(path)
+    changed = regrade_frame(df, path)
+
+    if changed:
+        df.to_csv(path, index=False)
+
+    return changed
+
+
+def main() -> None:
+    ERROR_LOG.parent.mkdir(parents=True, exist_ok=True)
+
+    with open(ERROR_LOG, "w", encoding="utf-8") as f:
+        f.write("=== regrade_results.py log ===\n")
+
+    for league in GRADED_DIRS:
+        files = graded_files(league)
+        changed = 0
+
+        for path in files:
+            try:
+                changed += regrade_file(path)
+            except Exception as e:
+                log(f"ERROR regrading {path}: {e}")
+
+        log(f"{league}: {len(files)} files, {changed} rows regraded")
+
+    print("regrade_results.py complete.")
+
+
+if __name__ == "__main__":
+    main()
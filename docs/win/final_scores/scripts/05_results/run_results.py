@@ -0,0 +1,324 @@
+#!/usr/bin/env python3
+# docs/win/final_scores/scripts/05_results/run_results.py
+#
+# The whole 05 RESULTS stage in one process tree. Each league runs in its own
+# worker: its selection and score files are read once and their team names
+# checked, then its bets are graded, upserted into the master, re-graded,
+# summarized and tallied, and the worker hands back every file it would write.
+# Nothing is written until all leagues are done, then the combined outputs
+# (team name check, results cube, edge reports) are built and everything is
+# written at once.
+#
+# Basketball grading and tallying are basketball_results.py's own
+# grade_outputs / tally_outputs, so the two entry points cannot drift. Same
+# outputs as running name_normalization.py, basketball_results.py,
+# regrade_results.py, results.py, generate_summary.py and results_sorted.py
+# one after another, except that the basketball tally and deeper summaries
+# are built after the re-grade, from the master as it is written.
+
+import glob
+import sys
+from concurrent.futures import ProcessPoolExecutor
+from datetime import datetime
+from pathlib import Path
+
+import pandas as pd
+
+# --- DYNAMIC PATH SETUP ---
+COMMON_DIR = str(Path(__file__).resolve().parents[5] / "scripts")
+if COMMON_DIR not in sys.path:
+    sys.path.append(COMMON_DIR)
+
+from common.alias_index import load_alias_index, market_aliases
+from common.results_cube import build_cube, write_cube
+
+import basketball_results as bb
+import generate_summary
+import name_normalization as nn
+import regrade_results
+import results
+import results_sorted
+
+
+# =========================
+# PATHS
+# =========================
+
+LEAGUES = ["NBA", "NCAAB", "NHL", "SOCCER"]
+
+BASKETBALL = bb.LEAGUE_PATHS
+
+LOG_FILE = Path("docs/win/final_scores/errors/run_results_log.txt")
+
+
+# =========================
+# LOGGING
+# =========================
+
+def log(msg):
+    LOG_FILE.parent.mkdir(parents=True, exist_ok=True)
+    ts = datetime.now().strftime("%Y-%m-%d %H:%M:%S")
+    with open(LOG_FILE, "a", encoding="utf-8") as f:
+        f.write(f"[{ts}] {msg}\n")
+
+
+def reset_logs():
+    """Start every step's log the way its own main does"""
+    for path in [LOG_FILE, bb.LOG_FILE]:
+        path.parent.mkdir(parents=True, exist_ok=True)
+        open(path, "w", encoding="utf-8").close()
+
+    for path, header in [
+        (regrade_results.ERROR_LOG, "=== regrade_results.py log ===\n"),
+        (results.ERROR_LOG, "=== results_sorted.py log ===\n"),
+    ]:
+        path.parent.mkdir(parents=True, exist_ok=True)
+        with open(path, "w", encoding="utf-8") as f:
+            f.write(header)
+
+
+# =========================
+# LEAGUE STAGES
+# =========================
+
+def check_league(league, missing, mismatched):
+    """
+    Read the league's selection and score files once and check their team
+    names; (frames by path, files scanned).
+    """
+    aliases = market_aliases(load_alias_index(), league)
+
+    files = [f for f, market in nn.target_files() if market == league]
+    frames = {}
+
+    for file_path in files:
+        try:
+            df = pd.read_csv(file_path)
+            nn.check_frame(df, league, aliases, missing, mismatched)
+            frames[file_path] = df
+
+        except Exception as e:
+            missing.add((league, f"FILE_ERROR::{file_path}::{str(e)}"))
+
+    return frames, len(files)
+
+
+def grade_basketball(league, frames, outputs, graded):
+    """
+    basketball_results.py grading of one league, reading its inputs from
+    frames; True if any date was graded.
+    """
+    def frame(path):
+        df = frames.get(str(path))
+        return bb.safe_read(path) if df is None else df
+
+    league_outputs, league_graded = bb.grade_outputs(league, read=frame)
+
+    outputs.update(league_outputs)
+    graded.update(league_graded)
+
+    return bool(league_outputs)
+
+
+def tally_basketball(league, outputs, graded):
+    """
+    basketball_results.py tally and deeper summaries of one league, from the
+    master after the re-grade so rows it edited in place are counted.
+    """
+    master = BASKETBALL[league]["master"]
+
+    df = graded.get(master)
+    outputs.update(bb.tally_outputs(league, df if df is not None else bb.safe_read(master)))
+
+
+def regrade_league(league, outputs, graded):
+    """regrade_results.py for one league, over the in-memory graded directory"""
+    graded_dir = regrade_results.GRADED_DIRS[league]
+
+    daily = set(graded_dir.glob(f"*_results_{league}.csv"))
+    daily.update(p for p in graded if p.name.endswith(f"_results_{league}.csv"))
+
+    master = graded_dir / f"{league}_final.csv"
+    files = sorted(daily) + ([master] if master.exists() or master in graded else [])
+
+    changed = 0
+
+    for path in files:
+        try:
+            df = graded[path] if path in graded else pd.read_csv(path)
+            n = regrade_results.regrade_frame(df, path)
+
+            if n:
+                outputs[path] = df
+                graded[path] = bb.reread(df)
+                changed += n
+            else:
+                graded[path] = df
+
+        except Exception as e:
+            regrade_results.log(f"ERROR regrading {path}: {e}")
+
+    regrade_results.log(f"{league}: {len(files)} files, {changed} rows regraded")
+
+
+def summarize_league(league, outputs, graded):
+    """results.py (and results_sorted.py) for one league; the enriched picks"""
+    in_path = results.INPUTS[league]
+    out_path = results.OUTPUTS[league]
+
+    df = graded.get(in_path)
+    if df is None:
+        df = results.safe_read(in_path)
+    elif df.empty:
+        results.log(f"Empty input file: {in_path}")
+        df = pd.DataFrame()
+    else:
+        df = df.copy()
+
+    work = None
+    sorted_df = None
+
+    if df.empty:
+        results.log(f"{league}: input missing or empty, skipped")
+    else:
+        sorted_df = results.build_sorted_output(df, league)
+        outputs[out_path] = sorted_df
+
+        work = results.prepare_pick_level_df(df, league)
+        outputs.update(results.deep_summaries(work, league))
+
+    tally_in = results.MARKET_TALLY_INPUTS[league]
+    tally_df = bb.reread(sorted_df) if sorted_df is not None else results.safe_read(tally_in)
+
+    tally = results.market_tally(tally_df, league, tally_in)
+    if tally is not None:
+        outputs[results.MARKET_TALLY_OUTPUTS[league]] = tally
+
+    # results_sorted.py runs last and rewrites the NHL / soccer sorted files
+    if league in results_sorted.INPUTS and sorted_df is not None:
+        df = graded.get(in_path)
+        df = df.copy() if df is not None else results_sorted.safe_read(in_path)
+
+        if not df.empty:
+            outputs[results_sorted.OUTPUTS[league]] = results_sorted.build_sorted_output(df, league)
+
+    return work
+
+
+def edge_frames(league, graded):
+    """generate_summary.py inputs of one league, after the re-grade"""
+    suffix = league
+    results_dir = f"docs/win/final_scores/results/{league.lower()}/graded"
+
+    frames = []
+
+    for file in glob.glob(f"{results_dir}/*_results_{suffix}.csv"):
+        df = graded.get(Path(file))
+        if df is None:
+            return generate_summary.sport_frames(league.lower(), suffix)
+        frames.append((file, df))
+
+    return frames
+
+
+def league_job(league):
+    """Everything one league contributes to the results stage"""
+    outputs = {}
+    missing = set()
+    mismatched = set()
+
+    frames, scanned = check_league(league, missing, mismatched)
+
+    graded = {}
+    changed = False
+
+    if league in BASKETBALL:
+        changed = grade_basketball(league, frames, outputs, graded)
+
+    regrade_league(league, outputs, graded)
+
+    edge_rows = []
+
+    if changed:
+        tally_basketball(league, outputs, graded)
+
+    if league in BASKETBALL:
+        master = BASKETBALL[league]["master"]
+        df = graded.get(master)
+        edge_rows = bb.edge_report_rows(league, df if df is not None else bb.safe_read(master))
+
+    work = summarize_league(league, outputs, graded)
+
+    sport = {s["suffix"]: s["name"] for s in generate_summary.SPORTS}
+    summary_frames = {sport[league]: edge_frames(league, graded)} if league in sport else {}
+
+    return {
+        "league": league,
+        "outputs": outputs,
+        "missing": missing,
+        "mismatched": mismatched,
+        "scanned": scanned,
+        "changed": changed,
+        "edge_rows": edge_rows,
+        "work": work,
+        "summary_frames": summary_frames,
+    }
+
+
+# =========================
+# WRITE
+# =========================
+
+def write_outputs(outputs):
+    bb.write_outputs(outputs)
+    log(f"WROTE {len(outputs)} files")
+
+
+# =========================
+# MAIN
+# =========================
+
+def main():
+    reset_logs()
+
+    # every worker reads the files it needs before anything is written
+    with ProcessPoolExecutor(max_workers=len(LEAGUES)) as pool:
+        jobs = {league: out for league, out in zip(LEAGUES, pool.map(league_job, LEAGUES))}
+
+    outputs = {}
+    missing = set()
+    mismatched = set()
+    scanned = 0
+
+    for league in LEAGUES:
+        job = jobs[league]
+
+        outputs.update(job["outputs"])
+        missing |= job["missing"]
+        mismatched |= job["mismatched"]
+        scanned += job["scanned"]
+
+        log(f"{league}: {len(job['outputs'])} outputs")
+
+    write_outputs(outputs)
+
+    nn.write_missing(missing)
+    nn.write_summary(scanned, mismatched, missing)
+
+    if any(jobs[league]["changed"] for league in BASKETBALL):
+        bb.write_edge_report([row for league in BASKETBALL for row in jobs[league]["edge_rows"]])
+
+    write_cube(build_cube([jobs[league]["work"] for league in LEAGUES]), results.RESULTS_CUBE)
+    results.log(f"wrote results cube {results.RESULTS_CUBE}")
+
+    summary_frames = {}
+    for league in LEAGUES:
+        summary_frames.update(jobs[league]["summary_frames"])
+
+    generate_summary.generate_reports(summary_frames)
+
+    print("run_results.py complete.")
+
+
+if __name__ == "__main__":
+    main()
@@ -2,11 +2,18 @@
 # docs/win/hockey/scripts/00_parsing/name_normalization.py
 
 import csv
+import sys
 from pathlib import Path
 from datetime import datetime
 
+# --- DYNAMIC PATH SETUP ---
+COMMON_DIR = str(Path(__file__).resolve().parents[5] / "scripts")
+if COMMON_DIR not in sys.path:
+    sys.path.append(COMMON_DIR)
+
+from common.alias_index import load_alias_index
+
 INTAKE_DIR = Path("docs/win/hockey/00_intake")
-MAP_FILE = Path("mappings/hockey/team_map_hockey.csv")
 
 NO_MAP_DIR = Path("mappings/hockey/no_map")
 NO_MAP_DIR.mkdir(parents=True, exist_ok=True)
@@ -28,21 +35,12 @@ def log(msg: str) -> None:
 # LOAD TEAM MAP (CASE INSENSITIVE)
 # =========================
 
-team_map = {}
-
-if MAP_FILE.exists():
-    with open(MAP_FILE, newline="", encoding="utf-8") as f:
-        reader = csv.DictReader(f)
-        for row in reader:
-            key = (
-                row.get("market", "").strip().lower(),
-                row.get("alias", "").strip().lower(),
-            )
-            canonical = row.get("canonical_team", "").strip()
-            if key[0] and key[1] and canonical:
-                team_map[key] = canonical
-else:
-    log("WARNING: team_map_hockey.csv not found")
+# (market, alias) -> canonical, from the shared alias index
+team_map = {
+    (market, alias): canonical
+    for market, aliases in load_alias_index().items()
+    for alias, canonical in aliases.items()
+}
 
 # =========================
 # PROCESS FILES
@@ -1,11 +1,22 @@
 #!/usr/bin/env python3
 # docs/win/hockey/scripts/04_select/select_bets.py
 
+import numpy as np
 import pandas as pd
 from pathlib import Path
 from datetime import datetime
+import sys
 import traceback
 
+# --- DYNAMIC PATH SETUP ---
+COMMON_DIR = str(Path(__file__).resolve().parents[5] / "scripts")
+if COMMON_DIR not in sys.path:
+    sys.path.append(COMMON_DIR)
+
+from common.correlated_selection import load_settings, select_correlated
+from common.juice_engine import american_to_decimal
+from common.rule_engine import frame_fields, load_rules, side_masks
+
 # Directory Configuration
 INPUT_DIR = Path("docs/win/hockey/03_edges")
 OUTPUT_DIR = Path("docs/win/hockey/04_select")
@@ -15,17 +26,271 @@ ERROR_LOG = ERROR_DIR / "select_bets.txt"
 OUTPUT_DIR.mkdir(parents=True, exist_ok=True)
 ERROR_DIR.mkdir(parents=True, exist_ok=True)
 
-# Global Thresholds
-TOTAL_MIN_EDGE_PCT = 0.05
-TOTAL_MIN_PROB = 0.52
-
-# Puck Line Specifics
-PL_DOG_WIN_PROB_REQ = 0.45
-PL_HUGE_FAV_EDGE = 0.20
-PL_MAX_FAV_ODDS = -120
+# Thresholds live in config/selection_rules.json ("hockey" section)
+RULES = load_rules("hockey")
 
 LEAGUE_CODE = "NHL"
 
+# Each puck-line game is joined once (on game_id) to its totals and moneyline
+# rows; bets come out per game in market order, then market row, then side.
+MARKET_ORDER = {"total": 0, "puck_line": 1, "moneyline": 2}
+
+SIDES = {
+    "total": ["over", "under"],
+    "puck_line": ["home", "away"],
+    "moneyline": ["home", "away"],
+}
+
+# dedupe keys (game + side, plus line where the market has one)
+DEDUPE_KEYS = {
+    "total": ["game_date", "away_team", "home_team", "bet_side", "line"],
+    "puck_line": ["game_date", "away_team", "home_team", "bet_side", "line"],
+    "moneyline": ["game_date", "away_team", "home_team", "bet_side"],
+}
+
+BASE_COLUMNS = [
+    "game_date", "league", "away_team", "home_team", "market_type", "bet_side",
+    "line", "game_id", "take_bet", "take_bet_edge_pct", "take_odds",
+]
+
+# edge columns in the order each market writes them
+EDGE_COLUMNS = {
+    "total": [
+        "over_edge_decimal", "under_edge_decimal", "home_ml_edge_decimal",
+        "away_ml_edge_decimal", "home_spread_edge_decimal", "away_spread_edge_decimal",
+    ],
+    "puck_line": [
+        "home_spread_edge_decimal", "away_spread_edge_decimal", "home_ml_edge_decimal",
+        "away_ml_edge_decimal", "over_edge_decimal", "under_edge_decimal",
+    ],
+    "moneyline": [
+        "home_ml_edge_decimal", "away_ml_edge_decimal", "home_spread_edge_decimal",
+        "away_spread_edge_decimal", "over_edge_decimal", "under_edge_decimal",
+    ],
+}
+
+EDGE_TARGET = {
+    ("total", "over"): "over_edge_decimal",
+    ("total", "under"): "under_edge_decimal",
+    ("puck_line", "home"): "home_spread_edge_decimal",
+    ("puck_line", "away"): "away_spread_edge_decimal",
+    ("moneyline", "home"): "home_ml_edge_decimal",
+    ("moneyline", "away"): "away_ml_edge_decimal",
+}
+
+
+def pass_flags(df, market, rules=RULES):
+    """{side: bool array} per row of one market file (missing values never pass)"""
+    compiled = rules[market]
+    fields, shared = frame_fields(df, compiled, fill=np.nan)
+
+    return side_masks(compiled, fields, shared, n=len(df))
+
+
+def numeric(df, col):
+    if col not in df.columns:
+        return np.full(len(df), np.nan)
+    return pd.to_numeric(df[col], errors="coerce").to_numpy()
+
+
+def raw(df, col):
+    if col not in df.columns:
+        return np.full(len(df), None, dtype=object)
+    return df[col].to_numpy()
+
+
+def join_games(games, df):
+    """(game position, market row) pairs for every market row sharing a game_id"""
+    if df is None or df.empty or "game_id" not in df.columns:
+        return None
+
+    right = pd.DataFrame({"game_id": df["game_id"].to_numpy(), "_row": np.arange(len(df))})
+
+    joined = games[["_pos", "game_id"]].merge(right, on="game_id", how="inner")
+
+    return joined.sort_values(["_pos", "_row"], kind="stable").reset_index(drop=True)
+
+
+def candidates(games, market, pos, row, sides_values):
+    """
+    Long (game, market row, side) frame of passing bets for one market.
+    sides_values: {side: (keep mask, line, edge, odds)} aligned with pos/row.
+    """
+    frames = []
+
+    for order, side in enumerate(SIDES[market]):
+        keep, line, edge, odds = sides_values[side]
+
+        g = games.iloc[pos[keep]]
+
+        frame = pd.DataFrame({
+            "game_date": g["game_date"].to_numpy(),
+            "league": LEAGUE_CODE,
+            "away_team": g["away_team"].to_numpy(),
+            "home_team": g["home_team"].to_numpy(),
+            "market_type": market,
+            "bet_side": side,
+            "line": line[keep],
+            "game_id": g["game_id"].to_numpy(),
+            "take_bet": f"{side}_{market}",
+            "take_bet_edge_pct": edge[keep],
+            "take_odds": odds[keep],
+        })
+
+        for col in EDGE_COLUMNS[market]:
+            frame[col] = edge[keep] if col == EDGE_TARGET[(market, side)] else None
+
+        frame["_pos"] = pos[keep]
+        frame["_market"] = MARKET_ORDER[market]
+        frame["_row"] = row[keep]
+        frame["_side"] = order
+
+        frames.append(frame)
+
+    out = pd.concat(frames, ignore_index=True)
+    out = out.sort_values(["_pos", "_row", "_side"], kind="stable")
+
+    return out.drop_duplicates(subset=DEDUPE_KEYS[market], keep="first")
+
+
+def select_totals(games, td_df, rules=RULES):
+    joined = join_games(games, td_df)
+    if joined is None:
+        return None
+
+    flags = pass_flags(td_df, "total", rules)
+    pos = joined["_pos"].to_numpy()
+    row = joined["_row"].to_numpy()
+
+    line = raw(td_df, "total")[row]
+
+    return candidates(games, "total", pos, row, {
+        side: (
+            flags[side][row],
+            line,
+            numeric(td_df, f"{side}_edge_pct")[row],
+            raw(td_df, f"dk_total_{side}_american")[row],
+        )
+        for side in SIDES["total"]
+    })
+
+
+def select_puck_lines(games, pl_df, totals, rules=RULES):
+    """Puck lines, with the side of each game's last selected total as a rule field"""
+    last_total = pd.Series("", index=games.index)
+
+    if totals is not None and not totals.empty:
+        last = totals.groupby("_pos")["bet_side"].last()
+        last_total.loc[last.index] = last.to_numpy()
+
+    work = pl_df.copy()
+    work["total_under_selected"] = (last_total == "under").astype(float).to_numpy()
+
+    flags = pass_flags(work, "puck_line", rules)
+    pos = games["_pos"].to_numpy()
+
+    return candidates(games, "puck_line", pos, pos, {
+        side: (
+            flags[side],
+            numeric(pl_df, f"{side}_puck_line"),
+            numeric(pl_df, f"{side}_edge_pct"),
+            numeric(pl_df, f"{side}_dk_puck_line_american"),
+        )
+        for side in SIDES["puck_line"]
+    })
+
+
+def select_moneylines(games, ml_df, rules=RULES):
+    joined = join_games(games, ml_df)
+    if joined is None:
+        return None
+
+    flags = pass_flags(ml_df, "moneyline", rules)
+    pos = joined["_pos"].to_numpy()
+    row = joined["_row"].to_numpy()
+
+    return candidates(games, "moneyline", pos, row, {
+        side: (
+            flags[side][row],
+            np.full(len(row), "", dtype=object),
+            numeric(ml_df, f"{side}_edge_pct")[row],
+            numeric(ml_df, f"{side}_dk_moneyline_american")[row],
+        )
+        for side in SIDES["moneyline"]
+    })
+
+
+def drop_correlated(out, pl_df):
+    """
+    Keep the best joint set of bets per game (Poisson goals from the
+    projections); every bet is kept when the mode is off.
+    """
+    settings = load_settings(LEAGUE_CODE)
+
+    if settings is None:
+        return out
+
+    pos = out["_pos"].to_numpy()
+    is_ml = (out["market_type"] == "moneyline").to_numpy()
+
+    bets = pd.DataFrame({
+        "game_id": pos,
+        "home_mean": numeric(pl_df, "home_projected_goals")[pos],
+        "away_mean": numeric(pl_df, "away_projected_goals")[pos],
+        "market": out["market_type"].to_numpy(),
+        "side": out["bet_side"].to_numpy(),
+        "line": np.where(is_ml, 0.0, pd.to_numeric(out["line"], errors="coerce")),
+        "decimal": american_to_decimal(out["take_odds"].to_numpy()),
+    })
+
+    keep = select_correlated(
+        bets,
+        settings["model"],
+        n_sims=settings["n_sims"],
+        seed=settings["seed"],
+        risk_aversion=settings["risk_aversion"],
+    )
+
+    return out.loc[keep]
+
+
+def select_slate(ml_df, pl_df, td_df, rules=RULES):
+    """
+    Selected bets for one slate, in per-game order, plus counts per market.
+    rules: a compiled hockey section, e.g. load_rules("hockey", overrides).
+    """
+    games = pd.DataFrame({
+        "_pos": np.arange(len(pl_df)),
+        "game_id": raw(pl_df, "game_id"),
+        "game_date": pl_df["game_date"].astype(str).to_numpy(),
+        "away_team": pl_df["away_team"].astype(str).to_numpy(),
+        "home_team": pl_df["home_team"].astype(str).to_numpy(),
+    })
+
+    totals = select_totals(games, td_df, rules)
+    puck_lines = select_puck_lines(games, pl_df, totals, rules)
+    moneylines = select_moneylines(games, ml_df, rules)
+
+    parts = [p for p in (totals, puck_lines, moneylines) if p is not None and not p.empty]
+
+    if not parts:
+        return None, {"moneyline": 0, "puck_line": 0, "total": 0}
+
+    out = pd.concat(parts, ignore_index=True)
+    out = out.sort_values(["_pos", "_market", "_row", "_side"], kind="stable")
+    out = drop_correlated(out, pl_df)
+
+    counts = {m: int((out["market_type"] == m).sum()) for m in ("moneyline", "puck_line", "total")}
+
+    if out.empty:
+        return None, counts
+
+    first_market = out["market_type"].iloc[0]
+    out = out[BASE_COLUMNS + EDGE_COLUMNS[first_market]]
+
+    return out, counts
+
+
 def main():
     with open(ERROR_LOG, "w") as log:
         log.write("=== NHL SELECT BETS RUN ===\n")
@@ -44,10 +309,6 @@ def main():
                 return
 
             for slate_key in slates.keys():
-                final_rows = []
-                seen_bets = set()
-                counts = {"moneyline": 0, "puck_line": 0, "total": 0}
-
                 ml_path = INPUT_DIR / f"{slate_key}_NHL_moneyline.csv"
                 pl_path = INPUT_DIR / f"{slate_key}_NHL_puck_line.csv"
                 td_path = INPUT_DIR / f"{slate_key}_NHL_total.csv"
@@ -59,141 +320,9 @@ def main():
                 if pl_df is None or pl_df.empty:
                     continue
 
-                for _, row in pl_df.iterrows():
-                    game_date = str(row.get("game_date"))
-                    away = str(row.get("away_team"))
-                    home = str(row.get("home_team"))
-                    game_id = row.get("game_id")
-                    selected_total_side = None
-
-                    # --- TOTALS ---
-                    if td_df is not None:
-                        game_tot = td_df[(td_df["away_team"] == away) & (td_df["home_team"] == home)]
-                        for _, trow in game_tot.iterrows():
-                            for side in ["over", "under"]:
-                                line = trow.get("total")
-                                t_edge = pd.to_numeric(trow.get(f"{side}_edge_pct"), errors='coerce')
-                                t_prob = pd.to_numeric(trow.get(f"juiced_total_{side}_prob"), errors='coerce')
-
-                                if t_edge >= TOTAL_MIN_EDGE_PCT and t_prob >= TOTAL_MIN_PROB:
-                                    bet_key = f"{game_date}_{away}_{home}_total_{side}_{line}"
-                                    if bet_key not in seen_bets:
-                                        selected_total_side = side
-                                        final_rows.append({
-                                            "game_date": game_date,
-                                            "league": LEAGUE_CODE,
-                                            "away_team": away,
-                                            "home_team": home,
-                                            "market_type": "total",
-                                            "bet_side": side,
-                                            "line": line,
-                                            "game_id": game_id,
-                                            "take_bet": f"{side}_total",
-                                            "take_bet_edge_pct": t_edge,
-                                            "take_odds": trow.get(f"dk_total_{side}_american"),
-
-                                            "over_edge_decimal": t_edge if side == "over" else None,
-                                            "under_edge_decimal": t_edge if side == "under" else None,
-                                            "home_ml_edge_decimal": None,
-                                            "away_ml_edge_decimal": None,
-                                            "home_spread_edge_decimal": None,
-                                            "away_spread_edge_decimal": None
-                                        })
-                                        seen_bets.add(bet_key)
-                                        counts["total"] += 1
-
-                    # --- PUCK LINE ---
-                    for side in ["home", "away"]:
-                        line = pd.to_numeric(row.get(f"{side}_puck_line"), errors='coerce')
-                        edge = pd.to_numeric(row.get(f"{side}_edge_pct"), errors='coerce')
-                        prob = pd.to_numeric(row.get(f"{side}_prob"), errors='coerce')
-                        odds = pd.to_numeric(row.get(f"{side}_dk_puck_line_american"), errors='coerce')
-
-                        if pd.isna(line):
-                            continue
-
-                        keep_pl = False
-
-                        if line >= 1.5:
-                            if prob >= PL_DOG_WIN_PROB_REQ:
-                                keep_pl = True
-
-                        elif line <= -1.5:
-                            if selected_total_side == "under":
-                                continue
-                            if edge >= PL_HUGE_FAV_EDGE and odds >= PL_MAX_FAV_ODDS:
-                                keep_pl = True
-
-                        if keep_pl:
-                            bet_key = f"{game_date}_{away}_{home}_puckline_{side}_{line}"
-                            if bet_key not in seen_bets:
-                                final_rows.append({
-                                    "game_date": game_date,
-                                    "league": LEAGUE_CODE,
-                                    "away_team": away,
-                                    "home_team": home,
-                                    "market_type": "puck_line",
-                                    "bet_side": side,
-                                    "line": line,
-                                    "game_id": game_id,
-                                    "take_bet": f"{side}_puck_line",
-                                    "take_bet_edge_pct": edge,
-                                    "take_odds": odds,
-
-                                    "home_spread_edge_decimal": edge if side == "home" else None,
-                                    "away_spread_edge_decimal": edge if side == "away" else None,
-                                    "home_ml_edge_decimal": None,
-                                    "away_ml_edge_decimal": None,
-                                    "over_edge_decimal": None,
-                                    "under_edge_decimal": None
-                                })
-                                seen_bets.add(bet_key)
-                                counts["puck_line"] += 1
-
-                    # --- MONEYLINE ---
-                    if ml_df is not None:
-                        game_ml = ml_df[(ml_df["away_team"] == away) & (ml_df["home_team"] == home)]
-                        for _, mrow in game_ml.iterrows():
-                            for side in ["home", "away"]:
-                                m_edge = pd.to_numeric(mrow.get(f"{side}_edge_pct"), errors='coerce')
-                                m_prob = pd.to_numeric(mrow.get(f"{side}_prob"), errors='coerce')
-                                m_odds = pd.to_numeric(mrow.get(f"{side}_dk_moneyline_american"), errors='coerce')
-
-                                if (
-                                    -250 <= m_odds <= 250 and
-                                    (
-                                        (m_edge >= 0.025 and m_prob >= 0.40) or
-                                        (m_odds < 0 and m_edge >= 0.02 and m_prob >= 0.44)
-                                    )
-                                ):
-                                    bet_key = f"{game_date}_{away}_{home}_moneyline_{side}"
-                                    if bet_key not in seen_bets:
-                                        final_rows.append({
-                                            "game_date": game_date,
-                                            "league": LEAGUE_CODE,
-                                            "away_team": away,
-                                            "home_team": home,
-                                            "market_type": "moneyline",
-                                            "bet_side": side,
-                                            "line": "",
-                                            "game_id": game_id,
-                                            "take_bet": f"{side}_moneyline",
-                                            "take_bet_edge_pct": m_edge,
-                                            "take_odds": m_odds,
-
-                                            "home_ml_edge_decimal": m_edge if side == "home" else None,
-                                            "away_ml_edge_decimal": m_edge if side == "away" else None,
-                                            "home_spread_edge_decimal": None,
-                                            "away_spread_edge_decimal": None,
-                                            "over_edge_decimal": None,
-                                            "under_edge_decimal": None
-                                        })
-                                        seen_bets.add(bet_key)
-                                        counts["moneyline"] += 1
-
-                if final_rows:
-                    out_df = pd.DataFrame(final_rows)
+                out_df, counts = select_slate(ml_df, pl_df, td_df)
 
+                if out_df is not None:
                     output_path = OUTPUT_DIR / f"{slate_key}_NHL.csv"
                     out_df.to_csv(output_path, index=False)
 
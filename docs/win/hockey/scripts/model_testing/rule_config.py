@@ -1,11 +0,0 @@
-# docs/win/hockey/scripts/model_testing/rule_config.py
-
-TOTAL_MIN_EDGE_PCT = 0.05
-TOTAL_MIN_PROB = 0.52
-
-PL_DOG_WIN_PROB_REQ = 0.45
-PL_HUGE_FAV_EDGE = 0.20
-PL_MAX_FAV_ODDS = -120
-
-ML_MIN_EDGE = 0.03
-ML_MIN_PROB = 0.45
@@ -2,11 +2,28 @@
 # docs/win/hockey/scripts/model_testing/run_parameter_tests.py
 
 import itertools
-import subprocess
-import pandas as pd
 import random
+import subprocess
+import sys
 from pathlib import Path
 
+import pandas as pd
+
+# --- DYNAMIC PATH SETUP ---
+COMMON_DIR = str(Path(__file__).resolve().parents[5] / "scripts")
+if COMMON_DIR not in sys.path:
+    sys.path.append(COMMON_DIR)
+
+SELECT_DIR = str(Path(__file__).resolve().parents[1] / "04_select")
+if SELECT_DIR not in sys.path:
+    sys.path.append(SELECT_DIR)
+
+from common.game_index import join_scores
+from common.grading import grade_frame
+from common.results_summary import summarize_groups
+from common.rule_engine import compile_section, load_rule_config
+from select_bets import select_slate
+
 RUN_DATES = [
     "2026_02_24",
     "2026_02_26",
@@ -17,18 +34,20 @@ RUN_DATES = [
     "2026_03_04",
 ]
 
-TOTAL_MIN_EDGE_PCT_VALUES = [0.03,0.04,0.05,0.06,0.07]
-TOTAL_MIN_PROB_VALUES = [0.50,0.52,0.54,0.56]
-
-PL_DOG_WIN_PROB_REQ_VALUES = [0.42,0.45,0.48,0.50]
-PL_HUGE_FAV_EDGE_VALUES = [0.12,0.15,0.18,0.20,0.22]
-PL_MAX_FAV_ODDS_VALUES = [-140,-130,-120,-110]
-
-ML_MIN_EDGE_VALUES = [0.02,0.03,0.04,0.05]
-ML_MIN_PROB_VALUES = [0.42,0.45,0.48,0.50]
+# parameter name in the "hockey" section of config/selection_rules.json -> values
+GRID = {
+    "TOTAL_MIN_EDGE_PCT": [0.03, 0.04, 0.05, 0.06, 0.07],
+    "TOTAL_MIN_PROB": [0.50, 0.52, 0.54, 0.56],
+    "PL_DOG_WIN_PROB_REQ": [0.42, 0.45, 0.48, 0.50],
+    "PL_HUGE_FAV_EDGE": [0.12, 0.15, 0.18, 0.20, 0.22],
+    "PL_MAX_FAV_ODDS": [-140, -130, -120, -110],
+    "ML_MIN_EDGE": [0.02, 0.03, 0.04, 0.05],
+    "ML_MIN_PROB": [0.42, 0.45, 0.48, 0.50],
+}
 
 MAX_RUNS = 1
 
+# rebuilds every slate in 03_edges once; the variants below only re-select
 BASE_PIPELINE = [
     "docs/win/hockey/scripts/model_testing/build_juice_files.py",
     "docs/win/hockey/scripts/02_juice/apply_moneyline_juice.py",
@@ -37,88 +56,94 @@ BASE_PIPELINE = [
     "docs/win/hockey/scripts/model_testing/compute_edges.py",
 ]
 
-RULE_PIPELINE = [
-    "docs/win/hockey/scripts/model_testing/select_bets.py",
-    "docs/win/final_scores/scripts/05_results/results.py",
-]
+EDGES_DIR = Path("docs/win/hockey/03_edges")
+SCORE_DIR = Path("docs/win/final_scores/results/nhl/final_scores")
 
 OUTPUT = Path("docs/win/hockey/model_testing/rule_test_results.csv")
-CONFIG_FILE = Path("docs/win/hockey/model_testing/rule_config.py")
 
-grid = list(itertools.product(
-    TOTAL_MIN_EDGE_PCT_VALUES,
-    TOTAL_MIN_PROB_VALUES,
-    PL_DOG_WIN_PROB_REQ_VALUES,
-    PL_HUGE_FAV_EDGE_VALUES,
-    PL_MAX_FAV_ODDS_VALUES,
-    ML_MIN_EDGE_VALUES,
-    ML_MIN_PROB_VALUES
-))
+MARKETS = {
+    "moneyline": "NHL_MONEYLINE_WIN_PCT",
+    "puck_line": "NHL_PUCK_LINE_WIN_PCT",
+    "total": "NHL_TOTAL_WIN_PCT",
+}
+
+
+def build_grid():
+    grid = [dict(zip(GRID, combo)) for combo in itertools.product(*GRID.values())]
+
+    if len(grid) > MAX_RUNS:
+        grid = random.sample(grid, MAX_RUNS)
+
+    return grid
+
+
+def read_optional(path):
+    return pd.read_csv(path) if path.exists() else None
 
-if len(grid) > MAX_RUNS:
-    grid = random.sample(grid, MAX_RUNS)
 
-results = []
+def load_date(run_date):
+    """(slate frames (ml, pl, td), final scores) for one date; None if either is missing"""
+    pl_df = read_optional(EDGES_DIR / f"{run_date}_NHL_puck_line.csv")
+    scores = read_optional(SCORE_DIR / f"{run_date}_final_scores_NHL.csv")
 
-for RUN_DATE in RUN_DATES:
+    if pl_df is None or pl_df.empty or scores is None or scores.empty:
+        return None
 
+    slate = (
+        read_optional(EDGES_DIR / f"{run_date}_NHL_moneyline.csv"),
+        pl_df,
+        read_optional(EDGES_DIR / f"{run_date}_NHL_total.csv"),
+    )
+
+    return slate, scores
+
+
+def win_pcts(rules, slate, scores):
+    """Win_Pct per market of one variant's selections on one date (None when it has no bets)"""
+    out = dict.fromkeys(MARKETS.values())
+
+    bets, _ = select_slate(*slate, rules=rules)
+    if bets is None:
+        return out
+
+    graded, _ = join_scores(bets, scores)
+    if graded.empty:
+        return out
+
+    graded["bet_result"] = grade_frame(graded)
+    tally = summarize_groups(graded, ["market_type"]).set_index("market_type")["Win_Pct"]
+
+    for market, col in MARKETS.items():
+        if market in tally.index:
+            out[col] = float(tally[market])
+
+    return out
+
+
+def main():
     for script in BASE_PIPELINE:
-        subprocess.run(["python", script], check=True)
+        subprocess.run([sys.executable, script], check=True)
+
+    section = load_rule_config()["hockey"]
+    dates = {d: load_date(d) for d in RUN_DATES}
+    grid = build_grid()
+
+    results = []
 
     for params in grid:
+        rules = compile_section(section, params)
+
+        for run_date, data in dates.items():
+            if data is None:
+                continue
+
+            results.append({"RUN_DATE": run_date, **params, **win_pcts(rules, *data)})
+
+    OUTPUT.parent.mkdir(parents=True, exist_ok=True)
+    pd.DataFrame(results).to_csv(OUTPUT, index=False)
+
+    print("Optimization complete")
+
 
-        (
-            TOTAL_MIN_EDGE_PCT,
-            TOTAL_MIN_PROB,
-            PL_DOG_WIN_PROB_REQ,
-            PL_HUGE_FAV_EDGE,
-            PL_MAX_FAV_ODDS,
-            ML_MIN_EDGE,
-            ML_MIN_PROB
-        ) = params
-
-        with open(CONFIG_FILE,"w") as f:
-            f.write(f"TOTAL_MIN_EDGE_PCT = {TOTAL_MIN_EDGE_PCT}\n")
-            f.write(f"TOTAL_MIN_PROB = {TOTAL_MIN_PROB}\n")
-            f.write(f"PL_DOG_WIN_PROB_REQ = {PL_DOG_WIN_PROB_REQ}\n")
-            f.write(f"PL_HUGE_FAV_EDGE = {PL_HUGE_FAV_EDGE}\n")
-            f.write(f"PL_MAX_FAV_ODDS = {PL_MAX_FAV_ODDS}\n")
-            f.write(f"ML_MIN_EDGE = {ML_MIN_EDGE}\n")
-            f.write(f"ML_MIN_PROB = {ML_MIN_PROB}\n")
-
-        for script in RULE_PIPELINE:
-            subprocess.run(["python", script], check=True)
-
-        try:
-            nhl = pd.read_csv("docs/win/final_scores/results/nhl/market_tally.csv")
-
-            moneyline = nhl.loc[nhl.market_type=="moneyline","Win_Pct"].values
-            puckline = nhl.loc[nhl.market_type=="puck_line","Win_Pct"].values
-            total = nhl.loc[nhl.market_type=="total","Win_Pct"].values
-
-            moneyline = float(moneyline[0]) if len(moneyline) else None
-            puckline = float(puckline[0]) if len(puckline) else None
-            total = float(total[0]) if len(total) else None
-
-        except:
-            moneyline = None
-            puckline = None
-            total = None
-
-        results.append({
-            "RUN_DATE": RUN_DATE,
-            "TOTAL_MIN_EDGE_PCT": TOTAL_MIN_EDGE_PCT,
-            "TOTAL_MIN_PROB": TOTAL_MIN_PROB,
-            "PL_DOG_WIN_PROB_REQ": PL_DOG_WIN_PROB_REQ,
-            "PL_HUGE_FAV_EDGE": PL_HUGE_FAV_EDGE,
-            "PL_MAX_FAV_ODDS": PL_MAX_FAV_ODDS,
-            "ML_MIN_EDGE": ML_MIN_EDGE,
-            "ML_MIN_PROB": ML_MIN_PROB,
-            "NHL_MONEYLINE_WIN_PCT": moneyline,
-            "NHL_PUCK_LINE_WIN_PCT": puckline,
-            "NHL_TOTAL_WIN_PCT": total
-        })
-
-        pd.DataFrame(results).to_csv(OUTPUT,index=False)
-
-print("Optimization complete")
+if __name__ == "__main__":
+    main()
@@ -1,258 +0,0 @@
-#!/usr/bin/env python3
-# docs/win/hockey/scripts/model_testing/select_bets.py
-
-import pandas as pd
-from pathlib import Path
-from datetime import datetime
-import traceback
-
-# =========================
-# OPTIONAL OVERRIDE CONFIG
-# =========================
-
-OVERRIDE_CONFIG_PATH = Path("docs/win/hockey/model_testing/rule_config.py")
-
-
-def load_override_config():
-    if not OVERRIDE_CONFIG_PATH.exists():
-        return {}
-
-    scope = {}
-    try:
-        content = OVERRIDE_CONFIG_PATH.read_text(encoding="utf-8")
-        exec(compile(content, str(OVERRIDE_CONFIG_PATH), "exec"), {}, scope)
-        return {k: v for k, v in scope.items() if not k.startswith("__")}
-    except Exception:
-        return {}
-
-
-OVR = load_override_config()
-
-# Directory Configuration
-INPUT_DIR = Path("docs/win/hockey/03_edges")
-OUTPUT_DIR = Path("docs/win/hockey/04_select")
-ERROR_DIR = Path("docs/win/hockey/errors/04_select")
-ERROR_LOG = ERROR_DIR / "select_bets.txt"
-
-OUTPUT_DIR.mkdir(parents=True, exist_ok=True)
-ERROR_DIR.mkdir(parents=True, exist_ok=True)
-
-# =========================
-# DEFAULT TUNING BLOCK
-# =========================
-
-TOTAL_MIN_EDGE_PCT = 0.05
-TOTAL_MIN_PROB = 0.52
-
-PL_DOG_WIN_PROB_REQ = 0.45
-PL_HUGE_FAV_EDGE = 0.20
-PL_MAX_FAV_ODDS = -120
-
-ML_MIN_EDGE = 0.03
-ML_MIN_PROB = 0.45
-
-LEAGUE_CODE = "NHL"
-
-# =========================
-# APPLY OVERRIDES
-# =========================
-
-if "TOTAL_MIN_EDGE_PCT" in OVR:
-    TOTAL_MIN_EDGE_PCT = float(OVR["TOTAL_MIN_EDGE_PCT"])
-
-if "TOTAL_MIN_PROB" in OVR:
-    TOTAL_MIN_PROB = float(OVR["TOTAL_MIN_PROB"])
-
-if "PL_DOG_WIN_PROB_REQ" in OVR:
-    PL_DOG_WIN_PROB_REQ = float(OVR["PL_DOG_WIN_PROB_REQ"])
-
-if "PL_HUGE_FAV_EDGE" in OVR:
-    PL_HUGE_FAV_EDGE = float(OVR["PL_HUGE_FAV_EDGE"])
-
-if "PL_MAX_FAV_ODDS" in OVR:
-    PL_MAX_FAV_ODDS = float(OVR["PL_MAX_FAV_ODDS"])
-
-if "ML_MIN_EDGE" in OVR:
-    ML_MIN_EDGE = float(OVR["ML_MIN_EDGE"])
-
-if "ML_MIN_PROB" in OVR:
-    ML_MIN_PROB = float(OVR["ML_MIN_PROB"])
-
-
-def main():
-    with open(ERROR_LOG, "w", encoding="utf-8") as log:
-        log.write("=== NHL SELECT BETS RUN ===\n")
-        log.write(f"Timestamp: {datetime.utcnow().isoformat()}Z\n")
-        log.write(
-            "RULES: "
-            f"TOTAL_MIN_EDGE_PCT={TOTAL_MIN_EDGE_PCT}, "
-            f"TOTAL_MIN_PROB={TOTAL_MIN_PROB}, "
-            f"PL_DOG_WIN_PROB_REQ={PL_DOG_WIN_PROB_REQ}, "
-            f"PL_HUGE_FAV_EDGE={PL_HUGE_FAV_EDGE}, "
-            f"PL_MAX_FAV_ODDS={PL_MAX_FAV_ODDS}, "
-            f"ML_MIN_EDGE={ML_MIN_EDGE}, "
-            f"ML_MIN_PROB={ML_MIN_PROB}\n\n"
-        )
-
-        try:
-            all_files = sorted(INPUT_DIR.glob("*_NHL_*.csv"))
-            slates = {}
-
-            for f in all_files:
-                slate_key = f.name.split("_NHL_")[0]
-                slates.setdefault(slate_key, []).append(f)
-
-            if not slates:
-                log.write("No input files found in docs/win/hockey/03_edges\n")
-                return
-
-            for slate_key in slates.keys():
-                final_rows = []
-                seen_bets = set()
-                counts = {"moneyline": 0, "puck_line": 0, "total": 0}
-
-                ml_path = INPUT_DIR / f"{slate_key}_NHL_moneyline.csv"
-                pl_path = INPUT_DIR / f"{slate_key}_NHL_puck_line.csv"
-                td_path = INPUT_DIR / f"{slate_key}_NHL_total.csv"
-
-                ml_df = pd.read_csv(ml_path) if ml_path.exists() else None
-                pl_df = pd.read_csv(pl_path) if pl_path.exists() else None
-                td_df = pd.read_csv(td_path) if td_path.exists() else None
-
-                if pl_df is None or pl_df.empty:
-                    continue
-
-                for _, row in pl_df.iterrows():
-                    game_date = str(row.get("game_date"))
-                    away = str(row.get("away_team"))
-                    home = str(row.get("home_team"))
-                    game_id = row.get("game_id")
-                    selected_total_side = None
-
-                    # --- TOTALS ---
-                    if td_df is not None:
-                        game_tot = td_df[
-                            (td_df["away_team"] == away) &
-                            (td_df["home_team"] == home)
-                        ]
-
-                        for _, trow in game_tot.iterrows():
-                            for side in ["over", "under"]:
-                                line = trow.get("total")
-                                t_edge = pd.to_numeric(trow.get(f"{side}_edge_pct"), errors="coerce")
-                                t_prob = pd.to_numeric(trow.get(f"juiced_total_{side}_prob"), errors="coerce")
-
-                                if pd.notna(t_edge) and pd.notna(t_prob):
-                                    if t_edge >= TOTAL_MIN_EDGE_PCT and t_prob >= TOTAL_MIN_PROB:
-                                        bet_key = f"{game_date}_{away}_{home}_total_{side}_{line}"
-                                        if bet_key not in seen_bets:
-                                            selected_total_side = side
-                                            final_rows.append({
-                                                "game_date": game_date,
-                                                "league": LEAGUE_CODE,
-                                                "away_team": away,
-                                                "home_team": home,
-                                                "market_type": "total",
-                                                "bet_side": side,
-                                                "line": line,
-                                                "game_id": game_id,
-                                                "take_bet": f"{side}_total",
-                                                "take_bet_edge_pct": t_edge,
-                                                "take_odds": trow.get(f"dk_total_{side}_american")
-                                            })
-                                            seen_bets.add(bet_key)
-                                            counts["total"] += 1
-
-                    # --- PUCK LINE ---
-                    for side in ["home", "away"]:
-                        line = pd.to_numeric(row.get(f"{side}_puck_line"), errors="coerce")
-                        edge = pd.to_numeric(row.get(f"{side}_edge_pct"), errors="coerce")
-                        prob = pd.to_numeric(row.get(f"{side}_prob"), errors="coerce")
-                        odds = pd.to_numeric(row.get(f"{side}_dk_puck_line_american"), errors="coerce")
-
-                        if pd.isna(line):
-                            continue
-
-                        keep_pl = False
-
-                        if line >= 1.5:
-                            if pd.notna(prob) and prob >= PL_DOG_WIN_PROB_REQ:
-                                keep_pl = True
-
-                        elif line <= -1.5:
-                            if selected_total_side == "under":
-                                continue
-                            if pd.notna(edge) and pd.notna(odds):
-                                if edge >= PL_HUGE_FAV_EDGE and odds >= PL_MAX_FAV_ODDS:
-                                    keep_pl = True
-
-                        if keep_pl:
-                            bet_key = f"{game_date}_{away}_{home}_puckline_{side}_{line}"
-                            if bet_key not in seen_bets:
-                                final_rows.append({
-                                    "game_date": game_date,
-                                    "league": LEAGUE_CODE,
-                                    "away_team": away,
-                                    "home_team": home,
-                                    "market_type": "puck_line",
-                                    "bet_side": side,
-                                    "line": line,
-                                    "game_id": game_id,
-                                    "take_bet": f"{side}_puck_line",
-                                    "take_bet_edge_pct": edge,
-                                    "take_odds": odds
-                                })
-                                seen_bets.add(bet_key)
-                                counts["puck_line"] += 1
-
-                    # --- MONEYLINE ---
-                    if ml_df is not None:
-                        game_ml = ml_df[
-                            (ml_df["away_team"] == away) &
-                            (ml_df["home_team"] == home)
-                        ]
-
-                        for _, mrow in game_ml.iterrows():
-                            for side in ["home", "away"]:
-                                m_edge = pd.to_numeric(mrow.get(f"{side}_edge_pct"), errors="coerce")
-                                m_prob = pd.to_numeric(mrow.get(f"{side}_prob"), errors="coerce")
-                                m_odds = pd.to_numeric(mrow.get(f"{side}_dk_moneyline_american"), errors="coerce")
-
-                                if pd.notna(m_edge) and pd.notna(m_prob):
-                                    if m_edge >= ML_MIN_EDGE and m_prob >= ML_MIN_PROB:
-                                        bet_key = f"{game_date}_{away}_{home}_moneyline_{side}"
-                                        if bet_key not in seen_bets:
-                                            final_rows.append({
-                                                "game_date": game_date,
-                                                "league": LEAGUE_CODE,
-                                                "away_team": away,
-                                                "home_team": home,
-                                                "market_type": "moneyline",
-                                                "bet_side": side,
-                                                "line": "",
-                                                "game_id": game_id,
-                                                "take_bet": f"{side}_moneyline",
-                                                "take_bet_edge_pct": m_edge,
-                                                "take_odds": m_odds
-                                            })
-                                            seen_bets.add(bet_key)
-                                            counts["moneyline"] += 1
-
-                if final_rows:
-                    out_df = pd.DataFrame(final_rows)
-                    output_path = OUTPUT_DIR / f"{slate_key}_NHL.csv"
-                    out_df.to_csv(output_path, index=False)
-
-                    log.write(
-                        f"Generated {output_path.name}: "
-                        f"ML:{counts['moneyline']} "
-                        f"PL:{counts['puck_line']} "
-                        f"Tot:{counts['total']}\n"
-                    )
-
-        except Exception as e:
-            log.write(f"CRITICAL ERROR: {str(e)}\n{traceback.format_exc()}")
-
-
-if __name__ == "__main__":
-    main()
@@ -2,11 +2,18 @@
 # docs/win/soccer/scripts/00_parsing/name_normalization.py
 
 import csv
+import sys
 from pathlib import Path
 from datetime import datetime
 
+# --- DYNAMIC PATH SETUP ---
+COMMON_DIR = str(Path(__file__).resolve().parents[5] / "scripts")
+if COMMON_DIR not in sys.path:
+    sys.path.append(COMMON_DIR)
+
+from common.alias_index import load_alias_index
+
 INTAKE_DIR = Path("docs/win/soccer/00_intake")
-MAP_FILE = Path("mappings/soccer/team_map_soccer.csv")
 
 NO_MAP_DIR = Path("mappings/soccer/no_map")
 NO_MAP_DIR.mkdir(parents=True, exist_ok=True)
@@ -29,20 +36,12 @@ def log(msg: str) -> None:
 # LOAD TEAM MAP
 # =========================
 
-team_map = {}
-
-if MAP_FILE.exists():
-    with open(MAP_FILE, newline="", encoding="utf-8") as f:
-        reader = csv.DictReader(f)
-        for row in reader:
-            market = (row.get("market") or "").strip().lower()
-            alias = (row.get("alias") or "").strip().lower()
-            canonical = (row.get("canonical_team") or "").strip()
-
-            if market and alias and canonical:
-                team_map[(market, alias)] = canonical
-else:
-    log("WARNING: team_map_soccer.csv not found")
+# (market, alias) -> canonical, from the shared alias index
+team_map = {
+    (market, alias): canonical
+    for market, aliases in load_alias_index().items()
+    for alias, canonical in aliases.items()
+}
 
 
 # =========================
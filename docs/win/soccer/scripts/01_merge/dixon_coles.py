@@ -0,0 +1,225 @@
+#!/usr/bin/env python3
+# docs/win/soccer/scripts/01_merge/dixon_coles.py
+#
+# Imported by market_model.py for PRICING_MODE "direct". Running it is an
+# on-demand benchmark against the interpolated market_model output and is not
+# part of the daily pipeline:
+#
+#   python docs/win/soccer/scripts/01_merge/dixon_coles.py
+
+import time
+from datetime import datetime
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+
+# =========================
+# PATHS
+# =========================
+
+MODEL_DIR = Path("docs/win/soccer/01_merge/market_model")
+
+ERROR_DIR = Path("docs/win/soccer/errors/01_merge")
+BENCHMARK_LOG = ERROR_DIR / "dixon_coles_benchmark.txt"
+
+# =========================
+# MODEL CONFIG
+# =========================
+
+# Goals per side are capped at MAX_GOALS; the matrix is renormalised so the
+# truncated tail mass (< 1e-6 for realistic lambdas) is spread proportionally.
+MAX_GOALS = 10
+
+DEFAULT_RHO = -0.1
+
+# Effective rho per market. The bundesliga/epl/laliga/ligue1 pricing tables
+# carry rho=-0.1 in their rho column but were built without the low-score
+# correction, so they are reproduced with rho=0. Serie A is true Dixon-Coles.
+LEAGUE_RHO = {
+    "bundesliga": 0.0,
+    "epl": 0.0,
+    "laliga": 0.0,
+    "ligue1": 0.0,
+    "seriea": -0.1,
+}
+
+TOTAL_LINES = [1.5, 2.5, 3.5]
+
+_GOALS = np.arange(MAX_GOALS + 1)
+_LOG_FACTORIAL = np.concatenate([[0.0], np.cumsum(np.log(np.arange(1, MAX_GOALS + 1)))])
+
+
+# =========================
+# SCORE MATRIX
+# =========================
+
+def poisson_pmf(lam):
+    """(n,) lambdas -> (n, MAX_GOALS + 1) Poisson probabilities"""
+    lam = np.asarray(lam, dtype=float)[:, None]
+    with np.errstate(divide="ignore"):
+        log_p = _GOALS * np.log(lam) - lam - _LOG_FACTORIAL
+    return np.exp(log_p)
+
+
+def score_matrix(lambda_home, lambda_away, rho=DEFAULT_RHO):
+    """
+    Batched Dixon-Coles score matrix.
+
+    Returns an (n, G, G) array where [k, i, j] is P(home=i, away=j) for game k.
+    rho may be a scalar or one value per game.
+    """
+    lh = np.asarray(lambda_home, dtype=float)
+    la = np.asarray(lambda_away, dtype=float)
+    rho = np.broadcast_to(np.asarray(rho, dtype=float), lh.shape)
+
+    m = poisson_pmf(lh)[:, :, None] * poisson_pmf(la)[:, None, :]
+
+    m[:, 0, 0] *= 1 - lh * la * rho
+    m[:, 0, 1] *= 1 + lh * rho
+    m[:, 1, 0] *= 1 + la * rho
+    m[:, 1, 1] *= 1 - rho
+
+    m = np.clip(m, 0, None)
+
+    return m / m.sum(axis=(1, 2), keepdims=True)
+
+
+# =========================
+# MARKETS
+# =========================
+
+def total_goals_pmf(m):
+    """(n, G, G) score matrix -> (n, 2G - 1) distribution of total goals"""
+    n, g, _ = m.shape
+    totals = (_GOALS[:g, None] + _GOALS[None, :g]).ravel()
+    out = np.zeros((n, 2 * g - 1))
+    np.add.at(out.T, totals, m.reshape(n, -1).T)
+    return out
+
+
+def over_under(total_pmf, line):
+    """Over / under / push probabilities for a goal line (half or whole)"""
+    goals = np.arange(total_pmf.shape[1])
+    over = total_pmf[:, goals > line].sum(axis=1)
+    under = total_pmf[:, goals < line].sum(axis=1)
+    push = total_pmf[:, goals == line].sum(axis=1)
+    return over, under, push
+
+
+def line_label(line):
+    return f"{line:g}".replace(".", "")
+
+
+def market_probs(m, total_lines=TOTAL_LINES, correct_scores=0):
+    """
+    1X2, over/under for each line, BTTS and (optionally) correct-score
+    probabilities from a batched score matrix. correct_scores=N adds
+    cs_{i}_{j} columns for every scoreline up to N goals per side.
+    """
+    out = {
+        "home_win": np.tril(m, -1).sum(axis=(1, 2)),
+        "draw": np.trace(m, axis1=1, axis2=2),
+        "away_win": np.triu(m, 1).sum(axis=(1, 2)),
+        "btts_yes": m[:, 1:, 1:].sum(axis=(1, 2)),
+    }
+    out["btts_no"] = 1 - out["btts_yes"]
+
+    tot = total_goals_pmf(m)
+
+    for line in total_lines:
+        over, under, push = over_under(tot, line)
+        label = line_label(line)
+        out[f"over{label}"] = over
+        out[f"under{label}"] = under
+        if float(line).is_integer():
+            out[f"push{label}"] = push
+
+    for i in range(correct_scores + 1):
+        for j in range(correct_scores + 1):
+            out[f"cs_{i}_{j}"] = m[:, i, j]
+
+    return pd.DataFrame(out)
+
+
+def price_slate(lambda_home, lambda_away, rho=DEFAULT_RHO, total_lines=TOTAL_LINES, correct_scores=0):
+    """One batched call: lambdas for a whole slate -> DataFrame of market probabilities"""
+    return market_probs(score_matrix(lambda_home, lambda_away, rho), total_lines, correct_scores)
+
+
+def league_rho(markets):
+    """Per-row rho from the market column (falls back to DEFAULT_RHO)"""
+    return np.array([LEAGUE_RHO.get(m, DEFAULT_RHO) for m in markets], dtype=float)
+
+
+# =========================
+# BENCHMARK
+# =========================
+
+BENCH_COLUMNS = [
+    ("home_prob", "home_win"),
+    ("draw_prob", "draw"),
+    ("away_prob", "away_win"),
+    ("over25_prob", "over25"),
+    ("btts_prob", "btts_yes"),
+]
+
+
+def benchmark(df):
+    """Direct evaluation vs interpolated market_model output, per market"""
+    df = df.copy()
+
+    for col in ["lambda_home", "lambda_away"] + [c for c, _ in BENCH_COLUMNS]:
+        df[col] = pd.to_numeric(df[col], errors="coerce")
+
+    df = df.dropna(subset=["lambda_home", "lambda_away"]).reset_index(drop=True)
+
+    start = time.perf_counter()
+    direct = price_slate(df["lambda_home"], df["lambda_away"], league_rho(df["market"]))
+    elapsed = time.perf_counter() - start
+
+    rows = []
+
+    for market, idx in df.groupby("market").groups.items():
+        for model_col, direct_col in BENCH_COLUMNS:
+            err = (df.loc[idx, model_col] - direct.loc[idx, direct_col]).abs()
+            rows.append({
+                "market": market,
+                "prob": model_col,
+                "games": int(err.notna().sum()),
+                "mean_abs_err": err.mean(),
+                "max_abs_err": err.max(),
+            })
+
+    return pd.DataFrame(rows), elapsed
+
+
+def main():
+
+    ERROR_DIR.mkdir(parents=True, exist_ok=True)
+
+    files = sorted(MODEL_DIR.glob("soccer_*.csv"))
+
+    with open(BENCHMARK_LOG, "w", encoding="utf-8") as log:
+
+        log.write("=== DIXON-COLES DIRECT vs INTERPOLATED ===\n")
+        log.write(f"Timestamp: {datetime.utcnow().isoformat()}Z\n")
+        log.write(f"MAX_GOALS={MAX_GOALS} | LEAGUE_RHO={LEAGUE_RHO}\n\n")
+
+        if not files:
+            log.write("No market_model files found.\n")
+            return
+
+        df = pd.concat([pd.read_csv(f) for f in files], ignore_index=True)
+
+        report, elapsed = benchmark(df)
+
+        log.write(f"Files: {len(files)} | Games: {len(df)} | Direct eval: {elapsed * 1000:.2f} ms\n\n")
+        log.write(report.to_string(index=False, float_format=lambda v: f"{v:.5f}"))
+        log.write("\n")
+
+    print(f"Wrote {BENCHMARK_LOG}")
+
+
+if __name__ == "__main__":
+    main()
@@ -4,6 +4,8 @@
 import csv
 from pathlib import Path
 
+from dixon_coles import price_slate, league_rho
+
 MERGE_DIR = Path("docs/win/soccer/01_merge")
 OUT_DIR = MERGE_DIR / "market_model"
 OUT_DIR.mkdir(parents=True, exist_ok=True)
@@ -21,6 +23,10 @@ CONFIG_MAP = {
 # All tables reversed except Serie A
 REVERSED_LEAGUES = {"bundesliga","epl","laliga","ligue1"}
 
+# "interpolate" = k-NN over the precomputed DC table
+# "direct"      = batched Dixon-Coles score matrix (dixon_coles.py)
+PRICING_MODE = "interpolate"
+
 DC_CACHE = {}
 
 
@@ -123,10 +129,24 @@ for merge_file in merge_files:
 
         fieldnames = [f for f in orig_fields if f not in add_fields] + add_fields
 
+        pending = []
+
         for r in reader:
 
             market = r["market"]
 
+            if PRICING_MODE == "direct":
+
+                if market not in CONFIG_MAP:
+                    continue
+
+                try:
+                    pending.append((r, float(r["home_xg"]), float(r["away_xg"])))
+                except:
+                    continue
+
+                continue
+
             table = get_dc_table(market)
 
             if not table:
@@ -157,6 +177,28 @@ for merge_file in merge_files:
             except:
                 continue
 
+        if pending:
+
+            probs = price_slate(
+                [lh for _, lh, _ in pending],
+                [la for _, _, la in pending],
+                league_rho([r["market"] for r, _, _ in pending])
+            )
+
+            for (r, lh, la), p in zip(pending, probs.itertuples(index=False)):
+
+                r.update({
+                    "home_prob": p.home_win,
+                    "draw_prob": p.draw,
+                    "away_prob": p.away_win,
+                    "lambda_home": lh,
+                    "lambda_away": la,
+                    "over25_prob": p.over25,
+                    "btts_prob": p.btts_yes
+                })
+
+                processed_rows.append(r)
+
     if processed_rows:
 
         with open(outfile,"w",newline="",encoding="utf-8") as f:
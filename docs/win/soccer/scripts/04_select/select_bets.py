@@ -1,11 +1,20 @@
 #!/usr/bin/env python3
 # docs/win/soccer/scripts/04_select/select_bets.py
 
+import numpy as np
 import pandas as pd
 from pathlib import Path
 from datetime import datetime
 import traceback
 import re
+import sys
+
+# --- DYNAMIC PATH SETUP ---
+COMMON_DIR = str(Path(__file__).resolve().parents[5] / "scripts")
+if COMMON_DIR not in sys.path:
+    sys.path.append(COMMON_DIR)
+
+from common.kelly_portfolio import size_slate
 
 # =========================
 # PATHS
@@ -31,207 +40,157 @@ DRAW_DOMINANCE_MARGIN = 0.03
 KELLY_FRACTION = 0.25
 
 # =========================
-# HELPERS
+# MARKETS
 # =========================
-def parse_match_time(time_str):
-
-    if pd.isna(time_str):
-        return None
-
-    time_str = str(time_str).strip()
-
-    for fmt in ("%I:%M %p", "%H:%M"):
-        try:
-            return datetime.strptime(time_str, fmt)
-        except Exception:
-            pass
+# Every match is stacked into a long (match, market, side) table and the
+# selection rules run as masks over it.
+
+MARKET_SIDES = {
+    "result": ["home", "draw", "away"],
+    "total": ["over25", "under25"],
+    "btts": ["btts_yes", "btts_no"],
+}
+
+# side -> (probability column, take the complement)
+PROB_SOURCES = {
+    "home": ("home_prob", False),
+    "draw": ("draw_prob", False),
+    "away": ("away_prob", False),
+    "over25": ("over25_prob", False),
+    "under25": ("over25_prob", True),
+    "btts_yes": ("btts_prob", False),
+    "btts_no": ("btts_prob", True),
+}
+
+# btts is priced in 03_edges but has no settlement in 05_results yet
+SELECTED_MARKETS = ["result", "total"]
 
-    return None
-
-
-def calculate_kelly(prob, odds, fraction=0.25):
-
-    if pd.isna(prob) or pd.isna(odds):
-        return 0
-
-    if odds <= 1 or prob <= 0:
-        return 0
-
-    f_star = (odds * prob - 1) / (odds - 1)
-
-    return max(0, f_star * fraction)
+# =========================
+# HELPERS
+# =========================
+def numeric(df, col):
+    if col not in df.columns:
+        return np.full(len(df), np.nan)
+    return pd.to_numeric(df[col], errors="coerce").to_numpy(dtype=float)
 
 
-def get_result_prob(row, side):
-    return row.get(f"{side}_prob")
+def raw(df, col):
+    if col not in df.columns:
+        return np.full(len(df), None, dtype=object)
+    return df[col].to_numpy()
 
 
-def get_total_prob(row, side):
+def parse_match_times(times):
+    """Clock times ("7:30 PM" or "19:30") -> datetimes on 1900-01-01, NaT if unparseable"""
+    text = times.astype("string").str.strip()
 
-    if side == "over25":
-        return row.get("over25_prob")
+    parsed = pd.to_datetime(text, format="%I:%M %p", errors="coerce")
 
-    if side == "under25":
+    return parsed.fillna(pd.to_datetime(text, format="%H:%M", errors="coerce"))
 
-        over_prob = row.get("over25_prob")
 
-        if pd.isna(over_prob):
-            return None
+def kelly_fraction(prob, odds, fraction=KELLY_FRACTION):
+    """Fractional single-bet Kelly; 0 for missing, bad or negative-edge prices"""
+    with np.errstate(divide="ignore", invalid="ignore"):
+        f_star = (odds * prob - 1) / (odds - 1)
 
-        return 1 - over_prob
+    ok = np.isfinite(f_star) & (odds > 1) & (prob > 0)
 
-    return None
+    return np.where(ok, np.maximum(f_star, 0) * fraction, 0.0)
 
 
 # =========================
-# BUILD SELECTION
+# LONG TABLE
 # =========================
-def build_selection(row, market_name, take_bet, edge_pct, prob):
+def long_table(df, markets=SELECTED_MARKETS):
+    """One row per (match, market, side) with its edge, probability and prices"""
+    frames = []
 
-    odds_decimal = row.get(f"{take_bet}_dk_decimal")
-    odds_american = row.get(f"{take_bet}_american")
+    for market_order, market in enumerate(markets):
+        for side_order, side in enumerate(MARKET_SIDES[market]):
 
-    stake = calculate_kelly(prob, odds_decimal, KELLY_FRACTION)
+            prob_col, complement = PROB_SOURCES[side]
+            prob = numeric(df, prob_col)
 
-    if stake <= 0:
-        return None
+            frames.append(pd.DataFrame({
+                "match": np.arange(len(df)),
+                "market_order": market_order,
+                "side_order": side_order,
+                "market_type": market,
+                "take_bet": side,
+                "edge_pct": numeric(df, f"{side}_edge_pct"),
+                "prob": 1 - prob if complement else prob,
+                "odds_decimal": numeric(df, f"{side}_dk_decimal"),
+                "odds_american": raw(df, f"{side}_american"),
+            }))
 
-    return {
-        "league": "Soccer",
-        "market": row.get("market"),
-        "game_date": row.get("match_date"),
-        "match_time": row.get("match_time"),
-        "home_team": row.get("home_team"),
-        "away_team": row.get("away_team"),
-        "game_id": row.get("game_id"),
-        "market_type": market_name,
-        "take_bet": take_bet,
-        "odds_american": odds_american,
-        "odds_decimal": odds_decimal,
-        "edge_pct": edge_pct,
-        "kelly_stake_pct": round(stake * 100, 2),
-        "expected_goals": row.get("expected_total_goals", "")
-    }
+    return pd.concat(frames, ignore_index=True)
 
 
 # =========================
-# RESULT SELECTION
+# SELECTION RULES
 # =========================
-def select_best_result_side(row, columns):
-
-    result_candidates = {}
-
-    for side in ["home", "draw", "away"]:
-
-        edge_col = f"{side}_edge_pct"
-        prob_col = f"{side}_prob"
-
-        if edge_col not in columns or prob_col not in columns:
-            continue
-
-        edge_val = row.get(edge_col)
-        prob_val = row.get(prob_col)
-
-        if pd.isna(edge_val) or pd.isna(prob_val):
-            continue
-
-        if edge_val >= MIN_EDGE_PCT and prob_val >= MIN_PROB:
-            result_candidates[side] = edge_val
-
-    if not result_candidates:
-        return None
-
-    best_side = max(result_candidates, key=result_candidates.get)
-    best_edge = result_candidates[best_side]
-
-    if best_side == "draw":
-
-        all_edges = {
-            side: row.get(f"{side}_edge_pct")
-            for side in ["home", "draw", "away"]
-        }
-
-        sorted_vals = sorted(
-            [v for v in all_edges.values() if not pd.isna(v)],
-            reverse=True
-        )
-
-        second_best = sorted_vals[1] if len(sorted_vals) > 1 else -999
-
-        draw_prob = row.get("draw_prob", 0)
-
-        if (
-            best_edge < DRAW_MIN_EDGE_PCT
-            or pd.isna(draw_prob)
-            or draw_prob < DRAW_MIN_PROB
-            or (best_edge - second_best) < DRAW_DOMINANCE_MARGIN
-        ):
-
-            non_draw = {
-                k: v for k, v in result_candidates.items() if k != "draw"
-            }
-
-            if not non_draw:
-                return None
-
-            best_side = max(non_draw, key=non_draw.get)
-            best_edge = non_draw[best_side]
-
-    prob = get_result_prob(row, best_side)
-
-    if pd.isna(prob):
-        return None
-
-    return build_selection(
-        row=row,
-        market_name="result",
-        take_bet=best_side,
-        edge_pct=best_edge,
-        prob=prob
+def draw_allowed(df):
+    """
+    Per match: the draw may be the result pick only with enough edge and
+    probability and a clear margin over the second-best result edge.
+    """
+    edges = np.column_stack([numeric(df, f"{side}_edge_pct") for side in MARKET_SIDES["result"]])
+
+    ranked = -np.sort(-np.where(np.isnan(edges), -np.inf, edges), axis=1)
+    second_best = np.where((~np.isnan(edges)).sum(axis=1) > 1, ranked[:, 1], -999)
+
+    draw_edge = numeric(df, "draw_edge_pct")
+    draw_prob = numeric(df, "draw_prob")
+
+    return (
+        (draw_edge >= DRAW_MIN_EDGE_PCT)
+        & (draw_prob >= DRAW_MIN_PROB)
+        & (draw_edge - second_best >= DRAW_DOMINANCE_MARGIN)
     )
 
 
-# =========================
-# TOTAL SELECTION
-# =========================
-def select_best_total(row, columns):
-
-    total_candidates = {}
-
-    for side in ["over25", "under25"]:
+def select_slate(df):
+    """Best qualifying side per match and market, with fractional Kelly, in match order"""
+    table = long_table(df)
 
-        edge_col = f"{side}_edge_pct"
+    qualifies = (table["edge_pct"] >= MIN_EDGE_PCT) & (table["prob"] >= MIN_PROB)
 
-        if edge_col not in columns:
-            continue
+    # a draw that fails its extra tests drops out, so the best home/away
+    # side takes the result market instead
+    is_draw = (table["market_type"] == "result") & (table["take_bet"] == "draw")
+    qualifies &= ~is_draw | draw_allowed(df)[table["match"].to_numpy()]
 
-        edge_val = row.get(edge_col)
-        prob_val = get_total_prob(row, side)
-
-        if pd.isna(edge_val) or prob_val is None or pd.isna(prob_val):
-            continue
-
-        if edge_val >= MIN_EDGE_PCT and prob_val >= MIN_PROB:
-            total_candidates[side] = edge_val
-
-    if not total_candidates:
-        return None
-
-    best_total = max(total_candidates, key=total_candidates.get)
-    best_edge = total_candidates[best_total]
+    picks = (
+        table.loc[qualifies]
+        .sort_values(["match", "market_order", "edge_pct", "side_order"], ascending=[True, True, False, True], kind="stable")
+        .drop_duplicates(["match", "market_type"], keep="first")
+    )
 
-    prob = get_total_prob(row, best_total)
+    stake = kelly_fraction(picks["prob"].to_numpy(), picks["odds_decimal"].to_numpy())
 
-    if prob is None or pd.isna(prob):
-        return None
+    picks = picks.loc[stake > 0]
+    match = picks["match"].to_numpy()
 
-    return build_selection(
-        row=row,
-        market_name="total",
-        take_bet=best_total,
-        edge_pct=best_edge,
-        prob=prob
-    )
+    sel_df = pd.DataFrame({
+        "league": "Soccer",
+        "market": raw(df, "market")[match],
+        "game_date": raw(df, "match_date")[match],
+        "match_time": raw(df, "match_time")[match],
+        "home_team": raw(df, "home_team")[match],
+        "away_team": raw(df, "away_team")[match],
+        "game_id": raw(df, "game_id")[match],
+        "market_type": picks["market_type"].to_numpy(),
+        "take_bet": picks["take_bet"].to_numpy(),
+        "odds_american": picks["odds_american"].to_numpy(),
+        "odds_decimal": picks["odds_decimal"].to_numpy(),
+        "edge_pct": picks["edge_pct"].to_numpy(),
+        "kelly_stake_pct": np.round(stake[stake > 0] * 100, 2),
+        "expected_goals": raw(df, "expected_total_goals")[match],
+        "_prob": picks["prob"].to_numpy(),
+    })
+
+    return sel_df
 
 
 # =========================
@@ -254,27 +213,34 @@ def main():
             for input_path in input_files:
 
                 df = pd.read_csv(input_path)
-                columns = set(df.columns)
 
-                selections = []
+                sel_df = select_slate(df)
 
-                for _, row in df.iterrows():
-
-                    r = select_best_result_side(row, columns)
-                    if r:
-                        selections.append(r)
-
-                    t = select_best_total(row, columns)
-                    if t:
-                        selections.append(t)
-
-                if not selections:
+                if sel_df.empty:
                     log.write(f"No plays qualified for {input_path.name}\n")
                     continue
 
-                sel_df = pd.DataFrame(selections)
+                # re-size the whole slate jointly (same-match bets share outcomes)
+                sel_df["kelly_stake_pct"] = np.round(
+                    size_slate(
+                        sel_df["_prob"],
+                        pd.to_numeric(sel_df["odds_decimal"], errors="coerce"),
+                        sel_df["game_id"].astype(str),
+                        sel_df["market_type"],
+                        sel_df["take_bet"],
+                        fraction=KELLY_FRACTION
+                    ) * 100,
+                    2
+                )
+                sel_df = sel_df.drop(columns=["_prob"])
+
+                # sizing never changes which plays qualify; 0 is a valid stake
+                unstaked = int((sel_df["kelly_stake_pct"] <= 0).sum())
+
+                if unstaked:
+                    log.write(f"{unstaked} of {len(sel_df)} plays in {input_path.name} sized at 0\n")
 
-                sel_df["_sort_time"] = sel_df["match_time"].apply(parse_match_time)
+                sel_df["_sort_time"] = parse_match_times(sel_df["match_time"])
 
                 sel_df = sel_df.sort_values(
                     by=["game_date", "_sort_time", "home_team", "away_team", "market_type"],
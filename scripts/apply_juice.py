@@ -0,0 +1,66 @@
+#!/usr/bin/env python3
+# scripts/apply_juice.py
+#
+# Single 02 juice stage for every sport, driven by config/juice_markets.json.
+# Usage: python scripts/apply_juice.py [sport ...]   (default: all sports)
+
+import sys
+import traceback
+from datetime import datetime
+from pathlib import Path
+
+from common.juice_engine import load_config, run_sport
+
+
+def make_logger(path):
+
+    path = Path(path)
+    path.parent.mkdir(parents=True, exist_ok=True)
+
+    with open(path, "w", encoding="utf-8") as f:
+        f.write(f"=== APPLY JUICE START {datetime.utcnow().isoformat()}Z ===\n")
+
+    def log(msg):
+        with open(path, "a", encoding="utf-8") as f:
+            f.write(f"{datetime.utcnow().isoformat()} | {msg}\n")
+
+    return log
+
+
+def main():
+
+    config = load_config()
+
+    sports = sys.argv[1:] or list(config)
+
+    failures = 0
+
+    for sport in sports:
+
+        sport_cfg = config[sport]
+        log = make_logger(sport_cfg["error_log"])
+
+        try:
+            written = run_sport(sport, sport_cfg, log)
+
+            log(f"Total files processed: {written}")
+            log("=== APPLY JUICE END ===")
+
+            print(f"{sport}: processed {written} files.")
+
+        except Exception as e:
+
+            failures += 1
+
+            log("=== ERROR ===")
+            log(str(e))
+            log(traceback.format_exc())
+
+            print(f"{sport}: FAILED ({e})")
+
+    if failures:
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,65 @@
+#!/usr/bin/env python3
+# scripts/build_card.py
+#
+# Daily card stage: ranks the 04_select bets of every sport for a date and
+# stakes them under the caps in config/card.json.
+# Usage: python scripts/build_card.py [YYYY_MM_DD ...]   (default: every date)
+
+import sys
+import traceback
+from datetime import datetime
+from pathlib import Path
+
+from common.daily_card import build_card, load_card_config
+from common.daily_selections import available_dates, load_selections
+
+# =========================
+# PATHS
+# =========================
+OUTPUT_DIR = Path("docs/win/card")
+ERROR_LOG = Path("docs/win/errors/build_card.txt")
+
+
+# =========================
+# MAIN
+# =========================
+def main():
+
+    config = load_card_config()
+
+    OUTPUT_DIR.mkdir(parents=True, exist_ok=True)
+    ERROR_LOG.parent.mkdir(parents=True, exist_ok=True)
+
+    with open(ERROR_LOG, "w", encoding="utf-8") as log:
+
+        log.write(f"=== BUILD CARD RUN: {datetime.utcnow().isoformat()}Z ===\n")
+
+        try:
+
+            dates = sys.argv[1:] or available_dates()
+
+            for date_str in dates:
+
+                bets = load_selections(date_str, float(config.get("kelly_fraction", 0.25)))
+
+                if bets.empty:
+                    log.write(f"{date_str}: no selections\n")
+                    continue
+
+                card = build_card(bets, config)
+
+                out_path = OUTPUT_DIR / f"{date_str}_card.csv"
+                card.to_csv(out_path, index=False)
+
+                log.write(
+                    f"{date_str}: {len(card)} of {len(bets)} bets, "
+                    f"{card['stake_pct'].sum():.2f}% of bankroll -> {out_path.name}\n"
+                )
+
+        except Exception as e:
+            log.write(f"\nCRITICAL ERROR: {str(e)}\n{traceback.format_exc()}\n")
+            sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
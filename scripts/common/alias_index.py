@@ -0,0 +1,131 @@
+# scripts/common/alias_index.py
+
+import hashlib
+import json
+from pathlib import Path
+
+import pandas as pd
+
+# =========================
+# ALIAS INDEX
+# =========================
+#
+# One lookup of team aliases for every sport, compiled from the team maps:
+#
+#   {market: {alias (stripped, lower case): canonical team}}
+#
+# keyed by the maps' own market / league column in lower case ("nba",
+# "ncaab", "nhl", "epl", ...), plus "soccer" holding every soccer league.
+# The compiled index is cached in mappings/alias_index.json together with a
+# hash of each map file, and is rebuilt whenever a map changes.
+#
+# Intake normalizes names with it, so selection and score files are written
+# canonical; the results stage only checks them.
+
+MAP_FILES = {
+    "basketball_nba": Path("mappings/basketball/team_map_nba.csv"),
+    "basketball_ncaab": Path("mappings/basketball/team_map_ncaab.csv"),
+    "hockey": Path("mappings/hockey/team_map_hockey.csv"),
+    "soccer": Path("mappings/soccer/team_map_soccer.csv"),
+}
+
+INDEX_FILE = Path("mappings/alias_index.json")
+
+# map files whose markets are also gathered under one sport key
+SPORT_GROUPS = {"soccer": "soccer"}
+
+
+# =========================
+# BUILD
+# =========================
+
+def map_hashes(map_files=MAP_FILES):
+    return {
+        str(path): hashlib.sha1(path.read_bytes()).hexdigest() if path.exists() else ""
+        for path in map_files.values()
+    }
+
+
+def build_alias_index(map_files=MAP_FILES):
+    """{market: {alias: canonical}} from the team maps (later rows win)"""
+    index = {}
+
+    for name, path in map_files.items():
+        if not path.exists():
+            continue
+
+        df = pd.read_csv(path, dtype=str, keep_default_na=False)
+        market_col = "league" if "league" in df.columns else "market"
+
+        market = df[market_col].str.strip().str.lower()
+        alias = df["alias"].str.strip().str.lower()
+        canonical = df["canonical_team"].str.strip()
+
+        # header lines repeated inside a map are not aliases
+        header = market.isin(["league", "market"])
+        keep = (market != "") & (alias != "") & (canonical != "") & ~header
+
+        group = SPORT_GROUPS.get(name)
+
+        for m, a, c in zip(market[keep], alias[keep], canonical[keep]):
+            index.setdefault(m, {})[a] = c
+            if group:
+                index.setdefault(group, {})[a] = c
+
+    return index
+
+
+def load_alias_index(path=INDEX_FILE, map_files=MAP_FILES):
+    """The compiled index, rebuilt and saved when a team map changed"""
+    path = Path(path)
+    sources = map_hashes(map_files)
+
+    if path.exists():
+        with open(path, "r", encoding="utf-8") as f:
+            cached = json.load(f)
+
+        if cached.get("sources") == sources:
+            return cached["index"]
+
+    index = build_alias_index(map_files)
+
+    path.parent.mkdir(parents=True, exist_ok=True)
+    with open(path, "w", encoding="utf-8") as f:
+        json.dump({"sources": sources, "index": index}, f, indent=1, sort_keys=True)
+
+    return index
+
+
+# =========================
+# LOOKUP
+# =========================
+
+def market_aliases(index, market):
+    """{alias: canonical} of one market ({} when unknown)"""
+    return index.get(str(market or "").strip().lower(), {})
+
+
+def canonical_team(aliases, team):
+    """Canonical name of team, or team itself when it is not in the map"""
+    if team is None or pd.isna(team):
+        return team
+
+    return aliases.get(str(team).strip().lower(), team)
+
+
+def name_status(names, aliases):
+    """
+    Per name: "ok" (already canonical), "alias" (a known alias of another
+    name) or "unmapped"; blanks are "ok".
+    """
+    text = pd.Series(names, dtype=object)
+    blank = text.isna() | (text.astype(str).str.strip() == "")
+
+    stripped = text.astype(str).str.strip()
+    mapped = stripped.str.lower().map(aliases)
+
+    status = pd.Series("unmapped", index=text.index, dtype=object)
+    status[mapped.notna()] = "alias"
+    status[(mapped == stripped) | stripped.isin(set(aliases.values())) | blank] = "ok"
+
+    return status
@@ -0,0 +1,212 @@
+# scripts/common/calibration.py
+
+import numpy as np
+import pandas as pd
+
+from common.results_enrichment import EDGE_LABELS, num_col
+
+# =========================
+# CALIBRATION
+# =========================
+#
+# How well the model probabilities behind the graded bets match what
+# happened. Every decided bet (Win / Loss) is given the model probability of
+# the side taken and binned twice, by that probability and by its edge:
+#
+#   prob curve   10 bins of width 0.1 over the predicted probability
+#   edge curve   the results edge buckets (EDGE_LABELS, "none" without edge)
+#
+# Each bin keeps sums (bets, priced bets, wins, probability, squared error,
+# log loss) per game_date, so a run only rebuilds the dates whose graded rows
+# changed and the curves are roll-ups of that small grain:
+#
+#   Hit_Rate   wins / bets (Priced_Hit_Rate: of the bets with a probability)
+#   Avg_Prob   mean predicted probability of the priced bets
+#   Gap        Avg_Prob - Priced_Hit_Rate (above 0: the model is overconfident)
+#   Brier      mean (p - won)^2
+#   Log_Loss   mean -log(p if won else 1 - p), p clipped to [1e-6, 1 - 1e-6]
+#
+# The predicted probability is the model's own column where the graded file
+# carries it (basketball home_prob / away_prob, 1 / fair_over, 1 / fair_under)
+# and is otherwise recovered from the edge and the price the way the league's
+# edge was computed: basketball and hockey edges are model minus book
+# probability, soccer edges are model probability times book decimal minus 1.
+
+EDGE_KIND = {
+    "NBA": "prob_diff",
+    "NCAAB": "prob_diff",
+    "NHL": "prob_diff",
+    "SOCCER": "ev",
+}
+
+PROB_EDGES = np.linspace(0, 1, 11)
+PROB_LABELS = [f"{lo:.1f}_to_{hi:.1f}" for lo, hi in zip(PROB_EDGES[:-1], PROB_EDGES[1:])]
+
+NONE = "none"
+EPS = 1e-6
+
+GRAIN_KEYS = ["league", "market_type", "curve", "bin", "game_date"]
+SUM_COLUMNS = ["Bets", "Priced", "Wins", "_p_sum", "_p_wins", "_brier_sum", "_log_loss_sum"]
+CURVE_COLUMNS = ["Bets", "Priced", "Hit_Rate", "Priced_Hit_Rate", "Avg_Prob", "Gap", "Brier", "Log_Loss"]
+
+
+# =========================
+# PREDICTED PROBABILITY
+# =========================
+
+def predicted_prob(work, league):
+    """Model probability of the side taken, for enriched picks (NaN when unknown)"""
+    edge = work["selected_edge"].to_numpy(dtype=float)
+    decimal = work["bet_decimal"].to_numpy(dtype=float)
+
+    with np.errstate(divide="ignore", invalid="ignore"):
+        if EDGE_KIND.get(league) == "ev":
+            derived = (1 + edge) / decimal
+        else:
+            derived = edge + 1 / decimal
+
+        market_type = work["market_type"].astype(str).str.strip().str.lower().to_numpy()
+        side = np.where(work["total_side"].to_numpy(dtype=object) != "", work["total_side"], work["side_group"])
+
+        direct = np.select(
+            [
+                (market_type == "moneyline") & (side == "Home"),
+                (market_type == "moneyline") & (side == "Away"),
+                (market_type == "total") & (side == "Over"),
+                (market_type == "total") & (side == "Under"),
+            ],
+            [
+                num_col(work, "home_prob"),
+                num_col(work, "away_prob"),
+                1 / num_col(work, "fair_over"),
+                1 / num_col(work, "fair_under"),
+            ],
+            np.nan,
+        )
+
+    prob = np.where(np.isnan(direct), derived, direct)
+    return np.where((prob > 0) & (prob < 1), prob, np.nan)
+
+
+def prob_bin(prob):
+    idx = np.clip(np.floor(np.nan_to_num(prob) * 10).astype(int), 0, 9)
+    return np.where(np.isnan(prob), NONE, np.array(PROB_LABELS, dtype=object)[idx])
+
+
+# =========================
+# GRAIN
+# =========================
+
+def calibration_grain(work, league):
+    """Per date, market and bin sums of one league's enriched picks"""
+    result = work["bet_result"].astype(str).str.strip().str.title()
+    decided = result.isin(["Win", "Loss"]).to_numpy()
+
+    if not decided.any():
+        return pd.DataFrame(columns=GRAIN_KEYS + SUM_COLUMNS)
+
+    work = work.loc[decided]
+    won = (result.loc[decided] == "Win").to_numpy().astype(float)
+
+    prob = predicted_prob(work, league)
+    priced = ~np.isnan(prob)
+    p = np.clip(np.nan_to_num(prob), EPS, 1 - EPS)
+
+    rows = pd.DataFrame({
+        "league": league,
+        "market_type": work["market_type"].astype(str).str.strip().str.lower().to_numpy(),
+        "game_date": work["game_date"].astype(str).to_numpy(),
+        "Bets": 1,
+        "Priced": priced.astype(int),
+        "Wins": won.astype(int),
+        "_p_sum": np.where(priced, prob, 0.0),
+        "_p_wins": np.where(priced, won, 0.0),
+        "_brier_sum": np.where(priced, (np.nan_to_num(prob) - won) ** 2, 0.0),
+        "_log_loss_sum": np.where(priced, -(won * np.log(p) + (1 - won) * np.log(1 - p)), 0.0),
+    })
+
+    edge_bin = work["edge_bucket"].replace("", NONE).to_numpy(dtype=object)
+
+    curves = [
+        rows.assign(curve="prob", bin=prob_bin(prob)).loc[priced],
+        rows.assign(curve="edge", bin=edge_bin),
+    ]
+
+    grain = pd.concat(curves, ignore_index=True)
+    grain = grain.groupby(GRAIN_KEYS, sort=False)[SUM_COLUMNS].sum().reset_index()
+
+    # stored sums stay the same whichever run re-binned the date
+    return grain.round({c: 10 for c in SUM_COLUMNS})
+
+
+def date_hashes(df):
+    """{game_date: hash of that date's rows} of a graded master"""
+    if df.empty or "game_date" not in df.columns:
+        return {}
+
+    row_hash = pd.util.hash_pandas_object(df, index=False)
+    dates = df["game_date"].astype(str)
+
+    # order-independent within a date, so an upsert that reorders rows is not a change
+    sums = row_hash.groupby(dates.to_numpy()).sum()
+    return {d: format(int(h), "x") for d, h in sums.items()}
+
+
+# =========================
+# CURVES
+# =========================
+
+def finish(sums):
+    out = sums.copy()
+
+    bets = out["Bets"].where(out["Bets"] > 0)
+    priced = out["Priced"].where(out["Priced"] > 0)
+
+    out["Hit_Rate"] = (out["Wins"] / bets).round(4)
+    out["Priced_Hit_Rate"] = (out["_p_wins"] / priced).round(4)
+    out["Avg_Prob"] = (out["_p_sum"] / priced).round(4)
+    out["Gap"] = (out["Avg_Prob"] - out["Priced_Hit_Rate"]).round(4)
+    out["Brier"] = (out["_brier_sum"] / priced).round(4)
+    out["Log_Loss"] = (out["_log_loss_sum"] / priced).round(4)
+
+    return out
+
+
+def bin_rank(curve, bins):
+    """Position of each bin in its curve's natural order"""
+    prob_rank = {b: i for i, b in enumerate(PROB_LABELS + [NONE])}
+    edge_rank = {b: i for i, b in enumerate(EDGE_LABELS + [NONE])}
+
+    return np.where(curve == "prob", bins.map(prob_rank), bins.map(edge_rank))
+
+
+def reliability_curves(grain):
+    """Hit rate against predicted probability, per league, market, curve and bin"""
+    if grain.empty:
+        return pd.DataFrame(columns=["league", "market_type", "curve", "bin"] + CURVE_COLUMNS)
+
+    keys = ["league", "market_type", "curve", "bin"]
+    sums = grain.groupby(keys, sort=False)[SUM_COLUMNS].sum().reset_index()
+
+    out = finish(sums)
+    out["_order"] = bin_rank(out["curve"], out["bin"])
+    out = out.sort_values(["league", "market_type", "curve", "_order"], kind="mergesort")
+
+    return out[keys + CURVE_COLUMNS].reset_index(drop=True)
+
+
+def calibration_summary(grain):
+    """Bets, hit rate, Brier and log loss per league and market (plus ALL)"""
+    if grain.empty:
+        return pd.DataFrame(columns=["league", "market_type"] + CURVE_COLUMNS)
+
+    # the edge curve holds every decided bet exactly once
+    edge = grain.loc[grain["curve"] == "edge"]
+
+    by_market = edge.groupby(["league", "market_type"])[SUM_COLUMNS].sum().reset_index()
+    by_league = edge.groupby(["league"])[SUM_COLUMNS].sum().reset_index().assign(market_type="ALL")
+
+    out = finish(pd.concat([by_market, by_league], ignore_index=True))
+    out = out.sort_values(["league", "market_type"], kind="mergesort")
+
+    return out[["league", "market_type"] + CURVE_COLUMNS].reset_index(drop=True)
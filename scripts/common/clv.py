@@ -0,0 +1,233 @@
+# scripts/common/clv.py
+
+from zoneinfo import ZoneInfo
+
+import numpy as np
+import pandas as pd
+
+from common.juice_engine import american_to_decimal
+
+# =========================
+# CLOSING LINE VALUE
+# =========================
+#
+# Sportsbook intake files are overwritten on every run, so line history only
+# exists if it is captured as it arrives. Each intake snapshot is flattened
+# to one row per (game, market, side) with the time it was observed; a
+# bet's close is the last snapshot of its side observed before the game
+# started. CLV is reported two ways, both positive when the bet beat the
+# close:
+#
+#   clv_cents  price difference on the continuous American scale
+#              (-110 -> -10, +120 -> +20, so -110 vs -130 is 20 cents)
+#   clv_prob   closing implied probability - taken implied probability
+#
+# and line_clv gives the points gained on spreads / puck lines / totals when
+# the number itself moved.
+#
+# Intake game times ("7:10 PM") are US Eastern wall clock while the runner's
+# clock is UTC, so every timestamp is compared tz-aware in LOCAL_TZ.
+
+# sport -> (date column, time column, [(market_type, side, line column, odds column)])
+SNAPSHOT_SIDES = {
+    "basketball": ("game_date", "game_time", [
+        ("moneyline", "home", None, "home_dk_moneyline_american"),
+        ("moneyline", "away", None, "away_dk_moneyline_american"),
+        ("spread", "home", "home_spread", "home_dk_spread_american"),
+        ("spread", "away", "away_spread", "away_dk_spread_american"),
+        ("total", "over", "total", "dk_total_over_american"),
+        ("total", "under", "total", "dk_total_under_american"),
+    ]),
+    "hockey": ("game_date", "game_time", [
+        ("moneyline", "home", None, "home_dk_moneyline_american"),
+        ("moneyline", "away", None, "away_dk_moneyline_american"),
+        ("puck_line", "home", "home_puck_line", "home_dk_puck_line_american"),
+        ("puck_line", "away", "away_puck_line", "away_dk_puck_line_american"),
+        ("total", "over", "total", "dk_total_over_american"),
+        ("total", "under", "total", "dk_total_under_american"),
+    ]),
+    "soccer": ("match_date", "match_time", [
+        ("result", "home", None, "dk_home_american"),
+        ("result", "draw", None, "dk_draw_american"),
+        ("result", "away", None, "dk_away_american"),
+    ]),
+}
+
+LOCAL_TZ = ZoneInfo("America/New_York")
+
+SIDE_KEY = ["sport", "game_date", "home_team", "away_team", "market_type", "bet_side"]
+
+SNAPSHOT_COLUMNS = SIDE_KEY + ["game_time", "line", "odds_decimal", "observed_at"]
+
+# taken price bands on the cents scale: -200 or shorter, -199..-130,
+# -129..+100, +101..+150, +151 or longer
+BAND_EDGES = [-np.inf, -100, -30, 0, 50, np.inf]
+BAND_LABELS = ["<=-200", "-199..-130", "-129..+100", "+101..+150", ">=+151"]
+
+
+# =========================
+# SNAPSHOTS
+# =========================
+
+def snapshot_long(df, sport, observed_at):
+    """One intake sportsbook file -> one row per (game, market, side)"""
+    date_col, time_col, sides = SNAPSHOT_SIDES[sport]
+
+    frames = []
+
+    for market_type, side, line_col, odds_col in sides:
+        if odds_col not in df.columns:
+            continue
+
+        frames.append(pd.DataFrame({
+            "sport": sport,
+            "game_date": df[date_col].astype(str),
+            "home_team": df["home_team"].astype(str),
+            "away_team": df["away_team"].astype(str),
+            "market_type": market_type,
+            "bet_side": side,
+            "game_time": df[time_col].astype(str) if time_col in df.columns else "",
+            "line": pd.to_numeric(df[line_col], errors="coerce") if line_col in df.columns else np.nan,
+            "odds_decimal": american_to_decimal(df[odds_col].to_numpy()),
+            "observed_at": observed_at,
+        }))
+
+    if not frames:
+        return pd.DataFrame(columns=SNAPSHOT_COLUMNS)
+
+    out = pd.concat(frames, ignore_index=True)
+
+    return out.loc[out["odds_decimal"].notna(), SNAPSHOT_COLUMNS]
+
+
+def changed_quotes(new, known):
+    """Rows of new whose line or price differs from the last known quote of that side"""
+    if known is None or known.empty:
+        return new
+
+    last = (
+        known.assign(_observed=local_times(known["observed_at"]).array)
+        .sort_values("_observed", kind="stable")
+        .drop_duplicates(SIDE_KEY, keep="last")
+    )
+
+    merged = new.merge(last[SIDE_KEY + ["line", "odds_decimal"]], on=SIDE_KEY, how="left", suffixes=("", "_last"))
+
+    same_line = (merged["line"] == merged["line_last"]) | (merged["line"].isna() & merged["line_last"].isna())
+    same_price = np.isclose(merged["odds_decimal"], merged["odds_decimal_last"])
+
+    return new.loc[~(same_line & same_price).to_numpy()]
+
+
+def start_times(game_date, game_time):
+    """Eastern start datetimes from "2026_03_09" + "7:00 PM" (NaT if unparseable)"""
+    text = pd.Series(game_date, dtype="string") + " " + pd.Series(game_time, dtype="string").str.strip()
+    naive = pd.to_datetime(text, format="%Y_%m_%d %I:%M %p", errors="coerce")
+    return naive.dt.tz_localize(LOCAL_TZ, ambiguous="NaT", nonexistent="NaT")
+
+
+def local_times(values):
+    """Stored timestamps as LOCAL_TZ datetimes; naive ones are runner-clock UTC"""
+    stamps = pd.to_datetime(pd.Series(values, dtype="string"), format="ISO8601", utc=True, errors="coerce")
+    return stamps.dt.tz_convert(LOCAL_TZ)
+
+
+# =========================
+# CLOSE + CLV
+# =========================
+
+def cents(decimal):
+    """Decimal odds on the continuous American cents scale"""
+    d = np.asarray(decimal, dtype=float)
+
+    with np.errstate(divide="ignore", invalid="ignore"):
+        return np.where(d >= 2, (d - 2) * 100, 100 - 100 / (d - 1))
+
+
+def closing_quotes(bets, snapshots):
+    """
+    (close_line, close_decimal, close_at, start_time) per bet: the side's
+    last quote observed before its game started (latest quote if the start
+    time is unknown).
+    """
+    quotes = snapshots.copy()
+    quotes["observed_at"] = local_times(quotes["observed_at"]).array
+    quotes["start_time"] = start_times(quotes["game_date"], quotes["game_time"]).array
+
+    quotes = quotes.loc[quotes["start_time"].isna() | (quotes["observed_at"] <= quotes["start_time"])]
+
+    close = (
+        quotes.sort_values("observed_at", kind="stable")
+        .drop_duplicates(SIDE_KEY, keep="last")
+        .rename(columns={"line": "close_line", "odds_decimal": "close_decimal", "observed_at": "close_at"})
+    )
+
+    starts = snapshots.assign(start_time=start_times(snapshots["game_date"], snapshots["game_time"]).array)
+    starts = starts.drop_duplicates(SIDE_KEY, keep="last")[SIDE_KEY + ["start_time"]]
+
+    keys = bets[SIDE_KEY].astype(str)
+
+    out = keys.merge(close[SIDE_KEY + ["close_line", "close_decimal", "close_at"]], on=SIDE_KEY, how="left")
+    out = out.merge(starts, on=SIDE_KEY, how="left")
+
+    return out[["close_line", "close_decimal", "close_at", "start_time"]].set_index(bets.index)
+
+
+def clv_metrics(ledger):
+    """clv_cents, clv_prob and line_clv from taken / close columns"""
+    taken = ledger["taken_decimal"].to_numpy(dtype=float)
+    close = ledger["close_decimal"].to_numpy(dtype=float)
+
+    ledger["clv_cents"] = np.round(cents(taken) - cents(close), 2)
+
+    with np.errstate(divide="ignore", invalid="ignore"):
+        ledger["clv_prob"] = np.round(1 / close - 1 / taken, 4)
+
+    moved = ledger["close_line"] - ledger["taken_line"]
+    side = ledger["bet_side"].astype(str)
+
+    ledger["line_clv"] = np.where(
+        ledger["market_type"].isin(["spread", "puck_line"]),
+        -moved,
+        np.where(side.str.startswith("over"), moved, np.where(side.str.startswith("under"), -moved, np.nan)),
+    )
+
+    return ledger
+
+
+# =========================
+# SUMMARY
+# =========================
+
+def odds_band(decimal):
+    return pd.cut(cents(decimal), BAND_EDGES, labels=BAND_LABELS)
+
+
+def summarize(ledger):
+    """CLV by sport, market and taken-price band over bets with a close"""
+    done = ledger.loc[ledger["close_decimal"].notna()].copy()
+
+    if done.empty:
+        return pd.DataFrame(columns=[
+            "sport", "market_type", "band", "bets", "avg_clv_cents",
+            "avg_clv_prob", "beat_close_pct", "avg_line_clv",
+        ])
+
+    done["band"] = odds_band(done["taken_decimal"])
+    done["beat"] = done["clv_prob"] > 0
+
+    summary = (
+        done.groupby(["sport", "market_type", "band"], observed=True)
+        .agg(
+            bets=("clv_prob", "size"),
+            avg_clv_cents=("clv_cents", "mean"),
+            avg_clv_prob=("clv_prob", "mean"),
+            beat_close_pct=("beat", "mean"),
+            avg_line_clv=("line_clv", "mean"),
+        )
+        .reset_index()
+    )
+
+    summary["beat_close_pct"] *= 100
+
+    return summary.round(4)
@@ -0,0 +1,220 @@
+# scripts/common/correlated_selection.py
+
+from itertools import product
+
+import numpy as np
+import pandas as pd
+
+from common.rule_engine import RULES_PATH, load_rule_config
+
+# =========================
+# CORRELATION-AWARE SELECTION
+# =========================
+#
+# The rule stages pick bets market by market, so one game can end up with a
+# favourite's moneyline and spread (nearly the same bet twice) next to an
+# unrelated total. This pass simulates every game on a slate at once from the
+# model's projections -- home/away points as a bivariate normal on margin and
+# total (basketball), or independent Poisson goals with a coin-flip overtime
+# (hockey) -- prices every candidate bet on the same draws, and keeps the
+# subset of each game's candidates with the best mean - risk_aversion *
+# covariance of the combined unit-stake profit. Only the covariance between
+# different bets is charged, not each bet's own variance, so a lone bet is
+# kept exactly when its simulated EV is positive and correlated bets only
+# survive together when the extra edge pays for the shared risk. The empty
+# subset scores 0, so a game can lose every candidate.
+#
+# Settings live in config/selection_rules.json ("correlation"); mode "rules"
+# (the default) turns the pass off and keeps every bet the rule stage
+# selected, "correlated" turns it on.
+
+N_SIMS = 20000
+SEED = 20240301
+RISK_AVERSION = 0.05
+MAX_CANDIDATES = 8
+
+
+def load_settings(league, path=RULES_PATH):
+    """Correlation settings for one league, or None when the mode is off"""
+    cfg = load_rule_config(path).get("correlation", {})
+
+    if cfg.get("mode", "rules") != "correlated" or league not in cfg.get("models", {}):
+        return None
+
+    return {
+        "model": cfg["models"][league],
+        "n_sims": int(cfg.get("n_sims", N_SIMS)),
+        "seed": int(cfg.get("seed", SEED)),
+        "risk_aversion": float(cfg.get("risk_aversion", RISK_AVERSION)),
+    }
+
+
+# =========================
+# SIMULATION
+# =========================
+
+def simulate_games(home_mean, away_mean, model, n_sims=N_SIMS, seed=SEED, total_mean=None):
+    """
+    (margin, total) draws, each (n_sims, n_games), home perspective.
+
+    model: {"type": "normal", "margin_sd", "total_sd", "rho"} or {"type": "poisson"}
+    """
+    home_mean = np.asarray(home_mean, dtype=float)
+    away_mean = np.asarray(away_mean, dtype=float)
+    n = len(home_mean)
+
+    rng = np.random.default_rng(seed)
+
+    if model["type"] == "poisson":
+        home = rng.poisson(np.clip(home_mean, 0, None), size=(n_sims, n)).astype(float)
+        away = rng.poisson(np.clip(away_mean, 0, None), size=(n_sims, n)).astype(float)
+
+        # regulation ties: one more goal to a coin-flip overtime winner
+        tied = home == away
+        home_ot = rng.random((n_sims, n)) < 0.5
+        home += tied & home_ot
+        away += tied & ~home_ot
+
+        return home - away, home + away
+
+    if total_mean is None:
+        total_mean = home_mean + away_mean
+    total_mean = np.asarray(total_mean, dtype=float)
+
+    rho = float(model.get("rho", 0.0))
+    z1 = rng.standard_normal((n_sims, n))
+    z2 = rho * z1 + np.sqrt(1 - rho ** 2) * rng.standard_normal((n_sims, n))
+
+    margin = (home_mean - away_mean) + float(model["margin_sd"]) * z1
+    total = total_mean + float(model["total_sd"]) * z2
+
+    return margin, total
+
+
+def bet_profits(margin, total, game_idx, market, side, line, decimal):
+    """
+    (n_sims, n_bets) per-unit profit: decimal - 1 on a win, -1 on a loss,
+    0 on a push. market: moneyline | spread | puck_line | total.
+    """
+    market = np.asarray(market).astype(str)
+    side = np.asarray(side).astype(str)
+    line = np.asarray(line, dtype=float)
+    decimal = np.asarray(decimal, dtype=float)
+
+    m = margin[:, game_idx]
+    t = total[:, game_idx]
+
+    side_margin = np.where(side == "away", -m, m)
+
+    is_total = market == "total"
+    is_ml = market == "moneyline"
+
+    line = np.where(np.isnan(line) & is_ml, 0.0, line)
+
+    result = np.where(
+        is_total,
+        np.where(side == "under", line - t, t - line),
+        side_margin + line,
+    )
+
+    return np.where(result > 0, decimal - 1, np.where(result < 0, -1.0, 0.0))
+
+
+# =========================
+# SUBSET SCORING
+# =========================
+
+def subset_matrix(k):
+    """(2^k, k) 0/1 rows: every subset of k candidates, the empty one first"""
+    return np.array(list(product((0, 1), repeat=k)), dtype=float)
+
+
+def best_subsets(profits, groups, risk_aversion=RISK_AVERSION):
+    """
+    Keep mask over bets: per group, the subset with the highest mean -
+    risk_aversion * (sum of covariances between its bets) of summed profit.
+    The empty subset scores 0 and wins ties. Groups with the same number of
+    candidates are scored together in one batched product.
+    """
+    n_bets = profits.shape[1]
+    keep = np.zeros(n_bets, dtype=bool)
+
+    _, group_idx = np.unique(np.asarray(groups).astype(str), return_inverse=True)
+    members = pd.Series(np.arange(n_bets)).groupby(group_idx).apply(list).tolist()
+
+    by_size = {}
+    for idx in members:
+        if len(idx) > MAX_CANDIDATES:
+            order = np.argsort(-profits[:, idx].mean(axis=0), kind="stable")[:MAX_CANDIDATES]
+            idx = [idx[i] for i in sorted(order)]
+        by_size.setdefault(len(idx), []).append(idx)
+
+    for k, sets in by_size.items():
+        idx = np.array(sets)                       # (g, k)
+        S = subset_matrix(k)                       # (s, k)
+
+        p = profits[:, idx]                        # (n_sims, g, k)
+        combined = np.einsum("ngk,sk->ngs", p, S)  # (n_sims, g, s)
+
+        # variance of the sum minus the bets' own variances: cross terms only
+        own = np.einsum("gk,sk->gs", p.var(axis=0), S)
+        score = combined.mean(axis=0) - risk_aversion * (combined.var(axis=0) - own)
+        best = S[np.argmax(score, axis=1)].astype(bool)   # (g, k)
+
+        keep[idx[best]] = True
+
+    return keep
+
+
+def select_correlated(bets, model, n_sims=N_SIMS, seed=SEED, risk_aversion=RISK_AVERSION):
+    """
+    Keep mask for a slate of candidate bets.
+
+    bets columns: game_id, home_mean, away_mean, (total_mean), market,
+    side, line, decimal. Bets with missing projections or prices are kept
+    as they are.
+    """
+    n = len(bets)
+    keep = np.ones(n, dtype=bool)
+
+    decimal = pd.to_numeric(bets["decimal"], errors="coerce").to_numpy(dtype=float)
+    home_mean = pd.to_numeric(bets["home_mean"], errors="coerce").to_numpy(dtype=float)
+    away_mean = pd.to_numeric(bets["away_mean"], errors="coerce").to_numpy(dtype=float)
+
+    usable = np.isfinite(decimal) & (decimal > 1) & np.isfinite(home_mean) & np.isfinite(away_mean)
+
+    if not usable.any():
+        return keep
+
+    sub = bets.loc[usable]
+
+    _, game_idx = np.unique(sub["game_id"].astype(str).to_numpy(), return_inverse=True)
+    first = pd.Series(np.arange(len(sub))).groupby(game_idx).first().to_numpy()
+
+    total_mean = None
+    if "total_mean" in sub.columns:
+        total_mean = pd.to_numeric(sub["total_mean"], errors="coerce").to_numpy(dtype=float)[first]
+        total_mean = np.where(np.isfinite(total_mean), total_mean, home_mean[usable][first] + away_mean[usable][first])
+
+    margin, total = simulate_games(
+        home_mean[usable][first],
+        away_mean[usable][first],
+        model,
+        n_sims=n_sims,
+        seed=seed,
+        total_mean=total_mean,
+    )
+
+    profits = bet_profits(
+        margin,
+        total,
+        game_idx,
+        sub["market"].to_numpy(),
+        sub["side"].to_numpy(),
+        pd.to_numeric(sub["line"], errors="coerce").to_numpy(dtype=float),
+        decimal[usable],
+    )
+
+    keep[np.flatnonzero(usable)] = best_subsets(profits, game_idx, risk_aversion)
+
+    return keep
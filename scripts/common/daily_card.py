@@ -0,0 +1,155 @@
+# scripts/common/daily_card.py
+
+import json
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+
+# =========================
+# DAILY CARD
+# =========================
+#
+# Turns every sport's selected bets for a date into one ranked card. Bets are
+# normalised to a common frame (sport, market_type, game_key, odds_decimal,
+# edge, ev, stake), ranked by config "rank_by" (ev | edge | kelly), then
+# staked in rank order: each bet gets its wanted Kelly stake cut down to
+# whatever is left under the per-bet, per-game, per-sport, per-market and
+# total bankroll caps. Bets whose stake would fall below min_stake_pct are
+# left off. The whole pass is one sort plus a single sweep, so it is cheap
+# enough to rebuild on every odds snapshot.
+#
+# Settings live in config/card.json; caps are fractions of bankroll and a
+# sport or market missing from its cap map is uncapped.
+
+CARD_CONFIG = Path("config/card.json")
+
+RANK_COLUMNS = {
+    "ev": "ev",
+    "edge": "edge",
+    "kelly": "stake",
+}
+
+CARD_COLUMNS = [
+    "card_rank", "game_date", "sport", "league", "game_id", "away_team", "home_team",
+    "market_type", "bet_side", "line", "odds_decimal", "edge", "ev",
+    "kelly_pct", "stake_pct", "stake_amount", "capped_by",
+]
+
+
+def load_card_config(path=CARD_CONFIG):
+    with open(path, "r", encoding="utf-8") as f:
+        return json.load(f)
+
+
+def rank_bets(bets, rank_by="ev"):
+    """Candidates best first by the ranking column (ties -> higher ev)"""
+    if rank_by not in RANK_COLUMNS:
+        raise ValueError(f"Unknown card ranking: {rank_by}")
+
+    key = RANK_COLUMNS[rank_by]
+
+    return bets.sort_values([key, "ev"], ascending=False, kind="stable", na_position="last")
+
+
+def allocate(bets, caps, max_bets=None, min_stake=0.0):
+    """
+    (stakes, capped_by) for ranked bets, greedily in order.
+
+    Each bet takes min(wanted stake, bet cap, remaining game / sport / market /
+    total room); capped_by names the cap that bound ("" when the full stake fit).
+    """
+    n = len(bets)
+    stakes = np.zeros(n)
+    capped_by = np.full(n, "", dtype=object)
+
+    want = bets["stake"].to_numpy(dtype=float)
+    sport = bets["sport"].to_numpy()
+    market = bets["market_type"].to_numpy()
+    game = bets["game_key"].to_numpy()
+
+    bet_cap = float(caps.get("bet", np.inf))
+    game_cap = float(caps.get("game", np.inf))
+    sport_caps = caps.get("sport", {})
+    market_caps = caps.get("market", {})
+
+    room_total = float(caps.get("total", np.inf))
+    room_sport = {s: float(sport_caps.get(s, np.inf)) for s in set(sport)}
+    room_market = {m: float(market_caps.get(m, np.inf)) for m in set(market)}
+    room_game = {}
+
+    taken = 0
+
+    for i in range(n):
+        if max_bets is not None and taken >= max_bets:
+            break
+
+        if room_total < max(min_stake, 1e-12):
+            break
+
+        limits = {
+            "bet": bet_cap,
+            "game": room_game.get(game[i], game_cap),
+            "sport": room_sport[sport[i]],
+            "market": room_market[market[i]],
+            "total": room_total,
+        }
+
+        name = min(limits, key=limits.get)
+        stake = min(want[i], limits[name])
+
+        if stake <= 0 or stake < min_stake:
+            continue
+
+        stakes[i] = stake
+        capped_by[i] = name if stake < want[i] else ""
+
+        room_total -= stake
+        room_sport[sport[i]] -= stake
+        room_market[market[i]] -= stake
+        room_game[game[i]] = room_game.get(game[i], game_cap) - stake
+
+        taken += 1
+
+    return stakes, capped_by
+
+
+def build_card(bets, config):
+    """
+    Final card for one date from normalised candidates.
+
+    bets columns: game_date, sport, league, game_id, away_team, home_team,
+    market_type, bet_side, line, odds_decimal, edge, ev, stake (wanted
+    fraction of bankroll).
+    """
+    bets = bets.copy()
+
+    for col in ("odds_decimal", "edge", "ev", "stake"):
+        bets[col] = pd.to_numeric(bets[col], errors="coerce")
+
+    bets["game_key"] = bets["sport"].astype(str) + "|" + bets["game_id"].astype(str)
+
+    eligible = (
+        (bets["ev"] >= float(config.get("min_ev", 0.0)))
+        & (bets["stake"] > 0)
+        & (bets["odds_decimal"] > 1)
+    )
+
+    ranked = rank_bets(bets.loc[eligible], config.get("rank_by", "ev"))
+
+    stakes, capped_by = allocate(
+        ranked,
+        config.get("caps", {}),
+        max_bets=config.get("max_bets"),
+        min_stake=float(config.get("min_stake_pct", 0.0)),
+    )
+
+    ranked["kelly_pct"] = np.round(ranked["stake"] * 100, 2)
+    ranked["stake_pct"] = np.round(stakes * 100, 2)
+    ranked["stake_amount"] = np.round(stakes * float(config.get("bankroll", 1.0)), 2)
+    ranked["capped_by"] = capped_by
+
+    card = ranked.loc[stakes > 0].copy()
+    card["card_rank"] = np.arange(1, len(card) + 1)
+
+    return card[CARD_COLUMNS].reset_index(drop=True)
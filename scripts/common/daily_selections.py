@@ -0,0 +1,196 @@
+# scripts/common/daily_selections.py
+
+import re
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+
+from common.juice_engine import american_to_decimal
+
+# =========================
+# DAILY SELECTIONS
+# =========================
+#
+# Every sport's 04_select output for a date mapped onto one frame:
+#
+#   game_date, sport, league, game_id, away_team, home_team, market_type,
+#   bet_side, line, odds_decimal, edge, ev, stake
+#
+# edge is the sport's own edge column, ev is per-unit expected profit and
+# stake is the wanted fraction of bankroll. Used by the daily card and the
+# CLV tracker.
+
+BASKETBALL_DIR = Path("docs/win/basketball/04_select/daily_slate")
+HOCKEY_DIR = Path("docs/win/hockey/04_select")
+SOCCER_DIR = Path("docs/win/soccer/04_select")
+
+DATE_RE = re.compile(r"\d{4}_\d{2}_\d{2}")
+
+# basketball (market_type, bet_side) -> 03_edges column prefix
+BASKETBALL_PREFIX = {
+    ("moneyline", "home"): "home_ml",
+    ("moneyline", "away"): "away_ml",
+    ("spread", "home"): "home_spread",
+    ("spread", "away"): "away_spread",
+    ("total", "over"): "over",
+    ("total", "under"): "under",
+}
+
+# prefix -> (model juice decimal, sportsbook decimal), as in 03_edges
+BASKETBALL_PRICES = {
+    "home_ml": ("home_juice_decimal_moneyline", "home_dk_decimal_moneyline"),
+    "away_ml": ("away_juice_decimal_moneyline", "away_dk_decimal_moneyline"),
+    "home_spread": ("home_spread_juice_decimal", "home_dk_spread_decimal"),
+    "away_spread": ("away_spread_juice_decimal", "away_dk_spread_decimal"),
+    "over": ("total_over_juice_decimal", "dk_total_over_decimal"),
+    "under": ("total_under_juice_decimal", "dk_total_under_decimal"),
+}
+
+SOCCER_LINES = {"over25": 2.5, "under25": 2.5}
+
+
+# =========================
+# LOADERS
+# =========================
+
+def pick(df, columns_by_row):
+    """Per-row value from the column named in columns_by_row (NaN if missing)"""
+    out = np.full(len(df), np.nan)
+
+    for col in pd.unique(columns_by_row):
+        if isinstance(col, str) and col in df.columns:
+            mask = columns_by_row == col
+            out[mask] = pd.to_numeric(df.loc[mask, col], errors="coerce")
+
+    return out
+
+
+def load_basketball(date_str):
+    frames = []
+
+    for league in ("nba", "ncaab"):
+        path = BASKETBALL_DIR / f"{date_str}_{league}.csv"
+        if not path.exists():
+            continue
+
+        df = pd.read_csv(path)
+        if df.empty:
+            continue
+
+        prefix = np.array([
+            BASKETBALL_PREFIX.get((m, s))
+            for m, s in zip(df["market_type"], df["bet_side"].fillna(""))
+        ], dtype=object)
+
+        prices = [BASKETBALL_PRICES.get(p, (None, None)) for p in prefix]
+
+        model = pick(df, np.array([m for m, _ in prices], dtype=object))
+        book = pick(df, np.array([b for _, b in prices], dtype=object))
+
+        frames.append(pd.DataFrame({
+            "game_date": date_str,
+            "sport": "basketball",
+            "league": league.upper(),
+            "game_id": df["game_id"],
+            "away_team": df["away_team"],
+            "home_team": df["home_team"],
+            "market_type": df["market_type"],
+            "bet_side": df["bet_side"],
+            "line": np.where(df["market_type"] == "moneyline", np.nan, df["line"]),
+            "odds_decimal": book,
+            "edge": pick(df, np.array([f"{p}_edge_decimal" for p in prefix], dtype=object)),
+            "ev": book / model - 1,
+            "stake": pd.to_numeric(df.get("portfolio_kelly_pct"), errors="coerce") / 100,
+        }))
+
+    return frames
+
+
+def load_hockey(date_str, kelly_fraction):
+    path = HOCKEY_DIR / f"{date_str}_NHL.csv"
+    if not path.exists():
+        return []
+
+    df = pd.read_csv(path)
+    if df.empty:
+        return []
+
+    d = american_to_decimal(df["take_odds"].to_numpy())
+    edge = pd.to_numeric(df["take_bet_edge_pct"], errors="coerce").to_numpy()
+
+    # edge_pct is model prob - book implied prob, so EV = edge * d
+    ev = edge * d
+
+    return [pd.DataFrame({
+        "game_date": date_str,
+        "sport": "hockey",
+        "league": "NHL",
+        "game_id": df["game_id"],
+        "away_team": df["away_team"],
+        "home_team": df["home_team"],
+        "market_type": df["market_type"],
+        "bet_side": df["bet_side"],
+        "line": pd.to_numeric(df["line"], errors="coerce"),
+        "odds_decimal": d,
+        "edge": edge,
+        "ev": ev,
+        "stake": kelly_fraction * np.maximum(ev, 0) / (d - 1),
+    })]
+
+
+def load_soccer(date_str):
+    path = SOCCER_DIR / f"{date_str}_soccer.csv"
+    if not path.exists():
+        return []
+
+    df = pd.read_csv(path)
+    if df.empty:
+        return []
+
+    # edge_pct is book / model decimal - 1, i.e. EV per unit
+    edge = pd.to_numeric(df["edge_pct"], errors="coerce")
+
+    return [pd.DataFrame({
+        "game_date": date_str,
+        "sport": "soccer",
+        "league": df["market"],
+        "game_id": df["game_id"],
+        "away_team": df["away_team"],
+        "home_team": df["home_team"],
+        "market_type": df["market_type"],
+        "bet_side": df["take_bet"],
+        "line": df["take_bet"].map(SOCCER_LINES),
+        "odds_decimal": pd.to_numeric(df["odds_decimal"], errors="coerce"),
+        "edge": edge,
+        "ev": edge,
+        "stake": pd.to_numeric(df["kelly_stake_pct"], errors="coerce") / 100,
+    })]
+
+
+def selection_files():
+    """Every per-date 04_select file the loaders read"""
+    return [
+        p
+        for d, pattern in ((BASKETBALL_DIR, "*.csv"), (HOCKEY_DIR, "*_NHL.csv"), (SOCCER_DIR, "*_soccer.csv"))
+        for p in sorted(d.glob(pattern))
+    ]
+
+
+def file_date(path):
+    m = DATE_RE.match(Path(path).name)
+    return m.group(0) if m else None
+
+
+def available_dates():
+    return sorted({d for d in map(file_date, selection_files()) if d})
+
+
+def load_selections(date_str, kelly_fraction=0.25):
+    """All sports' selections for one date (empty frame when there are none)"""
+    frames = load_basketball(date_str) + load_hockey(date_str, kelly_fraction) + load_soccer(date_str)
+
+    if not frames:
+        return pd.DataFrame()
+
+    return pd.concat(frames, ignore_index=True)
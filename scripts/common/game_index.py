@@ -0,0 +1,117 @@
+# scripts/common/game_index.py
+
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+
+# =========================
+# GAME INDEX
+# =========================
+#
+# Bets and final scores meet on one key, the canonical game_id assigned at
+# intake ("{game_date}_{away_team}_{home_team}", as merge_intake.py and the
+# score parser write it). Frames that do not carry a game_id yet get one built
+# from their name columns, so older files join the same way.
+#
+# Grading is then a hash join on game_id. Bets that find no score (or whose
+# game has more than one score row) are not dropped: they go to a per-league
+# reconciliation queue, one row per bet with the reason, until a re-grade of
+# that date clears them.
+
+GAME_KEY = ["game_date", "away_team", "home_team"]
+
+QUEUE_COLUMNS = ["game_date", "game_id", "away_team", "home_team", "market_type", "bet_side", "line", "reason"]
+
+NO_SCORE = "no_score"
+DUPLICATE_SCORE = "duplicate_score"
+
+
+# =========================
+# KEYS
+# =========================
+
+def game_ids(df):
+    """Canonical game_id built from the game key columns"""
+    parts = [df[c].astype(str).str.strip() for c in GAME_KEY]
+    return parts[0] + "_" + parts[1] + "_" + parts[2]
+
+
+def with_game_id(df):
+    """df with game_id filled in wherever it is missing"""
+    out = df.copy()
+    built = game_ids(df)
+
+    if "game_id" not in out.columns:
+        out["game_id"] = built
+        return out
+
+    existing = out["game_id"]
+    blank = existing.isna() | (existing.astype(str).str.strip() == "")
+    out["game_id"] = existing.where(~blank, built)
+
+    return out
+
+
+# =========================
+# JOIN
+# =========================
+
+def join_scores(bets, scores):
+    """
+    (joined, unmatched): bets with their game's score columns, and the bets
+    that could not be joined with a reason column. Score columns that repeat
+    the game key are taken from the bets.
+    """
+    bets = with_game_id(bets)
+    scores = with_game_id(scores)
+
+    counts = scores["game_id"].value_counts()
+    dupes = counts.index[counts > 1]
+    scores = scores.loc[~scores["game_id"].isin(dupes)]
+
+    score_cols = [c for c in scores.columns if c not in GAME_KEY]
+    joined = bets.merge(scores[score_cols], on="game_id", how="inner", validate="many_to_one")
+
+    found = bets["game_id"].isin(scores["game_id"]).to_numpy()
+    reason = np.where(bets["game_id"].isin(dupes), DUPLICATE_SCORE, NO_SCORE)
+
+    unmatched = bets.loc[~found].assign(reason=reason[~found])
+
+    return joined, unmatched
+
+
+# =========================
+# RECONCILIATION QUEUE
+# =========================
+
+def queue_rows(queue, unmatched, dates):
+    """
+    The queue with the rows of the re-graded dates replaced by their
+    unmatched bets; rows of other dates stay open.
+    """
+    if queue is None or queue.empty:
+        queue = pd.DataFrame(columns=QUEUE_COLUMNS)
+
+    queue = queue.loc[~queue["game_date"].astype(str).isin(set(dates))]
+
+    if unmatched is not None and not unmatched.empty:
+        queue = pd.concat([queue, unmatched.reindex(columns=QUEUE_COLUMNS).fillna("").astype(str)], ignore_index=True)
+
+    return queue.sort_values(["game_date", "game_id"], kind="mergesort")
+
+
+def read_queue(path):
+    path = Path(path)
+    return pd.read_csv(path, dtype=str) if path.exists() else None
+
+
+def update_queue(path, unmatched, dates):
+    """queue_rows written back to path; number of open rows"""
+    path = Path(path)
+    queue = queue_rows(read_queue(path), unmatched, dates)
+
+    path.parent.mkdir(parents=True, exist_ok=True)
+    queue.to_csv(path, index=False)
+
+    return len(queue)
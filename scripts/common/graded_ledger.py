@@ -0,0 +1,92 @@
+# scripts/common/graded_ledger.py
+
+import hashlib
+import json
+from pathlib import Path
+
+import pandas as pd
+
+# =========================
+# GRADED LEDGER
+# =========================
+#
+# The graded master (NBA_final.csv, ...) is kept as a ledger keyed by
+# (game_date, away_team, home_team, market_type, bet_side) instead of being
+# deleted and rebuilt from every daily file each night. A small state file
+# next to it remembers a hash of the inputs (selection file + score file)
+# each date was graded from, so a run only grades dates whose scores are new
+# or whose inputs changed, and upserts just those rows into the ledger.
+#
+# A re-graded date replaces all of its ledger rows, so bets dropped from a
+# re-run selection do not linger. Deleting the master (or the state file)
+# makes the next run grade every date again.
+
+LEDGER_KEY = ["game_date", "away_team", "home_team", "market_type", "bet_side"]
+
+
+# =========================
+# STATE
+# =========================
+
+def load_state(path):
+    path = Path(path)
+    if not path.exists():
+        return {"dates": {}}
+
+    with open(path, "r", encoding="utf-8") as f:
+        return json.load(f)
+
+
+def save_state(state, path):
+    with open(path, "w", encoding="utf-8") as f:
+        json.dump(state, f, indent=2, sort_keys=True)
+
+
+def inputs_hash(paths):
+    """One hash over the content of every input file of a date"""
+    digest = hashlib.sha1()
+
+    for path in sorted(map(str, paths)):
+        digest.update(path.encode("utf-8"))
+        digest.update(Path(path).read_bytes())
+
+    return digest.hexdigest()
+
+
+def pending_dates(inputs, state):
+    """{date: hash} for dates never graded or graded from different inputs"""
+    out = {}
+
+    for date, paths in sorted(inputs.items()):
+        digest = inputs_hash(paths)
+        if state["dates"].get(date) != digest:
+            out[date] = digest
+
+    return out
+
+
+# =========================
+# UPSERT
+# =========================
+
+def upsert(master, graded, dates, sort_cols=LEDGER_KEY):
+    """
+    (ledger, replaced): master with every row of the re-graded dates swapped
+    for graded, one row per ledger key, sorted stably by sort_cols.
+    """
+    if master is None or master.empty:
+        master = pd.DataFrame(columns=graded.columns)
+
+    stale = master["game_date"].astype(str).isin(set(dates))
+    replaced = master.loc[stale]
+
+    ledger = pd.concat([master.loc[~stale], graded], ignore_index=True)
+
+    key = [c for c in LEDGER_KEY if c in ledger.columns]
+    ledger = ledger.drop_duplicates(key, keep="last")
+
+    sort_cols = [c for c in sort_cols if c in ledger.columns]
+    if sort_cols:
+        ledger = ledger.sort_values(sort_cols, kind="mergesort")
+
+    return ledger, replaced
@@ -0,0 +1,139 @@
+# scripts/common/grading.py
+
+import numpy as np
+import pandas as pd
+
+# =========================
+# GRADING KERNEL
+# =========================
+#
+# Grades every bet of every sport from its final score in one array pass.
+# Each bet becomes a margin seen from the bettor's side:
+#
+#   moneyline           own score - other score             (tie -> Push)
+#   spread / puck_line  own score + line - other score
+#   total               over: total - line, under: line - total
+#   result (3-way)      +1 if the called home / draw / away happened, else -1
+#   btts                +1 if yes / no matches both teams scoring, else -1
+#
+# and the sign of the margin is the result. Quarter lines (2.25, -0.75, ...)
+# settle as two half stakes on the neighbouring lines, so those bets can
+# also come back Half Win / Half Loss. A missing score or line, or an
+# unknown market / side, grades "Unknown".
+
+PUSH_TOLERANCE = 1e-9
+
+SPREAD_MARKETS = ["spread", "puck_line"]
+TEAM_SIDES = ["home", "away"]
+TOTAL_SIDES = ["over", "under"]
+RESULT_SIDES = ["home", "draw", "away"]
+BTTS_SIDES = ["yes", "no"]
+
+# indexed by (sign of first half stake) + (sign of second half stake) + 2
+OUTCOMES = np.array(["Loss", "Half Loss", "Push", "Half Win", "Win"], dtype=object)
+
+UNKNOWN = "Unknown"
+
+
+# =========================
+# INPUTS
+# =========================
+
+def text(values):
+    """Stripped lower-case strings ("" for missing)"""
+    s = pd.Series(np.asarray(values, dtype=object)).astype("string")
+    return s.str.strip().str.lower().fillna("").to_numpy(dtype=object)
+
+
+def number(values):
+    return pd.to_numeric(pd.Series(np.asarray(values, dtype=object)), errors="coerce").to_numpy(dtype=float)
+
+
+def split_sides(side, line):
+    """
+    Unpack soccer style sides: "over25" -> ("over", 2.5), "under2.25" ->
+    ("under", 2.25), "btts_yes" -> "yes". Other sides pass through; an
+    explicit line always wins over one packed into the side.
+    """
+    s = pd.Series(side, dtype=object)
+
+    parts = s.str.extract(r"^(over|under)_?(\d+(?:\.\d+)?)$")
+    packed = parts[0].notna().to_numpy()
+
+    digits = parts[1].fillna("")
+    dotted = digits.str.contains(".", regex=False) | (digits.str.len() < 2)
+    digits = digits.where(dotted, digits.str.slice(0, 1) + "." + digits.str.slice(1))
+
+    side = np.where(packed, parts[0].to_numpy(dtype=object), side)
+    line = np.where(packed & np.isnan(line), pd.to_numeric(digits, errors="coerce").to_numpy(dtype=float), line)
+
+    side = np.where(np.isin(side, ["btts_yes", "btts_no"]), s.str.slice(5).to_numpy(dtype=object), side)
+
+    return side, line
+
+
+# =========================
+# KERNEL
+# =========================
+
+def signs(margin):
+    return np.where(margin > PUSH_TOLERANCE, 1, np.where(margin < -PUSH_TOLERANCE, -1, 0))
+
+
+def grade(market_type, bet_side, line, home_score, away_score):
+    """Win / Loss / Push / Half Win / Half Loss / Unknown for arrays of bets"""
+    market = text(market_type)
+    side, line = split_sides(text(bet_side), number(line))
+    home = number(home_score)
+    away = number(away_score)
+
+    own = np.where(side == "home", home, away)
+    other = np.where(side == "home", away, home)
+    total = home + away
+
+    called = np.select(
+        [side == "home", side == "away", side == "draw"],
+        [home > away, away > home, home == away],
+        False,
+    )
+    both_scored = (home > 0) & (away > 0)
+
+    is_team = np.isin(side, TEAM_SIDES)
+    is_line = np.isin(market, SPREAD_MARKETS) & is_team
+    is_total = (market == "total") & np.isin(side, TOTAL_SIDES)
+
+    margin = np.select(
+        [
+            (market == "moneyline") & is_team,
+            is_line,
+            is_total,
+            (market == "result") & np.isin(side, RESULT_SIDES),
+            (market == "btts") & np.isin(side, BTTS_SIDES),
+        ],
+        [
+            own - other,
+            own + line - other,
+            np.where(side == "over", total - line, line - total),
+            np.where(called, 1.0, -1.0),
+            np.where(both_scored == (side == "yes"), 1.0, -1.0),
+        ],
+        np.nan,
+    )
+
+    with np.errstate(invalid="ignore"):
+        quarter = (is_line | is_total) & (np.abs(np.round(line * 4)) % 2 == 1)
+
+    split = np.where(quarter, 0.25, 0.0)
+    score = signs(margin - split) + signs(margin + split) + 2
+
+    missing = np.isnan(margin) | np.isnan(home) | np.isnan(away)
+
+    return np.where(missing, UNKNOWN, OUTCOMES[score])
+
+
+def grade_frame(df):
+    """bet_result for a bets + final scores frame (bet_side, or soccer's take_bet)"""
+    side_col = "bet_side" if "bet_side" in df.columns else "take_bet"
+    line = df["line"] if "line" in df.columns else np.full(len(df), np.nan)
+
+    return grade(df["market_type"], df[side_col], line, df["home_score"], df["away_score"])
@@ -0,0 +1,308 @@
+# scripts/common/juice_artifacts.py
+
+import hashlib
+import json
+import re
+from datetime import datetime
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+
+from common.juice_bands import compile_bands, compile_nearest
+
+# =========================
+# ARTIFACT CACHE
+# =========================
+#
+# Juice CSVs are compiled into JSON lookup artifacts under ARTIFACT_DIR, named
+# after the market and stamped with the sha256 of the source CSV(s) plus the
+# lookup spec. An artifact is rebuilt only when that hash changes, and within
+# a process the compiled table is kept in memory until the source file's
+# mtime/size changes.
+
+ARTIFACT_DIR = Path("config/compiled")
+
+ARTIFACT_VERSION = 1
+
+_MEMO = {}
+
+INTERVAL_RE = re.compile(r"^\s*([\(\[])\s*([-+0-9.eE]+)\s*,\s*([-+0-9.eE]+)\s*([\)\]])\s*$")
+
+
+# =========================
+# SOURCES
+# =========================
+
+def source_paths(spec):
+    table = spec.get("table")
+
+    if table is None:
+        return []
+
+    if isinstance(table, str):
+        return [Path(table)]
+
+    return [Path(p) for p in table["paths"].values()]
+
+
+def source_stat(spec):
+    return tuple((str(p), p.stat().st_mtime_ns, p.stat().st_size) for p in source_paths(spec))
+
+
+def source_hash(spec):
+    h = hashlib.sha256()
+
+    h.update(json.dumps({"lookup": spec["lookup"], "table": spec.get("table"), "v": ARTIFACT_VERSION},
+                        sort_keys=True).encode())
+
+    for p in source_paths(spec):
+        h.update(p.read_bytes())
+
+    return h.hexdigest()
+
+
+def read_table(spec):
+    """Read the market table; per-row tables are stacked with a key column"""
+    table = spec["table"]
+
+    if isinstance(table, str):
+        return pd.read_csv(table)
+
+    frames = []
+
+    for value, path in table["paths"].items():
+        df = pd.read_csv(path)
+        df[table["by"]] = value
+        frames.append(df)
+
+    return pd.concat(frames, ignore_index=True)
+
+
+def split_intervals(df, label_col, min_col, max_col):
+    """
+    Add min/max columns from pd.cut interval labels such as "(-110, -100]".
+    Returns the closed side shared by every label.
+    """
+    parsed = df[label_col].astype(str).str.extract(INTERVAL_RE)
+
+    if parsed.isna().any(axis=None):
+        bad = df.loc[parsed.isna().any(axis=1), label_col].head(3).tolist()
+        raise ValueError(f"Unparseable interval labels in {label_col}: {bad}")
+
+    df[min_col] = parsed[1].astype(float)
+    df[max_col] = parsed[2].astype(float)
+
+    left = parsed[0] == "["
+    right = parsed[3] == "]"
+    closed = {
+        (True, True): "both",
+        (True, False): "left",
+        (False, True): "right",
+        (False, False): "neither",
+    }
+    sides = {closed[(lft, rgt)] for lft, rgt in zip(left, right)}
+
+    if len(sides) != 1:
+        raise ValueError(f"Mixed interval closure in {label_col}: {sorted(sides)}")
+
+    return sides.pop()
+
+
+# =========================
+# VALIDATION
+# =========================
+
+def validate_bands(table, lookup):
+    """Sorted gap/overlap report per key group (positive-length only)"""
+    issues = []
+    keys = lookup.get("keys", [])
+    tolerance = float(lookup.get("gap_tolerance", 0))
+
+    lo = table[[lookup["min"], lookup["max"]]].min(axis=1)
+    hi = table[[lookup["min"], lookup["max"]]].max(axis=1)
+
+    bands = pd.DataFrame({"lo": lo, "hi": hi, "extra": table["extra_juice"]})
+    for k in keys:
+        bands[k] = table[k].astype(str).str.strip()
+
+    if bands["extra"].isna().any():
+        issues.append(f"{int(bands['extra'].isna().sum())} band(s) with blank extra_juice use the default")
+
+    groups = bands.groupby(keys, sort=False) if keys else [((), bands)]
+
+    for key, g in groups:
+
+        g = g.sort_values(["lo", "hi"], kind="stable")
+
+        # exact-match tables (one row per line) have no band coverage to check
+        if (g["hi"] > g["lo"]).sum() == 0:
+            continue
+
+        reach = g["hi"].cummax().shift()
+        gaps = g[g["lo"] - reach > tolerance]
+        overlaps = g[g["lo"] < reach]
+
+        for _, row in gaps.iterrows():
+            issues.append(f"gap {key}: nothing covers ({reach[row.name]:g}, {row['lo']:g})")
+
+        for _, row in overlaps.iterrows():
+            issues.append(f"overlap {key}: band [{row['lo']:g}, {row['hi']:g}] overlaps an earlier band "
+                          f"(first row in file order wins)")
+
+    return issues
+
+
+def validate_points(table, lookup):
+    issues = []
+    keys = lookup.get("keys", [])
+    cols = keys + [lookup["point"]]
+
+    dupes = table.duplicated(subset=cols, keep="first")
+    if dupes.any():
+        issues.append(f"{int(dupes.sum())} duplicate {lookup['point']} point(s) ignored (first row wins)")
+
+    if table["extra_juice"].isna().any():
+        issues.append(f"{int(table['extra_juice'].isna().sum())} point(s) with blank extra_juice")
+
+    return issues
+
+
+# =========================
+# COMPILE / SERIALISE
+# =========================
+
+def _floats(a):
+    return [None if not np.isfinite(v) else float(v) for v in np.asarray(a, dtype=float)]
+
+
+def _array(a):
+    return np.array([np.nan if v is None else v for v in a], dtype=float)
+
+
+def compile_artifact(spec):
+    """Read, validate and compile one market table into a JSON-able artifact"""
+    lookup = dict(spec["lookup"])
+    keys = list(lookup.get("keys", []))
+
+    table = read_table(spec)
+
+    missing = [c for c in keys + ["extra_juice"] if c not in table.columns]
+
+    if lookup["type"] == "band":
+
+        if lookup["min"] not in table.columns and lookup.get("interval") in table.columns:
+            lookup["closed"] = split_intervals(table, lookup["interval"], lookup["min"], lookup["max"])
+
+        missing += [c for c in (lookup["min"], lookup["max"]) if c not in table.columns]
+
+    elif lookup["type"] == "nearest":
+        missing += [c for c in [lookup["point"]] if c not in table.columns]
+
+    if missing:
+        raise ValueError(f"{spec['name']}: juice table missing columns {missing}")
+
+    artifact = {
+        "version": ARTIFACT_VERSION,
+        "market": spec["name"],
+        "sources": [str(p) for p in source_paths(spec)],
+        "sha256": source_hash(spec),
+        "compiled_at": datetime.utcnow().isoformat() + "Z",
+        "type": lookup["type"],
+        "closed": lookup.get("closed", "both"),
+        "rows": int(len(table)),
+        "groups": [],
+    }
+
+    if lookup["type"] == "band":
+        compiled = compile_bands(table, lookup["min"], lookup["max"], keys=tuple(keys), closed=artifact["closed"])
+        numeric = table.copy()
+        for c in (lookup["min"], lookup["max"], "extra_juice"):
+            numeric[c] = pd.to_numeric(numeric[c], errors="coerce")
+        artifact["issues"] = validate_bands(numeric.dropna(subset=[lookup["min"], lookup["max"]]), lookup)
+        fields = ("bounds", "point_vals", "gap_vals")
+    else:
+        compiled = compile_nearest(table, lookup["point"], keys=tuple(keys))
+        artifact["issues"] = validate_points(table, lookup)
+        fields = ("points", "values", "file_order")
+
+    for key, arrays in compiled.items():
+
+        order = np.asarray(arrays[0], dtype=float)
+        if np.any(np.diff(order) <= 0):
+            raise ValueError(f"{spec['name']}: compiled bounds for {key} are not strictly sorted")
+
+        group = {"key": list(key)}
+        group.update({f: _floats(a) for f, a in zip(fields, arrays)})
+        artifact["groups"].append(group)
+
+    return artifact
+
+
+def artifact_tables(artifact):
+    """Artifact JSON -> {key tuple: arrays} as used by the juice_bands lookups"""
+    fields = ("bounds", "point_vals", "gap_vals") if artifact["type"] == "band" else ("points", "values", "file_order")
+
+    compiled = {}
+
+    for group in artifact["groups"]:
+        arrays = tuple(_array(group[f]) for f in fields)
+        if artifact["type"] == "nearest":
+            arrays = arrays[:2] + (arrays[2].astype(int),)
+        compiled[tuple(group["key"])] = arrays
+
+    return compiled
+
+
+def artifact_path(sport, spec):
+    return ARTIFACT_DIR / f"{sport}_{spec['name']}.json"
+
+
+def load_compiled(sport, spec, log=None):
+    """
+    Compiled lookup for one market: in-memory while the source is unchanged,
+    else the on-disk artifact when its hash matches, else a fresh compile.
+    """
+    if spec["lookup"]["type"] == "constant":
+        return None
+
+    memo_key = (sport, spec["name"])
+    stat = source_stat(spec)
+
+    if memo_key in _MEMO and _MEMO[memo_key][0] == stat:
+        return _MEMO[memo_key][1]
+
+    path = artifact_path(sport, spec)
+    digest = source_hash(spec)
+
+    artifact = None
+
+    if path.exists():
+        try:
+            with open(path, "r", encoding="utf-8") as f:
+                cached = json.load(f)
+            if cached.get("sha256") == digest and cached.get("version") == ARTIFACT_VERSION:
+                artifact = cached
+        except (OSError, ValueError):
+            artifact = None
+
+    if artifact is None:
+
+        artifact = compile_artifact(spec)
+
+        path.parent.mkdir(parents=True, exist_ok=True)
+        tmp = path.with_suffix(".tmp")
+        with open(tmp, "w", encoding="utf-8") as f:
+            json.dump(artifact, f, indent=1)
+        tmp.replace(path)
+
+        if log:
+            log(f"[COMPILE] {spec['name']} -> {path} ({artifact['rows']} rows)")
+            for issue in artifact["issues"]:
+                log(f"[WARN] {spec['name']}: {issue}")
+
+    compiled = artifact_tables(artifact)
+
+    _MEMO[memo_key] = (stat, compiled)
+
+    return compiled
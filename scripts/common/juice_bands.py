@@ -0,0 +1,220 @@
+# scripts/common/juice_bands.py
+
+import numpy as np
+import pandas as pd
+
+# =========================
+# BAND COMPILATION
+# =========================
+#
+# A juice table is a list of (key..., band_min, band_max, extra_juice) rows.
+# The apply_*_juice stages used to filter the whole table once per row and
+# take the FIRST matching row. Here each key group is compiled once into
+# sorted boundary points plus the value that owns every boundary point and
+# every open gap between boundaries, so a column lookup is one searchsorted.
+# First-match-in-file-order is preserved for duplicate or touching bands.
+
+
+def _first_cover(lows, highs, points, closed, at_points):
+    """Index of the first row covering each probe point (-1 if none)"""
+    p = points[None, :]
+    lo = lows[:, None]
+    hi = highs[:, None]
+
+    if at_points:
+        left = (lo <= p) if closed in ("both", "left") else (lo < p)
+        right = (p <= hi) if closed in ("both", "right") else (p < hi)
+    else:
+        # probes are gap midpoints, strictly inside any covering band
+        left = lo < p
+        right = p < hi
+
+    cover = left & right
+
+    first = cover.argmax(axis=0)
+    first[~cover.any(axis=0)] = -1
+
+    return first
+
+
+def compile_band_group(lows, highs, values, closed="both"):
+    """
+    lows/highs/values for one key group -> (bounds, point_vals, gap_vals)
+
+    gap_vals[i] covers the open interval (bounds[i], bounds[i + 1]).
+    """
+    lows = np.asarray(lows, dtype=float)
+    highs = np.asarray(highs, dtype=float)
+    values = np.asarray(values, dtype=float)
+
+    lows, highs = np.minimum(lows, highs), np.maximum(lows, highs)
+
+    bounds = np.unique(np.concatenate([lows, highs]))
+
+    point_idx = _first_cover(lows, highs, bounds, closed, at_points=True)
+    point_vals = np.where(point_idx >= 0, values[point_idx], np.nan)
+
+    mids = (bounds[:-1] + bounds[1:]) / 2
+    gap_idx = _first_cover(lows, highs, mids, closed, at_points=False)
+    gap_vals = np.where(gap_idx >= 0, values[gap_idx], np.nan)
+
+    return bounds, point_vals, gap_vals
+
+
+def compile_bands(df, min_col, max_col, keys=(), value_col="extra_juice", closed="both"):
+    """
+    Compile a juice table into {key tuple: (bounds, point_vals, gap_vals)}.
+
+    closed: "both" for band_min <= x <= band_max, "left" for
+    band_min <= x < band_max, "right" for pd.cut style band_min < x <= band_max.
+    Exact-match tables (e.g. one row per spread) compile with min_col == max_col.
+    """
+    table = df.copy()
+
+    for col in {min_col, max_col, value_col}:
+        table[col] = pd.to_numeric(table[col], errors="coerce")
+
+    table = table.dropna(subset=[min_col, max_col])
+
+    for k in keys:
+        table[k] = table[k].astype(str).str.strip()
+
+    compiled = {}
+
+    if not keys:
+        compiled[()] = compile_band_group(table[min_col], table[max_col], table[value_col], closed)
+        return compiled
+
+    for key, group in table.groupby(list(keys), sort=False):
+
+        if not isinstance(key, tuple):
+            key = (key,)
+
+        compiled[key] = compile_band_group(group[min_col], group[max_col], group[value_col], closed)
+
+    return compiled
+
+
+# =========================
+# LOOKUP
+# =========================
+
+def lookup_group(group, x):
+    """Vectorized value lookup in one compiled key group (NaN when unmatched)"""
+    bounds, point_vals, gap_vals = group
+    x = np.asarray(x, dtype=float)
+
+    out = np.full(x.shape, np.nan)
+
+    if len(bounds) == 0:
+        return out
+
+    idx = np.searchsorted(bounds, x, side="left")
+    clipped = np.minimum(idx, len(bounds) - 1)
+
+    on_point = (idx < len(bounds)) & (bounds[clipped] == x)
+    out[on_point] = point_vals[clipped[on_point]]
+
+    in_gap = ~on_point & (idx > 0) & (idx < len(bounds))
+    out[in_gap] = gap_vals[idx[in_gap] - 1]
+
+    return out
+
+
+def lookup_keyed(compiled, x, keys, lookup_fn):
+    """Group rows by key tuple and run lookup_fn(group, x) once per key"""
+    x = np.asarray(pd.to_numeric(pd.Series(x), errors="coerce"), dtype=float)
+    out = np.full(x.shape, np.nan)
+
+    if not keys:
+        if () in compiled:
+            out = lookup_fn(compiled[()], x)
+        return out
+
+    key_frame = pd.DataFrame({i: np.asarray(k).astype(str) for i, k in enumerate(keys)})
+
+    for key, idx in key_frame.groupby(list(key_frame.columns), sort=False).indices.items():
+
+        if not isinstance(key, tuple):
+            key = (key,)
+
+        if key in compiled:
+            out[idx] = lookup_fn(compiled[key], x[idx])
+
+    return out
+
+
+def lookup_bands(compiled, x, keys=None, default=np.nan):
+    """
+    Column lookup: x is the banded value per row, keys is a list of per-row
+    key arrays in the same order the table was compiled with.
+    Rows with NaN x, unknown keys or no covering band get `default`.
+    """
+    out = lookup_keyed(compiled, x, keys, lookup_group)
+
+    return np.where(np.isnan(out), default, out)
+
+
+# =========================
+# NEAREST-POINT TABLES
+# =========================
+#
+# Curve tables (soccer 3-way: side, fair_prob, extra_juice) are matched to the
+# closest fair_prob rather than a covering band. Each side compiles to a sorted
+# probability array; ties keep the row that appears first in the file.
+
+def compile_nearest(df, point_col, keys=(), value_col="extra_juice"):
+    """Compile a curve table into {key tuple: (points, values, file_order)}"""
+    table = df.copy()
+    table[point_col] = pd.to_numeric(table[point_col], errors="coerce")
+    table[value_col] = pd.to_numeric(table[value_col], errors="coerce")
+    table = table.dropna(subset=[point_col]).reset_index(drop=True)
+
+    for k in keys:
+        table[k] = table[k].astype(str).str.strip()
+
+    groups = table.groupby(list(keys), sort=False) if keys else [((), table)]
+
+    compiled = {}
+
+    for key, group in groups:
+
+        if not isinstance(key, tuple):
+            key = (key,)
+
+        order = np.argsort(group[point_col].to_numpy(), kind="stable")
+        points = group[point_col].to_numpy()[order]
+        values = group[value_col].to_numpy()[order]
+        file_order = group.index.to_numpy()[order]
+
+        # duplicate points: first row in file order wins
+        points, first = np.unique(points, return_index=True)
+
+        compiled[key] = (points, values[first], file_order[first])
+
+    return compiled
+
+
+def lookup_nearest(group, x):
+    """Value of the closest point for every x (NaN for NaN x)"""
+    points, values, file_order = group
+    x = np.asarray(x, dtype=float)
+
+    idx = np.searchsorted(points, x)
+    lo = np.clip(idx - 1, 0, len(points) - 1)
+    hi = np.clip(idx, 0, len(points) - 1)
+
+    d_lo = np.abs(points[lo] - x)
+    d_hi = np.abs(points[hi] - x)
+
+    take_hi = (d_hi < d_lo) | ((d_hi == d_lo) & (file_order[hi] < file_order[lo]))
+    nearest = np.where(take_hi, hi, lo)
+
+    return np.where(np.isnan(x), np.nan, values[nearest])
+
+
+def lookup_nearest_keyed(compiled, x, keys=None, default=np.nan):
+    """Column version of lookup_nearest over a keyed curve table"""
+    out = lookup_keyed(compiled, x, keys, lookup_nearest)
+
+    return np.where(np.isnan(out), default, out)
@@ -0,0 +1,359 @@
+# scripts/common/juice_engine.py
+
+import json
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+
+from common.juice_artifacts import load_compiled
+from common.juice_bands import lookup_bands, lookup_nearest_keyed
+
+# =========================
+# CONFIG
+# =========================
+#
+# Every juice market (basketball ML/spread/total, hockey ML/puck line/total,
+# soccer 3-way/totals/BTTS) is described in config/juice_markets.json:
+#
+#   table      CSV path, or {"by": <row column>, "paths": {value: path}} for
+#              tables chosen per row (soccer leagues share one slate file)
+#   lookup     band (min/max columns, closed both|left|right, or pd.cut
+#              labels in an interval column), nearest (point column) or
+#              constant (value); keys are table columns
+#   mode       price_multiplicative  decimal * (1 + extra)
+#              prob_discount         1 / (fair_prob * (1 - extra))
+#              prob_additive         1 / min(prob + extra, prob_cap)
+#              prob_multiplicative   1 / (prob * (1 + extra))
+#   on_missing default (extra = default) | skip (leave blank) | raise
+#
+# Tables are compiled through juice_artifacts (validated, hash-cached).
+# Adding a league is a new entry in that file; no new script.
+
+CONFIG_PATH = Path("config/juice_markets.json")
+
+DEFAULT_PROB_CAP = 0.999
+CLAMP_DECIMAL = 1.01
+FLOOR_DECIMAL = 1.0001
+FLOOR_PROB = 1e-6
+
+OUTPUT_KINDS = ["fair_prob", "extra", "decimal", "american", "prob"]
+
+
+def load_config(path=CONFIG_PATH):
+    with open(path, "r", encoding="utf-8") as f:
+        return json.load(f)
+
+
+# =========================
+# ODDS CONVERSION
+# =========================
+
+def american_to_decimal(values):
+    """Column of American odds (+120, -150, '1,200') -> decimal (NaN if invalid)"""
+    text = pd.Series(values).astype("string").str.replace("+", "", regex=False).str.replace(",", "", regex=False)
+    a = pd.to_numeric(text.str.strip(), errors="coerce").astype(float).to_numpy()
+
+    with np.errstate(divide="ignore", invalid="ignore"):
+        out = np.where(a > 0, 1 + a / 100, 1 + 100 / np.abs(a))
+
+    return np.where(np.isfinite(out) & (a != 0), out, np.nan)
+
+
+def decimal_to_american(decimal, fmt="signed"):
+    """
+    Column of decimal odds -> American odds.
+
+    signed: "+120" / "-150" strings, "" when d <= 1 or not finite
+    int:    nullable integers, NA when d is missing
+    """
+    d = np.asarray(decimal, dtype=float)
+
+    with np.errstate(divide="ignore", invalid="ignore"):
+        american = np.where(d >= 2, np.round((d - 1) * 100), np.round(-100 / (d - 1)))
+
+    if fmt == "int":
+        return pd.Series(american).where(~np.isnan(d)).astype("Int64")
+
+    valid = np.isfinite(d) & (d > 1)
+
+    return [
+        (f"+{int(a)}" if dd >= 2 else f"-{int(-a)}") if ok else ""
+        for a, dd, ok in zip(american, d, valid)
+    ]
+
+
+# =========================
+# SIDE PRICING
+# =========================
+
+def first_present(df, cols):
+    cols = [cols] if isinstance(cols, str) else cols
+    for c in cols:
+        if c in df.columns:
+            return c
+    return None
+
+
+def numeric(df, col):
+    return pd.to_numeric(df[col], errors="coerce").astype(float).to_numpy()
+
+
+def side_keys(df, spec, side):
+    """Per-row key arrays in the order the table was compiled with"""
+    out = []
+
+    for name in spec["lookup"].get("keys", []):
+        rule = side["keys"][name]
+
+        if isinstance(rule, str):
+            out.append(np.full(len(df), rule))
+        elif "sign_of" in rule:
+            out.append(np.where(numeric(df, rule["sign_of"]) < 0, "favorite", "underdog"))
+        else:
+            out.append(df[rule["col"]].astype(str).str.strip().to_numpy())
+
+    return out
+
+
+def side_base(df, side):
+    """Base price/probability for one side, as decimal odds or probability"""
+    base = side.get("base", side.get("x"))
+    fmt = side.get("base_format", "decimal")
+
+    if isinstance(base, dict):
+        col = first_present(df, base["complement_of"])
+        return None if col is None else 1 - numeric(df, col)
+
+    col = first_present(df, base)
+
+    if col is None and side.get("base_fallback") in df.columns:
+        # American column missing: round-trip the decimal through American odds
+        american = decimal_to_american(numeric(df, side["base_fallback"]))
+        return american_to_decimal(american)
+
+    if col is None:
+        return None
+
+    if fmt == "american":
+        return american_to_decimal(df[col])
+
+    return numeric(df, col)
+
+
+def side_extra(df, spec, compiled, side):
+    lookup = spec["lookup"]
+
+    if lookup["type"] == "constant":
+        return np.full(len(df), float(lookup["value"]))
+
+    col = first_present(df, side["x"])
+    x = numeric(df, col)
+
+    if side.get("x_abs"):
+        x = np.abs(x)
+
+    if "x_round" in side:
+        x = np.round(x, side["x_round"])
+
+    keys = side_keys(df, spec, side)
+
+    if lookup["type"] == "nearest":
+        return lookup_nearest_keyed(compiled, x, keys)
+
+    return lookup_bands(compiled, x, keys)
+
+
+def price_side(df, spec, compiled, side):
+    """
+    Price one side of a market for every row.
+
+    Returns (outputs, stats): outputs maps OUTPUT_KINDS to arrays, stats
+    counts applied / no_band / bad rows.
+    """
+    mode = spec["mode"]
+    n = len(df)
+
+    base = side_base(df, side)
+
+    if base is None or ("x" in side and first_present(df, side["x"]) is None):
+        if spec.get("optional"):
+            return None, None
+        raise ValueError(f"Missing required columns for {spec['name']} {side['side']}")
+
+    extra = side_extra(df, spec, compiled, side)
+
+    # ---- row eligibility ----
+    if mode in ("price_multiplicative", "prob_discount"):
+        base_ok = np.isfinite(base) & (base > 1)
+        if spec.get("base_invalid") == "clamp":
+            base = np.where(base_ok, base, CLAMP_DECIMAL)
+            base_ok = np.ones(n, dtype=bool)
+    else:
+        base_ok = ~np.isnan(base)
+
+    for col in spec.get("require", []):
+        base_ok &= ~np.isnan(numeric(df, col))
+
+    missing = np.isnan(extra)
+    on_missing = spec.get("on_missing", "default")
+
+    if on_missing == "raise" and (base_ok & missing).any():
+        i = int(np.argmax(base_ok & missing))
+        keys = [k[i] for k in side_keys(df, spec, side)]
+        x = df[first_present(df, side["x"])].iloc[i]
+        raise ValueError(f"No juice band for {spec['name']} {side['side']}: {x}, {keys}")
+
+    if on_missing == "default":
+        extra = np.where(missing, float(spec.get("default", 0.0)), extra)
+        missing = np.zeros(n, dtype=bool)
+
+    ok = base_ok & ~missing
+
+    # ---- pricing ----
+    with np.errstate(divide="ignore", invalid="ignore"):
+
+        if mode == "price_multiplicative":
+            decimal = base * (1 + extra)
+            prob = None
+
+        elif mode == "prob_discount":
+            prob = (1 / base) * (1 - extra)
+            prob = np.where(np.isfinite(prob) & (prob > 0), prob, FLOOR_PROB)
+            decimal = 1 / prob
+
+        elif mode == "prob_additive":
+            decimal = 1 / np.minimum(base + extra, spec.get("prob_cap", DEFAULT_PROB_CAP))
+            prob = None
+
+        elif mode == "prob_multiplicative":
+            decimal = 1 / (base * (1 + extra))
+            prob = None
+
+        else:
+            raise ValueError(f"Unknown juice mode for {spec['name']}: {mode}")
+
+        final_ok = np.isfinite(decimal) & (decimal > 1)
+
+        if spec.get("final_invalid") == "floor":
+            decimal = np.where(final_ok, decimal, FLOOR_DECIMAL)
+        elif spec.get("final_invalid") == "skip":
+            ok &= final_ok
+
+        if "round" in spec:
+            decimal = np.round(decimal, spec["round"])
+
+        if prob is None:
+            prob = 1 / decimal
+
+    decimal = np.where(ok, decimal, np.nan)
+    prob = np.where(ok, prob, np.nan)
+
+    outputs = {
+        "fair_prob": base,
+        "extra": extra,
+        "decimal": decimal,
+        "american": decimal_to_american(decimal, spec.get("american_format", "signed")),
+        "prob": prob,
+    }
+
+    stats = {
+        "applied": int(ok.sum()),
+        "no_band": int((base_ok & missing).sum()),
+        "bad_rows": int((~base_ok).sum()),
+    }
+
+    return outputs, stats
+
+
+def apply_market(df, spec, compiled):
+    """Price every side of one market and write the configured columns"""
+    priced = []
+    stats = {}
+
+    for side in spec["sides"]:
+        outputs, side_stats = price_side(df, spec, compiled, side)
+        if outputs is not None:
+            priced.append((side, outputs))
+            stats[side["side"]] = side_stats
+
+    if spec.get("column_order") == "by_kind":
+        order = [(kind, side, outputs) for kind in OUTPUT_KINDS for side, outputs in priced]
+    else:
+        order = [(kind, side, outputs) for side, outputs in priced for kind in OUTPUT_KINDS]
+
+    for kind, side, outputs in order:
+        if kind in side.get("out", {}):
+            df[side["out"][kind]] = outputs[kind]
+
+    for side, outputs in priced:
+        for target, kind in side.get("replace", {}).items():
+            df[target] = df[side["out"][kind]]
+
+    return df, stats
+
+
+# =========================
+# SLATE RUNNER
+# =========================
+
+def slate_files(sport_cfg):
+    """{input file: [market specs]} so each slate file is read and written once"""
+    input_dir = Path(sport_cfg["input_dir"])
+    files = {}
+
+    for spec in sport_cfg["markets"]:
+        for path in sorted(input_dir.glob(spec["pattern"])):
+            files.setdefault(path, []).append(spec)
+
+    return files
+
+
+def purge_outputs(sport_cfg):
+    output_dir = Path(sport_cfg["output_dir"])
+
+    for spec in sport_cfg["markets"]:
+        if spec.get("purge"):
+            for f in output_dir.glob(spec["pattern"]):
+                f.unlink(missing_ok=True)
+
+
+def atomic_write(df, path):
+    tmp = path.with_suffix(".tmp")
+    df.to_csv(tmp, index=False)
+    tmp.replace(path)
+
+
+def run_sport(sport, sport_cfg, log):
+    """Load every compiled table once, then one read + one write per slate file"""
+    output_dir = Path(sport_cfg["output_dir"])
+    output_dir.mkdir(parents=True, exist_ok=True)
+
+    compiled = {spec["name"]: load_compiled(sport, spec, log) for spec in sport_cfg["markets"]}
+
+    files = slate_files(sport_cfg)
+
+    purge_outputs(sport_cfg)
+
+    written = 0
+
+    for path, specs in files.items():
+
+        df = pd.read_csv(path)
+
+        missing = [c for c in sport_cfg.get("require_columns", []) if c not in df.columns]
+        if missing:
+            log(f"[SKIP] {path.name}: missing {missing}")
+            continue
+
+        for spec in specs:
+            df, stats = apply_market(df, spec, compiled[spec["name"]])
+
+            for side, s in stats.items():
+                log(f"[INFO] {path.name} {spec['name']} {side}: "
+                    f"applied={s['applied']} no_band={s['no_band']} bad_rows={s['bad_rows']}")
+
+        atomic_write(df, output_dir / path.name)
+        written += 1
+
+    return written
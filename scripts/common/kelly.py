@@ -0,0 +1,23 @@
+# scripts/common/kelly.py
+
+import numpy as np
+
+# =========================
+# KELLY
+# =========================
+#
+# Single-bet Kelly shared by the slate sizer (kelly_portfolio) and the
+# profit accounting (profit_engine).
+
+KELLY_FRACTION = 0.25
+
+
+def independent_kelly(p, d):
+    """Classic single-bet full Kelly, (p * d - 1) / (d - 1), floored at 0"""
+    p = np.asarray(p, dtype=float)
+    d = np.asarray(d, dtype=float)
+
+    with np.errstate(divide="ignore", invalid="ignore"):
+        f = (p * d - 1) / (d - 1)
+
+    return np.where(np.isfinite(f) & (d > 1), np.maximum(f, 0), 0.0)
@@ -0,0 +1,200 @@
+# scripts/common/kelly_portfolio.py
+
+import numpy as np
+from scipy.optimize import minimize
+
+from common.kelly import KELLY_FRACTION, independent_kelly
+
+# =========================
+# SLATE KELLY SIZING
+# =========================
+#
+# Sizes every selected bet on a slate at once instead of one independent
+# Kelly fraction per bet. Outcomes are simulated with a Gaussian copula:
+# bets on the same game load on a shared latent factor per (game, factor)
+# -- "margin" for moneyline/spread/result, "total" for totals -- with the
+# side's sign, so home ML and home spread move together, home ML and away
+# spread move against each other, and different games are independent.
+# The simulation only supplies that dependence: each bet wins in exactly
+# round(p * N_SIMS) scenarios (the ones with its lowest latent draws), so
+# every bet's expected return is the model's p * d - 1 whatever the seed.
+# Fractional Kelly is solved directly as CRRA utility with risk aversion
+# 1 / fraction (fraction=1 is plain log growth; fraction=0.25 is close to a
+# quarter of full Kelly for small edges), maximised over the scenarios with
+# SLSQP under per-bet and per-slate caps; kkt_residual checks the result.
+# Solving the fractional problem directly keeps smaller edges in the
+# portfolio instead of letting a full-Kelly budget crowd them out.
+
+N_SIMS = 10000
+SEED = 20240301
+ITERATIONS = 500
+KKT_TOLERANCE = 1e-4
+
+FACTOR_RHO = {
+    "margin": 0.8,
+    "total": 0.8,
+}
+
+MAX_BET_FRACTION = 0.05
+MAX_SLATE_EXPOSURE = 0.25
+
+
+def bet_factor(market_type, side):
+    """(factor, sign) for a bet: which game outcome it rides on and in which direction"""
+    market_type = str(market_type).lower()
+    side = str(side).lower()
+
+    if market_type in ("total", "totals") or side in ("over", "under", "over25", "under25"):
+        return "total", 1.0 if side.startswith("over") else -1.0
+
+    if side in ("home", "away"):
+        return "margin", 1.0 if side == "home" else -1.0
+
+    # draws, BTTS and anything unrecognised: independent of the other bets
+    return "own", 0.0
+
+
+def simulate_returns(p, d, games, factors, signs, n_sims=N_SIMS, seed=SEED):
+    """
+    (n_sims, n_bets) matrix of per-unit returns: d - 1 on a win, -1 on a loss.
+    Each bet wins in its round(p * n_sims) lowest latent draws, so the
+    marginals match p and only the dependence between bets is simulated.
+    """
+    n = len(p)
+    rng = np.random.default_rng(seed)
+
+    group_keys = [f"{g}|{fac}" for g, fac in zip(games, factors)]
+    _, group_idx = np.unique(group_keys, return_inverse=True)
+
+    rho = np.array([FACTOR_RHO.get(fac, 0.0) for fac in factors]) * (np.asarray(signs) != 0)
+
+    shared = rng.standard_normal((n_sims, group_idx.max() + 1))
+    own = rng.standard_normal((n_sims, n))
+
+    z = np.sqrt(rho) * np.asarray(signs) * shared[:, group_idx] + np.sqrt(1 - rho) * own
+
+    ranks = z.argsort(axis=0, kind="stable").argsort(axis=0, kind="stable")
+    wins = ranks < np.round(np.asarray(p, dtype=float) * n_sims)
+
+    return np.where(wins, np.asarray(d, dtype=float) - 1, -1.0)
+
+
+def utility_terms(returns, f, gamma):
+    """(mean utility, gradient) of 1 + returns @ f under CRRA gamma"""
+    wealth = 1 + returns @ f
+    marginal = wealth ** -gamma
+
+    if gamma == 1:
+        value = np.log(wealth).mean()
+    else:
+        value = (wealth ** (1 - gamma)).mean() / (1 - gamma)
+
+    return value, (returns * marginal[:, None]).mean(axis=0)
+
+
+def kkt_residual(grad, f, upper, budget, tol=1e-7):
+    """
+    Largest KKT violation of f for max U(f) over {0 <= f <= upper, sum(f) <= budget}:
+    with one budget multiplier lam >= 0 (0 unless the budget binds), free
+    stakes need grad = lam, zero stakes grad <= lam, capped stakes grad >= lam.
+    """
+    at_zero = f <= tol
+    at_cap = f >= upper - tol
+    free = ~at_zero & ~at_cap
+
+    lam = 0.0
+    if f.sum() >= budget - tol:
+        lam = float(np.median(grad[free])) if free.any() else max(float(grad[at_zero].max(initial=0.0)), 0.0)
+        lam = max(lam, 0.0)
+
+    violation = np.concatenate([
+        np.abs(grad[free] - lam),
+        np.maximum(grad[at_zero] - lam, 0),
+        np.maximum(lam - grad[at_cap], 0),
+    ])
+
+    return float(violation.max(initial=0.0))
+
+
+def solve_growth(returns, start, upper, budget, gamma=1.0, iterations=ITERATIONS):
+    """
+    Maximise mean(U(1 + returns @ f)) over {0 <= f <= upper, sum(f) <= budget},
+    U = log for gamma=1, else CRRA w ** (1 - gamma) / (1 - gamma).
+    budget must stay below 1 so wealth is positive if every bet loses.
+    """
+    n = returns.shape[1]
+
+    x0 = np.clip(start, 0, upper)
+    if x0.sum() > budget:
+        x0 = x0 * budget / x0.sum()
+
+    def objective(f):
+        value, grad = utility_terms(returns, f, gamma)
+        return -value, -grad
+
+    result = minimize(
+        objective,
+        x0,
+        jac=True,
+        method="SLSQP",
+        bounds=list(zip(np.zeros(n), upper)),
+        constraints=[{"type": "ineq", "fun": lambda f: budget - f.sum(), "jac": lambda f: -np.ones(n)}],
+        options={"maxiter": iterations, "ftol": 1e-15},
+    )
+
+    f = np.clip(result.x, 0, upper)
+    if f.sum() > budget:
+        f = f * budget / f.sum()
+
+    # snap stakes SLSQP left a rounding error away from a bound
+    f[f < 1e-7] = 0.0
+
+    return f
+
+
+def size_slate(
+    p,
+    d,
+    games,
+    market_types,
+    sides,
+    fraction=KELLY_FRACTION,
+    max_bet=MAX_BET_FRACTION,
+    max_exposure=MAX_SLATE_EXPOSURE,
+):
+    """
+    Simultaneous fractional Kelly stakes (fraction of bankroll) for one slate.
+
+    p: model win probabilities, d: sportsbook decimal odds, games: game ids,
+    market_types / sides: used to find which bets share a game outcome.
+    Bets with no edge, missing prices or probabilities get 0.
+    """
+    p = np.asarray(p, dtype=float)
+    d = np.asarray(d, dtype=float)
+
+    stakes = np.zeros(len(p))
+
+    valid = np.isfinite(p) & np.isfinite(d) & (d > 1) & (p > 0) & (p < 1) & (p * d > 1)
+
+    if not valid.any():
+        return stakes
+
+    idx = np.flatnonzero(valid)
+
+    factors, signs = zip(*(bet_factor(m, s) for m, s in zip(np.asarray(market_types)[idx], np.asarray(sides)[idx])))
+
+    returns = simulate_returns(p[idx], d[idx], np.asarray(games)[idx], factors, signs)
+
+    start = independent_kelly(p[idx], d[idx]) * fraction
+
+    upper = np.full(len(idx), max_bet)
+    budget = min(max_exposure, 0.99)
+    gamma = 1 / fraction
+
+    stakes[idx] = solve_growth(returns, start, upper, budget, gamma=gamma)
+
+    _, grad = utility_terms(returns, stakes[idx], gamma)
+    residual = kkt_residual(grad, stakes[idx], upper, budget)
+    assert residual < KKT_TOLERANCE, f"slate sizing did not reach the optimum (KKT residual {residual:.2e})"
+
+    return stakes
@@ -0,0 +1,162 @@
+# scripts/common/profit_engine.py
+
+import numpy as np
+import pandas as pd
+
+from common.kelly import KELLY_FRACTION, independent_kelly
+
+# =========================
+# PROFIT ENGINE
+# =========================
+#
+# Profit accounting for graded bets, one array pass per question:
+#
+#   win_profit      what 1 unit returns on a win at an American price
+#   unit_profit     units won per bet at a 1 unit stake (Half Win / Half
+#                   Loss settle half the stake, Push 0, anything else NaN)
+#   roi             units won / bets
+#   bankroll_curve  bankroll after every bet, flat units or Kelly staked
+#   max_drawdown    largest fall from a running peak of a curve
+#   kelly_pnl       per bet P&L of fractional Kelly stakes that compound
+#
+# Results are matched case-insensitively, so the graded files ("Win") and
+# the historic bet files ("win") read the same.
+
+# result -> (share of the stake that wins, share that loses)
+RESULT_SHARES = {
+    "win": (1.0, 0.0),
+    "half win": (0.5, 0.0),
+    "push": (0.0, 0.0),
+    "half loss": (0.0, 0.5),
+    "loss": (0.0, 1.0),
+}
+
+
+# =========================
+# PER BET
+# =========================
+
+def american_number(values):
+    """American odds (+120, -150, '1,200') as numbers (NaN if invalid or 0)"""
+    text = pd.Series(values).astype("string").str.replace("+", "", regex=False).str.replace(",", "", regex=False)
+    a = pd.to_numeric(text.str.strip(), errors="coerce").astype(float).to_numpy()
+    return np.where(a != 0, a, np.nan)
+
+
+def win_profit(american):
+    """Units returned on a winning 1 unit stake: a / 100 for plus, 100 / |a| for minus"""
+    a = american_number(american)
+
+    with np.errstate(divide="ignore", invalid="ignore"):
+        return np.where(a > 0, a / 100, 100 / np.abs(a))
+
+
+def result_shares(results):
+    """(won, lost, settled) arrays for a column of results"""
+    text = pd.Series(np.asarray(results, dtype=object)).astype("string").str.strip().str.lower()
+
+    won = text.map({k: v[0] for k, v in RESULT_SHARES.items()}).astype(float).to_numpy()
+    lost = text.map({k: v[1] for k, v in RESULT_SHARES.items()}).astype(float).to_numpy()
+
+    return np.nan_to_num(won), np.nan_to_num(lost), ~np.isnan(won)
+
+
+def unit_profit(results, payout):
+    """
+    Units won per bet at a 1 unit stake, from results and the win payout
+    per unit (win_profit, or decimal - 1). NaN when unsettled, or when a
+    winning share has no price.
+    """
+    won, lost, settled = result_shares(results)
+    payout = np.asarray(payout, dtype=float)
+
+    gain = np.where(won > 0, won * payout, 0.0)
+    return np.where(settled, gain - lost, np.nan)
+
+
+def bet_profits(df, odds_col="take_odds", result_col="bet_result", default_odds=None):
+    """unit_profit for a frame of bets priced in American odds_col"""
+    odds = american_number(df[odds_col]) if odds_col in df.columns else np.full(len(df), np.nan)
+
+    if default_odds is not None:
+        odds = np.where(np.isnan(odds), default_odds, odds)
+
+    return pd.Series(unit_profit(df[result_col], win_profit(odds)), index=df.index)
+
+
+def roi(df, odds_col="take_odds", result_col="bet_result", default_odds=None):
+    """Units won per bet (unsettled bets count as staked and returned); 0 when empty"""
+    if df.empty:
+        return 0
+
+    profits = bet_profits(df, odds_col, result_col, default_odds)
+    return np.nansum(profits.to_numpy()) / len(df)
+
+
+# =========================
+# BANKROLL
+# =========================
+
+def kelly_stakes(prob, decimal, fraction=KELLY_FRACTION):
+    """Fractional Kelly stake (share of bankroll) per bet"""
+    return fraction * independent_kelly(prob, decimal)
+
+
+def bankroll_curve(profits, stakes=None, start=None):
+    """
+    Bankroll after each bet, in order. Without stakes every bet risks 1 unit
+    (start + running units, start 0); with stakes each bet risks that share
+    of the bankroll it finds, so the curve compounds (start 1). Unsettled
+    bets change nothing.
+    """
+    if start is None:
+        start = 0.0 if stakes is None else 1.0
+
+    profits = np.nan_to_num(np.asarray(profits, dtype=float))
+
+    if stakes is None:
+        return start + np.cumsum(profits)
+
+    stakes = np.nan_to_num(np.asarray(stakes, dtype=float))
+    return start * np.cumprod(1 + stakes * profits)
+
+
+def kelly_pnl(profits, stakes, start=1.0):
+    """Per bet P&L of compounding stakes (bankroll units)"""
+    curve = bankroll_curve(profits, stakes, start)
+    return np.diff(curve, prepend=start)
+
+
+def max_drawdown(curve, start=None):
+    """Largest drop from a running peak (the starting bankroll counts as a peak)"""
+    curve = np.asarray(curve, dtype=float)
+    if start is not None:
+        curve = np.concatenate([[start], curve])
+
+    if len(curve) == 0:
+        return 0.0
+
+    return float(np.max(np.maximum.accumulate(curve) - curve))
+
+
+def profit_summary(profits, stakes=None, start=None):
+    """bets, units, roi, max_drawdown (and final bankroll when Kelly staked)"""
+    profits = np.asarray(profits, dtype=float)
+    n = len(profits)
+
+    if start is None:
+        start = 0.0 if stakes is None else 1.0
+
+    curve = bankroll_curve(profits, stakes, start)
+
+    out = {
+        "bets": n,
+        "units": float(np.nansum(profits)),
+        "roi": float(np.nansum(profits) / n) if n else 0.0,
+        "max_drawdown": max_drawdown(curve, start),
+    }
+
+    if stakes is not None:
+        out["bankroll"] = float(curve[-1]) if n else start
+
+    return out
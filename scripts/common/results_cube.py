@@ -0,0 +1,145 @@
+# scripts/common/results_cube.py
+
+import json
+from datetime import datetime
+
+import numpy as np
+import pandas as pd
+
+from common.results_enrichment import EDGE_LABELS, ODDS_LABELS
+from common.results_summary import COUNT_COLUMNS, VALUE_COLUMNS, summarize_cubes
+
+# =========================
+# RESULTS CUBE
+# =========================
+#
+# Every roll-up of the graded picks over
+#
+#   league, market_type, side, odds_band, edge_band, month
+#
+# precomputed from one scan (all 64 combinations of the dimensions, "ALL"
+# standing in for a rolled-up dimension), so a dashboard can drill from the
+# grand total down to any slice with a lookup instead of fetching and
+# grouping the graded CSVs itself.
+#
+# The bundle is columnar and dictionary encoded: each dimension is an array
+# of integer codes into its list of levels (code 0 is "ALL"), each measure an
+# array of numbers (null when undefined), one position per cell.
+
+CUBE_DIMS = ["league", "market_type", "side", "odds_band", "edge_band", "month"]
+CUBE_METRICS = ["Win", "Loss", "Push", "Win_Pct", "Units", "ROI", "Avg_Edge"]
+
+ALL = "ALL"
+NONE = "none"
+
+SIDE_ORDER = ["Home", "Away", "Over", "Under", "Other"]
+
+
+# =========================
+# DIMENSIONS
+# =========================
+
+def cube_frame(work):
+    """Cube dimension columns for enriched picks (enrich_picks + market)"""
+    out = pd.DataFrame(index=work.index)
+
+    out["league"] = work["market"].astype(str)
+    out["market_type"] = work["market_type"].astype(str).str.strip().str.lower()
+
+    total_side = work["total_side"].to_numpy(dtype=object)
+    side_group = work["side_group"].replace("Non_Home_Away", "Other").to_numpy(dtype=object)
+    out["side"] = np.where(total_side != "", total_side, side_group)
+
+    out["odds_band"] = work["odds_bucket"].replace("", NONE)
+    out["edge_band"] = work["edge_bucket"].replace("", NONE)
+
+    # game_date is YYYY_MM_DD
+    out["month"] = work["game_date"].astype(str).str.slice(0, 7).str.replace("_", "-")
+
+    out["bet_result"] = work["bet_result"]
+    out["selected_edge"] = work["selected_edge"]
+    out["bet_decimal"] = work["bet_decimal"]
+    out["_cube"] = ALL
+
+    return out
+
+
+def dim_levels(cells, dim):
+    """ALL first, then the dimension's natural order"""
+    seen = set(cells[dim]) - {ALL}
+
+    order = {
+        "side": SIDE_ORDER,
+        "odds_band": ODDS_LABELS + [NONE],
+        "edge_band": EDGE_LABELS + [NONE],
+    }.get(dim)
+
+    if order is None:
+        return [ALL] + sorted(seen)
+
+    return [ALL] + [v for v in order if v in seen] + sorted(seen - set(order))
+
+
+# =========================
+# BUILD
+# =========================
+
+def build_cube(works):
+    """Every roll-up of the enriched picks of all leagues, one row per cell"""
+    works = [w for w in works if w is not None and not w.empty]
+    if not works:
+        return pd.DataFrame(columns=CUBE_DIMS + CUBE_METRICS)
+
+    frame = pd.concat([cube_frame(w) for w in works], ignore_index=True)
+
+    # a constant key lets the grand total be a roll-up like any other
+    cubes = {}
+    for mask in range(2 ** len(CUBE_DIMS)):
+        keys = [d for i, d in enumerate(CUBE_DIMS) if mask >> i & 1]
+        cubes[mask] = (keys + ["_cube"], None)
+
+    rollups = summarize_cubes(
+        frame,
+        cubes,
+        dims=CUBE_DIMS,
+        metrics=COUNT_COLUMNS + VALUE_COLUMNS,
+        edge_col="selected_edge",
+        decimal_col="bet_decimal",
+    )
+
+    cells = pd.concat(rollups.values(), ignore_index=True)
+
+    for dim in CUBE_DIMS:
+        cells[dim] = cells[dim].fillna(ALL) if dim in cells.columns else ALL
+
+    return cells[CUBE_DIMS + CUBE_METRICS]
+
+
+def cube_bundle(cells):
+    """Columnar, dictionary encoded form of the cube for the front end"""
+    levels = {dim: dim_levels(cells, dim) for dim in CUBE_DIMS}
+
+    columns = {}
+    for dim in CUBE_DIMS:
+        codes = pd.Categorical(cells[dim], categories=levels[dim]).codes
+        columns[dim] = codes.tolist()
+
+    for metric in CUBE_METRICS:
+        values = cells[metric].astype(float)
+        columns[metric] = [None if np.isnan(v) else (int(v) if v == int(v) else v) for v in values]
+
+    return {
+        "generated": datetime.now().strftime("%Y-%m-%d %H:%M:%S"),
+        "dims": CUBE_DIMS,
+        "metrics": CUBE_METRICS,
+        "levels": levels,
+        "rows": len(cells),
+        "columns": columns,
+    }
+
+
+def write_cube(cells, path):
+    path.parent.mkdir(parents=True, exist_ok=True)
+
+    with open(path, "w", encoding="utf-8") as f:
+        json.dump(cube_bundle(cells), f, separators=(",", ":"))
@@ -0,0 +1,229 @@
+# scripts/common/results_enrichment.py
+
+import numpy as np
+import pandas as pd
+
+from common.juice_engine import american_to_decimal
+
+# =========================
+# PICK-LEVEL ENRICHMENT
+# =========================
+#
+# Column-wise versions of the per-pick derivations the results summaries
+# group on. Text columns are normalised once (stripped, lower-case, "" for
+# missing), every rule becomes a np.select over those arrays, and columns a
+# league does not carry read as missing. For each market the side-specific
+# price / edge column is used when present, falling back to the take_*
+# column the way the per-row rules did:
+#
+#   side_group              Home / Away / Non_Home_Away
+#   total_side              Over / Under / ""
+#   selected_edge           edge of the chosen side (soccer: edge_pct)
+#   selected_american_odds  price of the chosen side (soccer: odds_american)
+#   selected_line_value     spread / puck line of the chosen side
+#   favorite_dog            Favorite / Dog / Pick from price or line sign
+#   edge_bucket, odds_bucket
+#   bet_decimal             decimal price the bet was taken at (take_odds,
+#                           soccer odds_decimal, else the chosen side's price)
+
+EDGE_EDGES = [0, 0.01, 0.02, 0.03, 0.04, 0.05, 0.06, 0.075, 0.10]
+EDGE_LABELS = [
+    "<0", "0.00_to_0.0099", "0.01_to_0.0199", "0.02_to_0.0299", "0.03_to_0.0399",
+    "0.04_to_0.0499", "0.05_to_0.0599", "0.06_to_0.0749", "0.075_to_0.0999", "0.10_plus",
+]
+
+# upper bounds, inclusive
+ODDS_EDGES = [-200, -150, -125, -110, -101, 100, 125, 150, 200]
+ODDS_LABELS = [
+    "minus_200_or_lower", "minus_199_to_minus_150", "minus_149_to_minus_125",
+    "minus_124_to_minus_110", "minus_109_to_minus_101", "minus_100_to_plus_100",
+    "plus_101_to_plus_125", "plus_126_to_plus_150", "plus_151_to_plus_200",
+    "plus_201_or_higher",
+]
+
+
+# =========================
+# COLUMNS
+# =========================
+
+def text_col(df, col):
+    """Normalised text column ("" when missing)"""
+    if col not in df.columns:
+        return np.full(len(df), "", dtype=object)
+
+    s = df[col]
+    return s.where(s.notna(), "").astype(str).str.strip().str.lower().to_numpy(dtype=object)
+
+
+def num_col(df, col):
+    """Numeric column (NaN when missing or unparseable)"""
+    if col not in df.columns:
+        return np.full(len(df), np.nan)
+
+    return pd.to_numeric(df[col], errors="coerce").to_numpy(dtype=float)
+
+
+def first_valid(*arrays):
+    """Element-wise first non-NaN value"""
+    out = arrays[-1]
+    for arr in reversed(arrays[:-1]):
+        out = np.where(np.isnan(arr), out, arr)
+    return out
+
+
+# =========================
+# BUCKETS
+# =========================
+
+def edge_bucket(values):
+    val = np.asarray(values, dtype=float)
+    labels = np.array(EDGE_LABELS, dtype=object)[np.searchsorted(EDGE_EDGES, np.nan_to_num(val), side="right")]
+    return np.where(np.isnan(val), "", labels)
+
+
+def odds_bucket(values):
+    val = np.asarray(values, dtype=float)
+    labels = np.array(ODDS_LABELS, dtype=object)[np.searchsorted(ODDS_EDGES, np.nan_to_num(val), side="left")]
+    return np.where(np.isnan(val), "", labels)
+
+
+def sign_bucket(values):
+    val = np.asarray(values, dtype=float)
+    return np.select([val < 0, val > 0, val == 0], ["Favorite", "Dog", "Pick"], "")
+
+
+# =========================
+# ENRICH
+# =========================
+
+def enrich_picks(df, market_name):
+    """df with the pick-level columns added, for one league's graded master"""
+    work = df.copy()
+
+    soccer = str(market_name).strip().lower() == "soccer"
+    market_type = text_col(work, "market_type")
+    bet_side = text_col(work, "bet_side")
+    take_bet = text_col(work, "take_bet")
+    home_team = text_col(work, "home_team")
+    away_team = text_col(work, "away_team")
+
+    if soccer:
+        side_group = np.select(
+            [(market_type == "result") & (take_bet == "home"), (market_type == "result") & (take_bet == "away")],
+            ["Home", "Away"],
+            "Non_Home_Away",
+        )
+        total_side = np.select(
+            [(market_type == "total") & (take_bet == "over25"), (market_type == "total") & (take_bet == "under25")],
+            ["Over", "Under"],
+            "",
+        )
+    else:
+        side_group = np.select(
+            [
+                (bet_side == "home") | (take_bet == "home"),
+                (bet_side == "away") | (take_bet == "away"),
+                (bet_side != "") & (home_team != "") & (bet_side == home_team),
+                (bet_side != "") & (away_team != "") & (bet_side == away_team),
+                (take_bet != "") & (home_team != "") & (take_bet == home_team),
+                (take_bet != "") & (away_team != "") & (take_bet == away_team),
+            ],
+            ["Home", "Away", "Home", "Away", "Home", "Away"],
+            "Non_Home_Away",
+        )
+        total_side = np.select(
+            [(bet_side == "over") | (take_bet == "over"), (bet_side == "under") | (take_bet == "under")],
+            ["Over", "Under"],
+            "",
+        )
+
+    home = side_group == "Home"
+    away = side_group == "Away"
+    over = total_side == "Over"
+    under = total_side == "Under"
+
+    moneyline = market_type == "moneyline"
+    spread = market_type == "spread"
+    puck_line = market_type == "puck_line"
+    total = market_type == "total"
+
+    if soccer:
+        selected_edge = num_col(work, "edge_pct")
+        selected_odds = num_col(work, "odds_american")
+    else:
+        take_edge = num_col(work, "take_bet_edge_pct")
+        over_edge = num_col(work, "over_edge_decimal")
+        under_edge = num_col(work, "under_edge_decimal")
+
+        selected_edge = np.select(
+            [
+                moneyline & home, moneyline & away, moneyline,
+                (spread | puck_line) & home, (spread | puck_line) & away, spread | puck_line,
+                total & over & ~np.isnan(over_edge), total & under & ~np.isnan(under_edge), total,
+            ],
+            [
+                num_col(work, "home_ml_edge_decimal"), num_col(work, "away_ml_edge_decimal"), take_edge,
+                num_col(work, "home_spread_edge_decimal"), num_col(work, "away_spread_edge_decimal"), take_edge,
+                over_edge, under_edge, take_edge,
+            ],
+            np.nan,
+        )
+
+        take_odds = num_col(work, "take_odds")
+        nothing = np.full(len(work), np.nan)
+
+        side_odds = np.select(
+            [
+                moneyline & home, moneyline & away,
+                spread & home, spread & away,
+                puck_line & home, puck_line & away,
+                total & over, total & under,
+            ],
+            [
+                num_col(work, "home_dk_moneyline_american"), num_col(work, "away_dk_moneyline_american"),
+                num_col(work, "home_dk_spread_american"), num_col(work, "away_dk_spread_american"),
+                num_col(work, "dk_home_puck_line"), num_col(work, "dk_away_puck_line"),
+                num_col(work, "dk_total_over_american"), num_col(work, "dk_total_under_american"),
+            ],
+            np.nan,
+        )
+
+        selected_odds = np.where(moneyline | spread | puck_line | total, first_valid(side_odds, take_odds), nothing)
+
+    selected_line = np.select(
+        [spread & home, spread & away, puck_line & home, puck_line & away],
+        [
+            num_col(work, "home_spread"), num_col(work, "away_spread"),
+            num_col(work, "home_puck_line"), num_col(work, "away_puck_line"),
+        ],
+        np.nan,
+    )
+
+    if soccer:
+        favorite_dog = np.full(len(work), "", dtype=object)
+    else:
+        favorite_dog = np.select(
+            [moneyline, spread | puck_line],
+            [sign_bucket(selected_odds), sign_bucket(selected_line)],
+            "",
+        )
+
+    work["side_group"] = side_group
+    work["total_side"] = total_side
+    work["selected_edge"] = selected_edge
+    work["selected_american_odds"] = selected_odds
+    work["selected_line_value"] = selected_line
+    work["favorite_dog"] = favorite_dog
+
+    work["edge_bucket"] = edge_bucket(selected_edge)
+    work["odds_bucket"] = odds_bucket(selected_odds)
+
+    # puck line "odds" columns carry the line, so they never price a bet
+    side_price = np.where(puck_line, np.nan, american_to_decimal(selected_odds))
+    work["bet_decimal"] = first_valid(
+        american_to_decimal(num_col(work, "take_odds")),
+        num_col(work, "odds_decimal"),
+        side_price,
+    )
+
+    return work
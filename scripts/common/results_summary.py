@@ -0,0 +1,135 @@
+# scripts/common/results_summary.py
+
+import numpy as np
+import pandas as pd
+
+from common.profit_engine import unit_profit
+
+# =========================
+# RESULTS SUMMARY ENGINE
+# =========================
+#
+# Win / Loss / Push tallies for any set of group keys without looping over
+# groups. Each graded row is scanned once into numeric columns (one-hot
+# result flags, profit in units at a 1 unit stake, edge), summed to the finest
+# grain any requested cube needs, and every cube is then a roll-up of that
+# small table:
+#
+#   Win, Loss, Push, Total   counts (Half Win / Half Loss / Unknown count in
+#                            no column, as before)
+#   Win_Pct                  Win / (Win + Loss), 0 when undecided
+#   Units                    profit of 1 unit on every settled bet with a price
+#   ROI                      Units / priced bets staked
+#   Avg_Edge                 mean edge of rows with an edge
+#
+# A cube is (group keys, optional row filter); the filter is a function of
+# the grain table and may only look at key or `dims` columns.
+
+COUNT_COLUMNS = ["Win", "Loss", "Push", "Total", "Win_Pct"]
+VALUE_COLUMNS = ["Units", "ROI", "Avg_Edge"]
+
+# result -> (win, loss, push); half results only count toward Units
+RESULT_FLAGS = {
+    "Win": (1, 0, 0),
+    "Loss": (0, 1, 0),
+    "Push": (0, 0, 1),
+    "Half Win": (0, 0, 0),
+    "Half Loss": (0, 0, 0),
+}
+
+SUM_COLUMNS = ["Win", "Loss", "Push", "_staked", "_units", "_edge_sum", "_edge_n"]
+
+
+def result_flags(df, edge_col=None, decimal_col=None):
+    """One numeric row per graded row: result flags, units and edge"""
+    result = df["bet_result"].astype(str).str.strip()
+
+    out = pd.DataFrame(
+        {
+            name: result.map({k: v[i] for k, v in RESULT_FLAGS.items()}).fillna(0).astype(int).to_numpy()
+            for i, name in enumerate(["Win", "Loss", "Push"])
+        },
+        index=df.index,
+    )
+
+    decimal = pd.to_numeric(df[decimal_col], errors="coerce").to_numpy(dtype=float) if decimal_col else np.full(len(df), np.nan)
+    settled = result.isin(list(RESULT_FLAGS)).to_numpy() & np.isfinite(decimal)
+
+    out["_staked"] = settled.astype(int)
+    out["_units"] = np.where(settled, unit_profit(result, decimal - 1), 0.0)
+
+    edge = pd.to_numeric(df[edge_col], errors="coerce").to_numpy(dtype=float) if edge_col else np.full(len(df), np.nan)
+    out["_edge_sum"] = np.nan_to_num(edge)
+    out["_edge_n"] = np.isfinite(edge).astype(int)
+
+    return out
+
+
+def finish(sums, metrics=COUNT_COLUMNS):
+    """Derived columns from summed flags, keys first"""
+    out = sums.copy()
+
+    decided = out["Win"] + out["Loss"]
+    out["Total"] = decided + out["Push"]
+    out["Win_Pct"] = (out["Win"] / decided.where(decided > 0)).fillna(0.0).round(4)
+
+    out["Units"] = out["_units"].round(4)
+    out["ROI"] = (out["_units"] / out["_staked"].where(out["_staked"] > 0)).round(4)
+    out["Avg_Edge"] = (out["_edge_sum"] / out["_edge_n"].where(out["_edge_n"] > 0)).round(4)
+
+    keys = [c for c in out.columns if c not in SUM_COLUMNS + COUNT_COLUMNS + VALUE_COLUMNS]
+    return out[keys + list(metrics)]
+
+
+def summarize_cubes(df, cubes, dims=(), metrics=COUNT_COLUMNS, edge_col=None, decimal_col=None):
+    """
+    {name: summary} for cubes = {name: (group keys, filter or None)} from one
+    scan of df. Empty input gives empty frames.
+    """
+    if df is None or df.empty or "bet_result" not in df.columns:
+        return {name: pd.DataFrame() for name in cubes}
+
+    grain = list(dict.fromkeys([c for keys, _ in cubes.values() for c in keys] + list(dims)))
+
+    flags = result_flags(df, edge_col, decimal_col)
+    for col in grain:
+        flags[col] = df[col]
+
+    table = flags.groupby(grain, dropna=False, sort=False)[SUM_COLUMNS].sum().reset_index()
+
+    out = {}
+
+    for name, (keys, where) in cubes.items():
+        sub = table.loc[where(table)] if where is not None else table
+
+        if sub.empty:
+            out[name] = pd.DataFrame()
+            continue
+
+        sums = sub.groupby(list(keys), dropna=False)[SUM_COLUMNS].sum().reset_index()
+        out[name] = finish(sums, metrics)
+
+    return out
+
+
+def summarize_groups(df, group_cols, metrics=COUNT_COLUMNS, edge_col=None, decimal_col=None):
+    """Summary of df by group_cols (one cube)"""
+    return summarize_cubes(
+        df, {"summary": (group_cols, None)}, metrics=metrics, edge_col=edge_col, decimal_col=decimal_col
+    )["summary"]
+
+
+def summarize_levels(df, col, levels, metrics=COUNT_COLUMNS):
+    """Summary by one column with a row for every level, in order (zeros when absent)"""
+    work = df.loc[df[col].isin(levels)] if df is not None and col in df.columns else None
+    out = summarize_groups(work, [col], metrics=metrics)
+
+    out = out.set_index(col) if not out.empty else pd.DataFrame(columns=list(metrics))
+    out = out.reindex(levels)[list(metrics)]
+
+    counts = [c for c in ["Win", "Loss", "Push", "Total"] if c in out.columns]
+    out[counts] = out[counts].fillna(0).astype(int)
+    if "Win_Pct" in out.columns:
+        out["Win_Pct"] = out["Win_Pct"].fillna(0.0).astype(float)
+
+    return out.rename_axis(col).reset_index()
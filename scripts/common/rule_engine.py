@@ -0,0 +1,415 @@
+# scripts/common/rule_engine.py
+
+import json
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+
+# =========================
+# SELECTION RULE ENGINE
+# =========================
+#
+# Selection rules are band filters on the sides of a market (home/away,
+# over/under). Rule sets live in config/selection_rules.json as plain data:
+#
+#   {
+#     "pick": "edge_first" | "valid_first" | "first_valid" | "each",
+#     "columns": {side: {field: df column}},
+#     "shared": {field: df column},         game-level fields
+#     "require": [condition, ...],          game-level, on shared fields
+#     "sides": {
+#       "home": {
+#         "allow": true,
+#         "line": [[lo, hi], ...],           shorthand: field -> bands
+#         "conditions": [condition, ...],    all must hold
+#         "any": [[condition, ...], ...]     at least one group must hold
+#       },
+#       "away": {...}
+#     }
+#   }
+#
+#   condition  {"field": f, "bands": [[lo, hi], ...], "closed": "both",
+#               "exclude": false, "when": condition, "unless": condition}
+#
+# Bands are inclusive unless "closed" says otherwise (both, left, right,
+# neither); null bounds are open-ended. A condition with "when" only applies
+# to rows where "when" holds; "unless" skips rows where it holds. Strings
+# such as "$PL_HUGE_FAV_EDGE" are taken from the section's "params", so a
+# parameter search only swaps a params dict and recompiles.
+#
+# pick:
+#   edge_first   take the side with the higher edge (first side wins ties),
+#                then keep the row only if that side passes
+#   valid_first  take the higher edge among the sides that pass
+#                (first side wins ties)
+#   first_valid  take the first side, in config order, that passes
+#   each         every passing side is a bet (see side_masks)
+#
+# compile_rules() turns the bands into interval arrays once; side_masks() and
+# select() then evaluate whole columns at a time. failure_bits() records which
+# conditions failed as one integer per row and key; trace_labels() gives the
+# matching text, so explanations are only rendered when someone asks.
+
+RULES_PATH = Path("config/selection_rules.json")
+
+CLOSED = ("both", "left", "right", "neither")
+PICKS = ("edge_first", "valid_first", "first_valid", "each")
+SIDE_KEYS = ("allow", "conditions", "any", "closed")
+
+
+# =========================
+# CONFIG
+# =========================
+
+def load_rule_config(path=RULES_PATH):
+    with open(path, "r", encoding="utf-8") as f:
+        return json.load(f)
+
+
+def resolve_params(obj, params):
+    """Replace "$NAME" strings with params[NAME] throughout a rule spec"""
+    if isinstance(obj, str) and obj.startswith("$"):
+        name = obj[1:]
+        if name not in params:
+            raise KeyError(f"Unknown rule parameter: {obj}")
+        return params[name]
+
+    if isinstance(obj, dict):
+        return {k: resolve_params(v, params) for k, v in obj.items()}
+
+    if isinstance(obj, list):
+        return [resolve_params(v, params) for v in obj]
+
+    return obj
+
+
+def compile_section(section, overrides=None):
+    """
+    Resolve a config section's params (plus overrides) and compile every rule
+    set in it. Nesting is kept; non-rule values are returned resolved.
+    """
+    params = dict(section.get("params", {}))
+    params.update(overrides or {})
+
+    resolved = resolve_params({k: v for k, v in section.items() if k != "params"}, params)
+
+    def walk(node):
+        if isinstance(node, dict) and "sides" in node:
+            return compile_rules(node)
+        if isinstance(node, dict):
+            return {k: walk(v) for k, v in node.items()}
+        return node
+
+    compiled = walk(resolved)
+    compiled["params"] = params
+
+    return compiled
+
+
+def load_rules(section, overrides=None, path=RULES_PATH):
+    return compile_section(load_rule_config(path)[section], overrides)
+
+
+# =========================
+# COMPILE
+# =========================
+
+def compile_band_set(bands, closed="both"):
+    """[[lo, hi], ...] -> (lows, highs, closed); None bounds are open-ended"""
+    if closed not in CLOSED:
+        raise ValueError(f"Unknown band closure: {closed}")
+
+    bands = [tuple(b) for b in bands]
+
+    lows = np.array([-np.inf if lo is None else lo for lo, _ in bands], dtype=float)
+    highs = np.array([np.inf if hi is None else hi for _, hi in bands], dtype=float)
+
+    if np.any(lows > highs):
+        raise ValueError(f"Band with low > high: {bands}")
+
+    return lows, highs, closed
+
+
+def compile_condition(cond, closed="both"):
+    return {
+        "field": cond["field"],
+        "bands": compile_band_set(cond["bands"], cond.get("closed", closed)),
+        "exclude": bool(cond.get("exclude", False)),
+        "when": compile_condition(cond["when"]) if "when" in cond else None,
+        "unless": compile_condition(cond["unless"]) if "unless" in cond else None,
+    }
+
+
+def compile_side(rule):
+    closed = rule.get("closed", "both")
+
+    shorthand = [
+        {"field": field, "bands": bands}
+        for field, bands in rule.items()
+        if field not in SIDE_KEYS
+    ]
+
+    return {
+        "allow": bool(rule.get("allow", True)),
+        "conditions": [compile_condition(c, closed) for c in shorthand + rule.get("conditions", [])],
+        "any": [[compile_condition(c, closed) for c in group] for group in rule.get("any", [])],
+    }
+
+
+def compile_rules(rules):
+    """Rule set (see header) -> compiled rule set for side_masks() / select()"""
+    pick = rules.get("pick", "edge_first")
+
+    if pick not in PICKS:
+        raise ValueError(f"Unknown pick mode: {pick}")
+
+    sides = list(rules["sides"])
+
+    if pick in ("edge_first", "valid_first") and len(sides) != 2:
+        raise ValueError(f"{pick} needs exactly two sides, got {sides}")
+
+    return {
+        "pick": pick,
+        "columns": rules.get("columns", {}),
+        "shared": rules.get("shared", {}),
+        "require": [compile_condition(c) for c in rules.get("require", [])],
+        "sides": {name: compile_side(rules["sides"][name]) for name in sides},
+        "spec": rules,
+    }
+
+
+# =========================
+# EVALUATE
+# =========================
+
+def band_mask(values, compiled):
+    """True where a value falls in any band (NaN never matches)"""
+    lows, highs, closed = compiled
+    v = np.asarray(values, dtype=float)[:, None]
+
+    lower = v >= lows if closed in ("both", "left") else v > lows
+    upper = v <= highs if closed in ("both", "right") else v < highs
+
+    return (lower & upper).any(axis=1)
+
+
+def lookup_field(field, fields, shared):
+    if field in fields:
+        return fields[field]
+    if shared is not None and field in shared:
+        return shared[field]
+    raise KeyError(f"Rule field not provided: {field}")
+
+
+def condition_mask(cond, fields, shared=None):
+    hit = band_mask(lookup_field(cond["field"], fields, shared), cond["bands"])
+
+    if cond["exclude"]:
+        hit = ~hit
+
+    if cond["when"] is not None:
+        hit |= ~condition_mask(cond["when"], fields, shared)
+
+    if cond["unless"] is not None:
+        hit |= condition_mask(cond["unless"], fields, shared)
+
+    return hit
+
+
+def all_of(conds, fields, shared, n):
+    mask = np.ones(n, dtype=bool)
+    for cond in conds:
+        mask &= condition_mask(cond, fields, shared)
+    return mask
+
+
+def side_mask(side, fields, shared=None, n=None):
+    """Rows where one side passes its allow / conditions / any groups"""
+    if n is None:
+        n = len(next(iter(fields.values())))
+
+    if not side["allow"]:
+        return np.zeros(n, dtype=bool)
+
+    mask = all_of(side["conditions"], fields, shared, n)
+
+    if side["any"]:
+        mask &= np.logical_or.reduce([all_of(group, fields, shared, n) for group in side["any"]])
+
+    return mask
+
+
+def frame_fields(df, compiled, fill=0.0):
+    """(fields, shared) arrays for a rule set, read through its column map"""
+    fields = {
+        side: {field: column(df, col, fill) for field, col in cols.items()}
+        for side, cols in compiled["columns"].items()
+    }
+    shared = {field: column(df, col, fill) for field, col in compiled["shared"].items()}
+
+    return fields, shared
+
+
+def require_mask(compiled, shared, n):
+    """Rows passing the rule set's game-level "require" conditions"""
+    return all_of(compiled["require"], {}, shared, n)
+
+
+def side_masks(compiled, fields, shared=None, n=None):
+    """
+    {side: mask} for every side of a compiled rule set.
+
+    fields maps each side to {field: array}; shared holds game-level arrays
+    used by "require" and by any side condition not found in its fields.
+    """
+    if n is None:
+        arrays = [a for f in fields.values() for a in f.values()] + list((shared or {}).values())
+        n = len(arrays[0])
+
+    required = require_mask(compiled, shared, n)
+
+    return {
+        name: side_mask(rule, fields[name], shared, n) & required
+        for name, rule in compiled["sides"].items()
+    }
+
+
+def select(compiled, fields, shared=None):
+    """
+    One bet per row: (ok, side) with side "" where nothing is kept.
+    edge_first / valid_first compare each side's "edge" field.
+    """
+    masks = side_masks(compiled, fields, shared)
+    names = list(masks)
+    pick = compiled["pick"]
+
+    if pick == "each":
+        raise ValueError("pick 'each' can select several sides; use side_masks()")
+
+    if pick == "first_valid":
+        side = np.full(len(masks[names[0]]), "", dtype=object)
+        for name in reversed(names):
+            side = np.where(masks[name], name, side)
+        return side != "", side.astype(str)
+
+    first, second = names
+
+    a_edge = np.asarray(fields[first]["edge"], dtype=float)
+    b_edge = np.asarray(fields[second]["edge"], dtype=float)
+
+    a_better = a_edge >= b_edge
+
+    if pick == "edge_first":
+        take_a = a_better & masks[first]
+        take_b = ~a_better & masks[second]
+    else:
+        take_a = masks[first] & (a_better | ~masks[second])
+        take_b = masks[second] & ~take_a
+
+    side = np.where(take_a, first, np.where(take_b, second, ""))
+
+    return take_a | take_b, side
+
+
+def chosen(side, fields, field, default=np.nan):
+    """Per-row value of `field` for the side chosen by select()"""
+    out = np.full(len(side), default, dtype=float)
+
+    for name, values in fields.items():
+        if field in values:
+            out = np.where(side == name, np.asarray(values[field], dtype=float), out)
+
+    return out
+
+
+def column(df, col, fill=0.0):
+    """Numeric column with blanks / bad values / missing column -> fill"""
+    if col not in df.columns:
+        return np.full(len(df), fill)
+
+    return pd.to_numeric(df[col], errors="coerce").fillna(fill).to_numpy(dtype=float)
+
+
+# =========================
+# TRACE
+# =========================
+
+def band_text(bands):
+    lows, highs, closed = bands
+    left = "[" if closed in ("both", "left") else "("
+    right = "]" if closed in ("both", "right") else ")"
+
+    return " or ".join(f"{left}{lo:g}, {hi:g}{right}" for lo, hi in zip(lows, highs))
+
+
+def condition_label(cond):
+    text = f"{cond['field']} {'not in' if cond['exclude'] else 'in'} {band_text(cond['bands'])}"
+
+    if cond["when"] is not None:
+        text += f" when {condition_label(cond['when'])}"
+
+    if cond["unless"] is not None:
+        text += f" unless {condition_label(cond['unless'])}"
+
+    return text
+
+
+def trace_labels(compiled):
+    """
+    Bit labels for failure_bits(): {"require": [...], side: [...]}.
+    Side bit 0 is "side not allowed", then one bit per condition, then one
+    for the "any" groups.
+    """
+    labels = {"require": [condition_label(c) for c in compiled["require"]]}
+
+    for name, side in compiled["sides"].items():
+        side_labels = ["side not allowed"] + [condition_label(c) for c in side["conditions"]]
+
+        if side["any"]:
+            groups = [" & ".join(condition_label(c) for c in group) for group in side["any"]]
+            side_labels.append("any of: " + " | ".join(groups))
+
+        labels[name] = side_labels
+
+    return labels
+
+
+def pack_bits(failed, n):
+    bits = np.zeros(n, dtype=np.uint32)
+
+    for j, mask in enumerate(failed):
+        bits |= np.asarray(mask, dtype=np.uint32) << np.uint32(j)
+
+    return bits
+
+
+def failure_bits(compiled, fields, shared=None, n=None):
+    """
+    {"require": bits, side: bits} as uint32 per row; bit j set means
+    trace_labels(compiled)[key][j] failed (0 = everything held).
+    """
+    if n is None:
+        arrays = [a for f in fields.values() for a in f.values()] + list((shared or {}).values())
+        n = len(arrays[0])
+
+    out = {"require": pack_bits([~condition_mask(c, {}, shared) for c in compiled["require"]], n)}
+
+    for name, side in compiled["sides"].items():
+        values = fields.get(name, {})
+
+        failed = [np.full(n, not side["allow"])]
+        failed += [~condition_mask(c, values, shared) for c in side["conditions"]]
+
+        if side["any"]:
+            failed.append(~np.logical_or.reduce([all_of(group, values, shared, n) for group in side["any"]]))
+
+        out[name] = pack_bits(failed, n)
+
+    return out
+
+
+def explain_bits(bits, labels):
+    """Labels of the failed conditions encoded in one row's bits"""
+    bits = int(bits)
+    return [label for j, label in enumerate(labels) if bits >> j & 1]
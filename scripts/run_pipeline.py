@@ -38,35 +38,27 @@ pipeline = [
     ["python", "docs/win/basketball/scripts/01_merge/build_juice_files.py"],
 
     # --- 02 APPLY JUICE ---
-    ["python", "docs/win/soccer/scripts/02_juice/apply_juice.py"],
-
-    ["python", "docs/win/hockey/scripts/02_juice/apply_moneyline_juice.py"],
-    ["python", "docs/win/hockey/scripts/02_juice/apply_total_juice.py"],
-    ["python", "docs/win/hockey/scripts/02_juice/apply_puck_line_juice.py"],
-
-    ["python", "docs/win/basketball/scripts/02_juice/apply_moneyline_juice.py"],
-    ["python", "docs/win/basketball/scripts/02_juice/apply_spread_juice.py"],
-    ["python", "docs/win/basketball/scripts/02_juice/apply_total_juice.py"],
+    ["python", "scripts/apply_juice.py"],
 
     # --- 03 EDGES ---
     ["python", "docs/win/soccer/scripts/03_edges/compute_edges.py"],
     ["python", "docs/win/hockey/scripts/03_edges/compute_edges.py"],
     ["python", "docs/win/basketball/scripts/03_edges/compute_edges.py"],
 
-    # --- 03 EV + KELLY ---
-    ["python", "docs/win/basketball/scripts/03_edges/compute_ev_kelly.py"],
-
     # --- 04 SELECT ---
     ["python", "docs/win/soccer/scripts/04_select/select_bets.py"],
     ["python", "docs/win/hockey/scripts/04_select/select_bets.py"],
     ["python", "docs/win/basketball/scripts/04_select/select_bets.py"],
 
+    # --- DAILY CARD ---
+    ["python", "scripts/build_card.py", current_date_str],
+
+    # --- CLOSING LINE VALUE ---
+    ["python", "scripts/track_clv.py"],
+
     # --- 05 RESULTS ---
-    ["python", "docs/win/final_scores/scripts/05_results/name_normalization.py"],
-    ["python", "docs/win/final_scores/scripts/05_results/basketball_results.py"],
-    ["python", "docs/win/final_scores/scripts/05_results/results.py"],
-    ["python", "docs/win/final_scores/scripts/05_results/generate_summary.py"],
-    ["python", "docs/win/final_scores/scripts/05_results/results_sorted.py"],
+    ["python", "docs/win/final_scores/scripts/05_results/run_results.py"],
+    ["python", "docs/win/final_scores/scripts/05_results/calibration_report.py"],
 ]
 
 # -----------------------
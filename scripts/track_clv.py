@@ -0,0 +1,259 @@
+#!/usr/bin/env python3
+# scripts/track_clv.py
+#
+# Closing-line-value tracker. Run after every intake: it stores the quotes
+# that changed since the last run, adds new selections with the price they
+# were taken at, and settles the close for bets whose game has not been
+# closed out yet. Only changed intake / selection files and the snapshot
+# partitions of still-open dates are read.
+# Usage: python scripts/track_clv.py
+
+import hashlib
+import json
+import sys
+import traceback
+from datetime import datetime
+from pathlib import Path
+
+import pandas as pd
+
+from common.clv import (
+    LOCAL_TZ,
+    SIDE_KEY,
+    changed_quotes,
+    closing_quotes,
+    clv_metrics,
+    snapshot_long,
+    summarize,
+)
+from common.daily_selections import file_date, load_selections, selection_files
+
+# =========================
+# PATHS
+# =========================
+SPORTSBOOK_DIRS = {
+    "basketball": Path("docs/win/basketball/00_intake/sportsbook"),
+    "hockey": Path("docs/win/hockey/00_intake/sportsbook"),
+    "soccer": Path("docs/win/soccer/00_intake/sportsbook"),
+}
+
+CLV_DIR = Path("docs/win/clv")
+SNAPSHOT_DIR = CLV_DIR / "snapshots"
+LEDGER_FILE = CLV_DIR / "clv_ledger.csv"
+SUMMARY_FILE = CLV_DIR / "clv_summary.csv"
+STATE_FILE = CLV_DIR / "clv_state.json"
+
+ERROR_LOG = Path("docs/win/errors/track_clv.txt")
+
+BET_KEY = ["sport", "game_date", "game_id", "market_type", "bet_side"]
+
+LEDGER_COLUMNS = BET_KEY + [
+    "league", "home_team", "away_team", "taken_line", "taken_decimal", "taken_at",
+    "start_time", "close_line", "close_decimal", "close_at", "clv_cents",
+    "clv_prob", "line_clv", "closed",
+]
+
+
+# =========================
+# STATE
+# =========================
+def load_state():
+    if not STATE_FILE.exists():
+        return {"snapshots": {}, "selections": {}}
+
+    with open(STATE_FILE, "r", encoding="utf-8") as f:
+        return json.load(f)
+
+
+def save_state(state):
+    with open(STATE_FILE, "w", encoding="utf-8") as f:
+        json.dump(state, f, indent=2, sort_keys=True)
+
+
+def file_hash(path):
+    return hashlib.sha1(Path(path).read_bytes()).hexdigest()
+
+
+def changed_files(paths, seen):
+    """(path, hash) for files whose content differs from the last run"""
+    out = []
+
+    for path in paths:
+        digest = file_hash(path)
+        if seen.get(str(path)) != digest:
+            out.append((path, digest))
+
+    return out
+
+
+# =========================
+# SNAPSHOTS
+# =========================
+def read_partition(date_str):
+    path = SNAPSHOT_DIR / f"{date_str}.csv"
+    if not path.exists():
+        return None
+    return pd.read_csv(path, dtype={"game_date": str, "game_time": str})
+
+
+def ingest_snapshots(state, observed_at, log):
+    """Append changed quotes from changed intake files to per-date partitions"""
+    paths = [(sport, p) for sport, d in SPORTSBOOK_DIRS.items() for p in sorted(d.glob("*.csv"))]
+    changed = changed_files([p for _, p in paths], state["snapshots"])
+    sport_of = {str(p): sport for sport, p in paths}
+
+    if not changed:
+        return 0
+
+    frames = [
+        snapshot_long(pd.read_csv(path, dtype=str), sport_of[str(path)], observed_at)
+        for path, _ in changed
+    ]
+    quotes = pd.concat(frames, ignore_index=True)
+
+    added = 0
+
+    for date_str, part in quotes.groupby("game_date", sort=True):
+        fresh = changed_quotes(part, read_partition(date_str))
+
+        if fresh.empty:
+            continue
+
+        out_path = SNAPSHOT_DIR / f"{date_str}.csv"
+        fresh.to_csv(out_path, mode="a", header=not out_path.exists(), index=False)
+        added += len(fresh)
+
+    for path, digest in changed:
+        state["snapshots"][str(path)] = digest
+
+    log.write(f"snapshots: {len(changed)} changed intake files, {added} new quotes\n")
+
+    return added
+
+
+# =========================
+# LEDGER
+# =========================
+def load_ledger():
+    if not LEDGER_FILE.exists():
+        return pd.DataFrame(columns=LEDGER_COLUMNS)
+
+    return pd.read_csv(LEDGER_FILE, dtype={"game_date": str, "game_id": str})
+
+
+def add_selections(ledger, state, taken_at, log):
+    """Append selections not yet in the ledger, priced at first sight"""
+    changed = changed_files(selection_files(), state["selections"])
+    dates = sorted({file_date(p) for p, _ in changed} - {None})
+
+    frames = [load_selections(d) for d in dates]
+    frames = [f for f in frames if not f.empty]
+
+    for path, digest in changed:
+        state["selections"][str(path)] = digest
+
+    if not frames:
+        return ledger
+
+    bets = pd.concat(frames, ignore_index=True)
+    bets["game_id"] = bets["game_id"].astype(str)
+
+    known = set(map(tuple, ledger[BET_KEY].astype(str).to_numpy())) if not ledger.empty else set()
+    is_new = [tuple(k) not in known for k in bets[BET_KEY].astype(str).to_numpy()]
+
+    new = bets.loc[is_new].drop_duplicates(BET_KEY)
+
+    rows = pd.DataFrame({
+        **{c: new[c].astype(str) for c in BET_KEY},
+        "league": new["league"],
+        "home_team": new["home_team"],
+        "away_team": new["away_team"],
+        "taken_line": new["line"],
+        "taken_decimal": new["odds_decimal"],
+        "taken_at": taken_at,
+        "closed": False,
+    })
+
+    log.write(f"selections: {len(changed)} changed files, {len(rows)} new bets\n")
+
+    return pd.concat([ledger, rows], ignore_index=True)[LEDGER_COLUMNS]
+
+
+def settle_open(ledger, now, log):
+    """Refresh the close of every bet not yet closed out; close out started games"""
+    open_rows = ~ledger["closed"].astype(bool)
+
+    if not open_rows.any():
+        return ledger
+
+    dates = sorted(ledger.loc[open_rows, "game_date"].astype(str).unique())
+    parts = [p for p in map(read_partition, dates) if p is not None]
+
+    if not parts:
+        return ledger
+
+    snapshots = pd.concat(parts, ignore_index=True)
+
+    bets = ledger.loc[open_rows].copy()
+    close = closing_quotes(bets, snapshots)
+
+    for col in close.columns:
+        bets[col] = close[col]
+
+    start = pd.to_datetime(bets["start_time"], errors="coerce")
+    day_over = pd.to_datetime(bets["game_date"], format="%Y_%m_%d", errors="coerce") + pd.Timedelta(days=1)
+    day_over = day_over.dt.tz_localize(LOCAL_TZ)
+
+    bets["closed"] = (start.notna() & (start <= now)) | (start.isna() & (day_over <= now))
+
+    bets = clv_metrics(bets)
+
+    ledger = ledger.astype({c: object for c in bets.columns if c in ledger.columns})
+    ledger.loc[open_rows, bets.columns] = bets
+
+    log.write(f"settle: {int(open_rows.sum())} open bets, {int(bets['closed'].sum())} closed out this run\n")
+
+    return ledger
+
+
+# =========================
+# MAIN
+# =========================
+def main():
+
+    CLV_DIR.mkdir(parents=True, exist_ok=True)
+    SNAPSHOT_DIR.mkdir(parents=True, exist_ok=True)
+    ERROR_LOG.parent.mkdir(parents=True, exist_ok=True)
+
+    # intake game times are Eastern; the runner clock is not
+    now = datetime.now(LOCAL_TZ).replace(microsecond=0)
+    stamp = now.isoformat(sep=" ")
+
+    with open(ERROR_LOG, "w", encoding="utf-8") as log:
+
+        log.write(f"=== TRACK CLV RUN: {stamp} ===\n")
+
+        try:
+
+            state = load_state()
+
+            ingest_snapshots(state, stamp, log)
+
+            ledger = load_ledger()
+            ledger = add_selections(ledger, state, stamp, log)
+            ledger = settle_open(ledger, now, log)
+
+            ledger.to_csv(LEDGER_FILE, index=False)
+            summarize(ledger).to_csv(SUMMARY_FILE, index=False)
+
+            save_state(state)
+
+            log.write(f"ledger: {len(ledger)} bets -> {LEDGER_FILE}\n")
+
+        except Exception as e:
+            log.write(f"\nCRITICAL ERROR: {str(e)}\n{traceback.format_exc()}\n")
+            sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()